@@ -0,0 +1,110 @@
+"""
+Бенчмарк: HTTP/1.1 (requests, ApiSession) vs HTTP/2 (httpx, Http2Session) под параллельной нагрузкой.
+
+Что меряем для каждого транспорта:
+- сколько TCP(+TLS) соединений открыто
+- wall time всей пачки и RPS
+- p50 / p95 / max латентности одного запроса
+
+Запуск (HOST / API_TOKEN берутся из окружения или .env):
+    python -m benchmarks.bench_http2 --requests 200 --concurrency 20
+    python -m benchmarks.bench_http2 --url https://dummyapi.io/data/v1/user?limit=1
+
+Требует: pip install "httpx[http2]"
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from dotenv import load_dotenv
+from utils.rate_limiter import AdaptiveConcurrency, RateLimiter, TokenBucket
+from utils.transport import make_session
+
+
+def _connections_opened(session) -> int:
+    """Сколько соединений открыл транспорт за время прогона."""
+    if hasattr(session, "connections_opened"):  # Http2Session считает сам
+        return session.connections_opened
+    # ApiSession: суммируем счётчики urllib3-пулов всех смонтированных адаптеров
+    total = 0
+    for adapter in {id(a): a for a in session.adapters.values()}.values():
+        for key in adapter.poolmanager.pools.keys():
+            total += adapter.poolmanager.pools[key].num_connections
+    return total
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def run(transport: str, url: str, headers: dict, total: int, concurrency: int) -> dict:
+    # Отдельный лимитер без ограничения RPS: меряем транспорт, а не квоту
+    limiter = RateLimiter(
+        TokenBucket(rate=0, burst=1),
+        AdaptiveConcurrency(initial=concurrency, min_limit=concurrency, max_limit=concurrency),
+    )
+    session = make_session(transport, limiter=limiter)
+    session.headers.update(headers)
+
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+
+    def one(_: int) -> None:
+        t0 = time.perf_counter()
+        resp = session.get(url, timeout=30)
+        _ = resp.content
+        latencies.append(time.perf_counter() - t0)
+        statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - started
+
+    result = {
+        "transport": transport,
+        "connections": _connections_opened(session),
+        "wall_s": wall,
+        "rps": total / wall if wall else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "max_ms": max(latencies) * 1000,
+        "statuses": statuses,
+    }
+    session.close()
+    return result
+
+
+def main() -> None:
+    dotenv_path = Path(__file__).resolve().parents[1] / ".env"
+    if dotenv_path.exists():
+        load_dotenv(dotenv_path=dotenv_path)
+
+    parser = argparse.ArgumentParser(description="HTTP/1.1 vs HTTP/2 under parallel load")
+    parser.add_argument("--url", default=None, help="URL для GET (по умолчанию {HOST}/user?limit=1)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    host = os.getenv("HOST", "").strip().rstrip("/")
+    url = args.url or f"{host}/user?limit=1"
+    token = os.getenv("API_TOKEN", "").strip()
+    headers = {"Accept": "application/json", **({"app-id": token} if token else {})}
+
+    print(f"GET {url}  requests={args.requests} concurrency={args.concurrency}")
+    print(f"{'transport':<10}{'conns':>7}{'wall,s':>9}{'rps':>9}{'p50,ms':>9}{'p95,ms':>9}{'max,ms':>9}  statuses")
+    for transport in ("http1", "http2"):
+        r = run(transport, url, headers, args.requests, args.concurrency)
+        print(
+            f"{r['transport']:<10}{r['connections']:>7}{r['wall_s']:>9.2f}{r['rps']:>9.1f}"
+            f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['max_ms']:>9.1f}  {r['statuses']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Бенчмарк: накладные расходы инструментирования клиентов на один запрос (utils/instrumentation.py).
+
+Сеть не нужна: сессия-заглушка возвращает заранее собранный requests.Response (200, JSON пользователя),
+поэтому в замере остаётся только то, что клиент делает вокруг запроса, — allure-шаг и вложения.
+
+Уровень инструментирования читается один раз при импорте клиентов, поэтому каждый уровень
+меряется в отдельном подпроцессе (env INSTRUMENTATION=full|failures|off).
+
+Колонки:
+- raw us/call     — UsersAPI.get_user_by_id_response (шаг + attach_response_safe)
+- checked us/call — UsersAPI.get_user_by_id (то же + проверка статуса и pydantic-модель)
+- overhead        — разница с уровнем off (чистая цена шагов/вложений на запрос)
+
+Без --alluredir allure-listener не зарегистрирован, поэтому замер — нижняя граница: с отчётом
+к уровню full добавляется ещё и запись вложений на диск.
+
+Запуск:
+    python -m benchmarks.bench_instrumentation --calls 20000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+LEVELS = ("full", "failures", "off")
+CALLS_PER_TEST = 20  # сколько запросов "делает один тест": на failures буфер вложений чистится между тестами
+
+USER = {
+    "id": "60d0fe4f5311236168a109ca",
+    "title": "ms",
+    "firstName": "Sara",
+    "lastName": "Andersen",
+    "picture": "https://randomuser.me/api/portraits/women/58.jpg",
+    "email": "sara.andersen@example.com",
+    "gender": "female",
+    "phone": "92694011",
+}
+
+
+class FakeSession:
+    """Минимальная замена requests.Session: get() сразу отдаёт готовый ответ."""
+
+    def __init__(self, response):
+        self.response = response
+
+    def get(self, url, **kwargs):
+        return self.response
+
+
+def make_response():
+    import requests
+
+    prepared = requests.Request(
+        "GET", "http://bench.local/data/v1/user/" + USER["id"], headers={"app-id": "bench"},
+    ).prepare()
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps(USER).encode()
+    response.request = prepared
+    response.url = prepared.url
+    return response
+
+
+def worker(calls: int) -> None:
+    """Выполняется в подпроцессе: уровень уже задан через env INSTRUMENTATION."""
+    from services.users.api_users import UsersAPI
+    from services.users.user_endpoints import UserEndpoints
+    from utils.instrumentation import discard_pending
+
+    api = UsersAPI(FakeSession(make_response()), UserEndpoints("http://bench.local/data/v1"))
+    result = {}
+    for name, call in (("raw", api.get_user_by_id_response), ("checked", api.get_user_by_id)):
+        for _ in range(500):  # прогрев
+            call(USER["id"])
+        discard_pending()
+
+        started = time.perf_counter()
+        for i in range(calls):
+            call(USER["id"])
+            if i % CALLS_PER_TEST == CALLS_PER_TEST - 1:
+                discard_pending()  # как InstrumentationPlugin после teardown прошедшего теста
+        result[name] = (time.perf_counter() - started) * 1e6 / calls
+        discard_pending()
+    print(json.dumps(result))
+
+
+def run_level(level: str, calls: int) -> dict:
+    env = dict(os.environ, INSTRUMENTATION=level)
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_instrumentation", "--worker", "--calls", str(calls)],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-request overhead of client instrumentation levels")
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.calls)
+        return
+
+    rows = {level: run_level(level, args.calls) for level in LEVELS}
+    base = rows["off"]
+    print(f"{args.calls} calls per method, {CALLS_PER_TEST} calls per simulated test\n")
+    print(f"{'level':9} {'raw us/call':>12} {'overhead':>9} {'checked us/call':>16} {'overhead':>9}")
+    for level in LEVELS:
+        row = rows[level]
+        print(f"{level:9} {row['raw']:>12.1f} {row['raw'] - base['raw']:>+9.1f} "
+              f"{row['checked']:>16.1f} {row['checked'] - base['checked']:>+9.1f}")
+
+
+if __name__ == "__main__":
+    main()
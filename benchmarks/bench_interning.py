@@ -0,0 +1,118 @@
+"""
+Бенчмарк: память и время валидации страниц списков с интернированием владельцев и без него.
+
+Данные синтетические (форма как у /post и /comment DummyAPI), сеть не нужна:
+- pages страниц по 50 элементов, у каждого элемента — полное превью владельца
+- владельцы выбираются из owners пользователей (мало владельцев = много повторов на странице)
+
+Для каждого режима:
+- retained KiB — сколько памяти держат провалидированные модели (tracemalloc, после gc)
+- owner objects — сколько различных экземпляров UserModel в результате
+- ms/page — время валидации одной страницы
+
+Режимы: без интернера, интернер на страницу, один интернер на весь обход.
+
+Запуск:
+    python -m benchmarks.bench_interning --pages 200 --owners 20
+    python -m benchmarks.bench_interning --pages 200 --owners 5000   # почти без повторов — цена интернера
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import secrets
+import time
+import tracemalloc
+from typing import Callable, Optional
+from services.comments.comment_model import CommentModel
+from services.posts.post_model import PostModel
+from utils.interning import OwnerInterner
+
+PAGE_SIZE = 50
+
+
+def make_owners(count: int) -> list[dict]:
+    return [
+        {
+            "id": secrets.token_hex(12),
+            "title": random.choice(["mr", "ms", "mrs", "miss"]),
+            "firstName": f"First{i}",
+            "lastName": f"Last{i}",
+            "picture": f"https://randomuser.me/api/portraits/med/men/{i % 100}.jpg",
+        }
+        for i in range(count)
+    ]
+
+
+def make_pages(kind: str, pages: int, owners: list[dict]) -> list[list[dict]]:
+    """Каждый элемент получает СВОЮ копию превью владельца — как после json.loads ответа."""
+    result = []
+    for _ in range(pages):
+        page = []
+        for _ in range(PAGE_SIZE):
+            owner = dict(random.choice(owners))
+            if kind == "post":
+                page.append({"id": secrets.token_hex(12), "text": "Auto post 1a2b3c4d", "likes": 3,
+                             "image": "https://images.unsplash.com/photo-1542291026-7eec264c27ff",
+                             "tags": ["a", "b"], "publishDate": "2026-10-19T10:00:00.000Z", "owner": owner})
+            else:
+                page.append({"id": secrets.token_hex(12), "message": "Auto comment 1a2b3c4d",
+                             "post": secrets.token_hex(12), "publishDate": "2026-10-19T10:00:00.000Z",
+                             "owner": owner})
+        result.append(page)
+    return result
+
+
+def measure(model, pages: list[list[dict]], interner_for_page: Callable[[], Optional[OwnerInterner]]) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    kept = []
+    for page in pages:
+        interner = interner_for_page()
+        context = interner.context() if interner is not None else None
+        kept.append([model.model_validate(item, context=context) for item in page])
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    owner_objects = len({id(item.owner) for page in kept for item in page})
+    return {
+        "retained_kib": (after - before) / 1024,
+        "owner_objects": owner_objects,
+        "ms_per_page": elapsed * 1000 / len(pages),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Owner interning benchmark")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--owners", type=int, default=20, help="различных владельцев во всём наборе")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    owners = make_owners(args.owners)
+    print(f"{args.pages} pages x {PAGE_SIZE} items, {args.owners} distinct owners\n")
+    print(f"{'model':8} {'mode':10} {'retained KiB':>13} {'owner objects':>14} {'ms/page':>8}")
+    for kind, model in (("post", PostModel), ("comment", CommentModel)):
+        pages = make_pages(kind, args.pages, owners)
+        session_interner = OwnerInterner()
+        modes = {
+            "off": lambda: None,
+            "per-page": OwnerInterner,
+            "session": lambda: session_interner,
+        }
+        baseline = None
+        for mode, factory in modes.items():
+            row = measure(model, pages, factory)
+            baseline = baseline or row["retained_kib"]
+            saved = f"  ({row['retained_kib'] / baseline - 1:+.0%} memory vs off)" if mode != "off" else ""
+            print(f"{kind:8} {mode:10} {row['retained_kib']:>13.0f} {row['owner_objects']:>14} "
+                  f"{row['ms_per_page']:>8.2f}{saved}")
+
+
+if __name__ == "__main__":
+    main()
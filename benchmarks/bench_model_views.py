@@ -0,0 +1,127 @@
+"""
+Бенчмарк: полные Pydantic-модели vs ленивые view (utils/model_views.py) для страниц списков.
+
+Данные синтетические (форма как у /user, /post, /comment DummyAPI), сеть не нужна.
+Для каждой страницы меряется весь путь от байтов ответа: json.loads -> записи -> проверка id.
+
+Сценарии:
+- ids      — только [x.id for x in page] и `some_id in ids` (типичный assert в тестах)
+- all      — обращение ко всем полям каждой записи (худший случай для view)
+
+Колонки:
+- us/page  — CPU-время на страницу (декодирование JSON включено — оно одинаковое для обоих режимов)
+- peak KiB — пик памяти на страницу (tracemalloc)
+- kept KiB — сколько памяти держит результат (view держат сырые dict'ы, модели — свои поля)
+
+Запуск:
+    python -m benchmarks.bench_model_views --pages 300
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import secrets
+import time
+import tracemalloc
+from services.comments.comment_model import CommentModel
+from services.posts.post_model import PostModel
+from services.users.user_model import UserModel
+from utils.model_views import CommentView, PostView, UserView
+
+PAGE_SIZE = 50
+
+
+def _owner(i: int) -> dict:
+    return {"id": secrets.token_hex(12), "title": "mr", "firstName": f"First{i}", "lastName": f"Last{i}",
+            "picture": f"https://randomuser.me/api/portraits/med/men/{i % 100}.jpg"}
+
+
+def make_page(kind: str) -> bytes:
+    items = []
+    for i in range(PAGE_SIZE):
+        if kind == "user":
+            items.append(_owner(i))
+        elif kind == "post":
+            items.append({"id": secrets.token_hex(12), "text": f"Auto post {secrets.token_hex(4)}", "likes": i,
+                          "image": "https://images.unsplash.com/photo-1542291026-7eec264c27ff",
+                          "tags": ["a", "b"], "publishDate": "2026-10-19T10:00:00.000Z", "owner": _owner(i)})
+        else:
+            items.append({"id": secrets.token_hex(12), "message": f"Auto comment {secrets.token_hex(4)}",
+                          "post": secrets.token_hex(12), "publishDate": "2026-10-19T10:00:00.000Z",
+                          "owner": _owner(i)})
+    return json.dumps({"data": items, "total": 10_000, "page": 0, "limit": PAGE_SIZE}).encode()
+
+
+def parse(body: bytes, mode: str, model, view) -> list:
+    data = json.loads(body)["data"]
+    if mode == "model":
+        return [model.model_validate(item) for item in data]
+    return [view(item) for item in data]
+
+
+def scenario_ids(records: list, needle: str) -> None:
+    ids = [r.id for r in records]
+    assert needle in ids
+
+
+def scenario_all(records: list, fields: tuple[str, ...]) -> None:
+    for r in records:
+        for name in fields:
+            getattr(r, name)
+
+
+def run(kind: str, mode: str, scenario: str, pages: list[bytes], model, view) -> dict:
+    fields = tuple(model.model_fields)
+    needle = json.loads(pages[-1])["data"][-1]["id"]
+    for body in pages[:20]:  # прогрев: первые валидации схемы заметно дороже
+        scenario_all(parse(body, mode, model, view), fields)
+
+    started = time.perf_counter()
+    for body in pages:
+        records = parse(body, mode, model, view)
+        if scenario == "ids":
+            scenario_ids(records, needle if body is pages[-1] else records[0].id)
+        else:
+            scenario_all(records, fields)
+    us_per_page = (time.perf_counter() - started) * 1e6 / len(pages)
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    records = parse(pages[0], mode, model, view)
+    if scenario == "ids":
+        scenario_ids(records, records[0].id)
+    else:
+        scenario_all(records, fields)
+    gc.collect()
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return {"us_per_page": us_per_page, "peak_kib": (peak - before) / 1024, "kept_kib": (kept - before) / 1024}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Full models vs lazy views benchmark")
+    parser.add_argument("--pages", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"{args.pages} pages x {PAGE_SIZE} items\n")
+    print(f"{'kind':8} {'scenario':9} {'mode':6} {'us/page':>9} {'peak KiB':>9} {'kept KiB':>9}")
+    for kind, model, view in (("user", UserModel, UserView), ("post", PostModel, PostView),
+                              ("comment", CommentModel, CommentView)):
+        pages = [make_page(kind) for _ in range(args.pages)]
+        for scenario in ("ids", "all"):
+            base = None
+            for mode in ("model", "view"):
+                row = run(kind, mode, scenario, pages, model, view)
+                base = base or row
+                delta = "" if mode == "model" else \
+                    f"  (cpu {row['us_per_page'] / base['us_per_page'] - 1:+.0%}, peak {row['peak_kib'] / base['peak_kib'] - 1:+.0%})"
+                print(f"{kind:8} {scenario:9} {mode:6} {row['us_per_page']:>9.0f} {row['peak_kib']:>9.1f} "
+                      f"{row['kept_kib']:>9.1f}{delta}")
+
+
+if __name__ == "__main__":
+    main()
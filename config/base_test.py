@@ -1,9 +1,16 @@
+from __future__ import annotations  # аннотации ниже не вычисляются при импорте
+
+from typing import TYPE_CHECKING
 import pytest  # подключаем библиотеку pytest (фреймворк для запуска тестов и фикстур)
-# Импортируем классы-клиенты для работы с разными частями API
-# (обычно это обёртки над HTTP-запросами: get/post/put/delete)
-from services.posts.api_posts import PostsAPI
-from services.users.api_users import UsersAPI
-from services.comments.api_comments import CommentsAPI
+
+# Классы-клиенты для работы с разными частями API
+# (обычно это обёртки над HTTP-запросами: get/post/put/delete).
+# Импортируем их только для подсказок типов: сами объекты приходят из фикстур conftest.py,
+# поэтому импорт тестового модуля не тянет за собой allure/pydantic/Faker клиентов.
+if TYPE_CHECKING:
+    from services.posts.api_posts import PostsAPI
+    from services.users.api_users import UsersAPI
+    from services.comments.api_comments import CommentsAPI
 
 
 class BaseTest:
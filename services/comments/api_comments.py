@@ -1,9 +1,14 @@
-import allure
 import requests
 from services.comments.comment_endpoints import CommentEndpoints
 from services.comments.comment_payloads import CommentPayloads
 from services.comments.comment_model import CommentModel
 from utils.helper import Helper
+from utils.instrumentation import step
+from utils.interning import OwnerInterner
+from utils.json_stream import read_list_page
+from utils.model_views import CommentView
+from utils.routes import route_template
+from utils.visibility import listed_ids, wait_until_visible
 
 
 class CommentsAPI(Helper):
@@ -12,6 +17,7 @@ class CommentsAPI(Helper):
 
     - *_response (RAW): запросы без assert'ов, возвращают requests.Response
     - методы без *_response (CHECKED): assert статуса + парсинг JSON в Pydantic-модели
+      (list-методы с view=True — лёгкие CommentView, см. utils/model_views.py)
     """
 
     def __init__(self, session: requests.Session, endpoints: CommentEndpoints, timeout: int = 15):
@@ -24,7 +30,7 @@ class CommentsAPI(Helper):
 # ======================================================================================================================
 # ================================================RAW=(no=asserts)======================================================
 
-    @allure.step("GET /comment (raw)")
+    @step("GET /comment (raw)")
     def list_comments_response(self, limit: int = 10, page: int = 0) -> requests.Response:
         resp = self.session.get(
             url=self.endpoints.list_comments,
@@ -34,7 +40,7 @@ class CommentsAPI(Helper):
         self.attach_response_safe(resp)
         return resp
 
-    @allure.step("GET /post/{post_id}/comment (raw)")
+    @step("GET /post/{post_id}/comment (raw)")
     def list_comments_by_post_response(self, post_id: str, limit: int = 10, page: int = 0) -> requests.Response:
         resp = self.session.get(
             url=self.endpoints.comments_by_post(post_id),
@@ -44,7 +50,7 @@ class CommentsAPI(Helper):
         self.attach_response_safe(resp)
         return resp
 
-    @allure.step("GET /user/{user_id}/comment (raw)")
+    @step("GET /user/{user_id}/comment (raw)")
     def list_comments_by_user_response(self, user_id: str, limit: int = 10, page: int = 0) -> requests.Response:
         resp = self.session.get(
             url=self.endpoints.comments_by_user(user_id),
@@ -54,7 +60,7 @@ class CommentsAPI(Helper):
         self.attach_response_safe(resp)
         return resp
 
-    @allure.step("POST /comment/create (raw)")
+    @step("POST /comment/create (raw)")
     def create_comment_response(self, payload: dict) -> requests.Response:
         resp = self.session.post(
             url=self.endpoints.create_comment,
@@ -64,7 +70,7 @@ class CommentsAPI(Helper):
         self.attach_response_safe(resp)
         return resp
 
-    @allure.step("DELETE /comment/{comment_id} (raw)")
+    @step("DELETE /comment/{comment_id} (raw)")
     def delete_comment_response(self, comment_id: str) -> requests.Response:
         resp = self.session.delete(
             url=self.endpoints.delete_comment(comment_id),
@@ -78,7 +84,7 @@ class CommentsAPI(Helper):
 # ======================================================================================================================
 # ==================================================CHECKED=============================================================
 
-    @allure.step("Create comment (owner={owner_id}, post={post_id})")
+    @step("Create comment (owner={owner_id}, post={post_id})")
     def create_comment(self, owner_id: str, post_id: str, payload: dict | None = None) -> tuple[str, CommentModel]:
         if payload is None:
             payload = CommentPayloads.create_comment(owner_id=owner_id, post_id=post_id)
@@ -93,7 +99,7 @@ class CommentsAPI(Helper):
 
         return comment_id, CommentModel.model_validate(body)
 
-    @allure.step("Delete comment by id: {comment_id}")
+    @step("Delete comment by id: {comment_id}")
     def delete_comment(self, comment_id: str, allow_not_found: bool = False) -> str | None:
         resp = self.delete_comment_response(comment_id)
 
@@ -113,23 +119,61 @@ class CommentsAPI(Helper):
             return body.get("id") or body.get("data") or str(body)
         return str(body)
 
-    @allure.step("List comments")
-    def list_comments(self, limit: int = 10, page: int = 0) -> list[CommentModel]:
+    @step("List comments")
+    def list_comments(
+            self, limit: int = 10, page: int = 0, interner: OwnerInterner | None = None,
+            view: bool = False,
+    ) -> list[CommentModel] | list[CommentView]:
         resp = self.list_comments_response(limit=limit, page=page)
-        body = resp.json()
-        assert resp.status_code == 200, body
-        return [CommentModel.model_validate(item) for item in body.get("data", [])]
-
-    @allure.step("List comments by post: {post_id}")
-    def list_comments_by_post(self, post_id: str, limit: int = 10, page: int = 0) -> list[CommentModel]:
+        if view:
+            return read_list_page(resp, CommentView)
+        context = interner.context() if interner is not None else None
+        return read_list_page(resp, lambda item: CommentModel.model_validate(item, context=context))
+
+    @step("List comments by post: {post_id}")
+    def list_comments_by_post(
+            self, post_id: str, limit: int = 10, page: int = 0, interner: OwnerInterner | None = None,
+            view: bool = False,
+    ) -> list[CommentModel] | list[CommentView]:
         resp = self.list_comments_by_post_response(post_id=post_id, limit=limit, page=page)
-        body = resp.json()
-        assert resp.status_code == 200, body
-        return [CommentModel.model_validate(item) for item in body.get("data", [])]
-
-    @allure.step("List comments by user: {user_id}")
-    def list_comments_by_user(self, user_id: str, limit: int = 10, page: int = 0) -> list[CommentModel]:
+        if view:
+            return read_list_page(resp, CommentView)
+        context = interner.context() if interner is not None else None
+        return read_list_page(resp, lambda item: CommentModel.model_validate(item, context=context))
+
+    @step("List comments by user: {user_id}")
+    def list_comments_by_user(
+            self, user_id: str, limit: int = 10, page: int = 0, interner: OwnerInterner | None = None,
+            view: bool = False,
+    ) -> list[CommentModel] | list[CommentView]:
         resp = self.list_comments_by_user_response(user_id=user_id, limit=limit, page=page)
-        body = resp.json()
-        assert resp.status_code == 200, body
-        return [CommentModel.model_validate(item) for item in body.get("data", [])]
\ No newline at end of file
+        if view:
+            return read_list_page(resp, CommentView)
+        context = interner.context() if interner is not None else None
+        return read_list_page(resp, lambda item: CommentModel.model_validate(item, context=context))
+
+    @step("Wait until comment {comment_id} is listed for post {post_id}")
+    def wait_comment_visible_for_post(
+            self, post_id: str, comment_id: str, timeout: float | None = None, limit: int = 50,
+    ) -> float:
+        """Ждёт появления комментария в GET /post/{id}/comment; возвращает наблюдаемую задержку, сек."""
+        url = self.endpoints.comments_by_post(post_id)
+        return wait_until_visible(
+            lambda: comment_id in listed_ids(self.list_comments_by_post_response(post_id=post_id, limit=limit)),
+            route=route_template(url),
+            what=f"comment {comment_id}",
+            timeout=timeout,
+        )
+
+    @step("Wait until comment {comment_id} is listed for user {user_id}")
+    def wait_comment_visible_for_user(
+            self, user_id: str, comment_id: str, timeout: float | None = None, limit: int = 50,
+    ) -> float:
+        """Ждёт появления комментария в GET /user/{id}/comment; возвращает наблюдаемую задержку, сек."""
+        url = self.endpoints.comments_by_user(user_id)
+        return wait_until_visible(
+            lambda: comment_id in listed_ids(self.list_comments_by_user_response(user_id=user_id, limit=limit)),
+            route=route_template(url),
+            what=f"comment {comment_id}",
+            timeout=timeout,
+        )
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, ValidationInfo, field_validator
 from services.users.user_model import UserModel
+from utils.interning import intern_owner
 
 
 class CommentModel(BaseModel):
@@ -8,4 +9,10 @@ class CommentModel(BaseModel):
     message: str
     owner: UserModel | None
     post: str | None
-    publishDate: str | None
\ No newline at end of file
+    publishDate: str | None
+
+    # Опционально: общий экземпляр владельца на страницу/обход (context={"owner_interner": ...})
+    @field_validator("owner", mode="wrap")
+    @classmethod
+    def _intern_owner(cls, value, handler, info: ValidationInfo):
+        return intern_owner(value, handler, info)
@@ -1,9 +1,14 @@
-import allure
 import requests
 from services.posts.post_endpoints import PostEndpoints
 from services.posts.post_payloads import PostPayloads
 from services.posts.post_model import PostModel
 from utils.helper import Helper
+from utils.instrumentation import step
+from utils.interning import OwnerInterner
+from utils.json_stream import read_list_page
+from utils.model_views import PostView
+from utils.routes import route_template
+from utils.visibility import listed_ids, wait_until_visible
 
 
 class PostsAPI(Helper):
@@ -12,6 +17,7 @@ class PostsAPI(Helper):
 
     - RAW методы (*_response): возвращают requests.Response без assert'ов
     - CHECKED методы: проверяют статус, парсят JSON, возвращают PostModel
+      (list-методы с view=True — лёгкие PostView, см. utils/model_views.py)
     """
 
     def __init__(self, session: requests.Session, endpoints: PostEndpoints, timeout: int = 15):
@@ -25,7 +31,7 @@ class PostsAPI(Helper):
 # ======================================================================================================================
 # ================================================RAW=(no=asserts)======================================================
 
-    @allure.step("POST /post/create (raw)")
+    @step("POST /post/create (raw)")
     def create_post_response(self, payload: dict) -> requests.Response:
         resp = self.session.post(
             url=self.endpoints.create_post,
@@ -35,7 +41,7 @@ class PostsAPI(Helper):
         self.attach_response_safe(resp)
         return resp
 
-    @allure.step("GET /post/{post_id} (raw)")
+    @step("GET /post/{post_id} (raw)")
     def get_post_by_id_response(self, post_id: str) -> requests.Response:
         resp = self.session.get(
             url=self.endpoints.post_by_id(post_id),
@@ -44,7 +50,7 @@ class PostsAPI(Helper):
         self.attach_response_safe(resp)
         return resp
 
-    @allure.step("PUT /post/{post_id} (raw)")
+    @step("PUT /post/{post_id} (raw)")
     def update_post_response(self, post_id: str, payload: dict) -> requests.Response:
         resp = self.session.put(
             url=self.endpoints.post_by_id(post_id),
@@ -54,7 +60,7 @@ class PostsAPI(Helper):
         self.attach_response_safe(resp)
         return resp
 
-    @allure.step("DELETE /post/{post_id} (raw)")
+    @step("DELETE /post/{post_id} (raw)")
     def delete_post_response(self, post_id: str) -> requests.Response:
         resp = self.session.delete(
             url=self.endpoints.post_by_id(post_id),
@@ -63,7 +69,7 @@ class PostsAPI(Helper):
         self.attach_response_safe(resp)
         return resp
 
-    @allure.step("GET /post (raw)")
+    @step("GET /post (raw)")
     def list_posts_response(self, limit: int = 10, page: int = 0) -> requests.Response:
         resp = self.session.get(
             url=self.endpoints.list_posts,
@@ -73,7 +79,7 @@ class PostsAPI(Helper):
         self.attach_response_safe(resp)
         return resp
 
-    @allure.step("GET /user/{user_id}/post (raw)")
+    @step("GET /user/{user_id}/post (raw)")
     def list_posts_by_user_response(self, user_id: str, limit: int = 10, page: int = 0) -> requests.Response:
         resp = self.session.get(
             url=self.endpoints.posts_by_user(user_id),
@@ -87,7 +93,7 @@ class PostsAPI(Helper):
 # ======================================================================================================================
 # ==================================================CHECKED=============================================================
 
-    @allure.step("Create post (owner={owner_id})")
+    @step("Create post (owner={owner_id})")
     def create_post(self, owner_id: str, payload: dict | None = None) -> tuple[str, PostModel]:
         if payload is None:
             payload = PostPayloads.create_post(owner_id)
@@ -101,21 +107,21 @@ class PostsAPI(Helper):
 
         return post_id, PostModel.model_validate(body)
 
-    @allure.step("Get post by id: {post_id}")
+    @step("Get post by id: {post_id}")
     def get_post_by_id(self, post_id: str) -> PostModel:
         resp = self.get_post_by_id_response(post_id)
         body = resp.json()
         assert resp.status_code == 200, body
         return PostModel.model_validate(body)
 
-    @allure.step("Update post by id: {post_id}")
+    @step("Update post by id: {post_id}")
     def update_post(self, post_id: str, payload: dict) -> PostModel:
         resp = self.update_post_response(post_id, payload)
         body = resp.json()
         assert resp.status_code == 200, body
         return PostModel.model_validate(body)
 
-    @allure.step("Delete post by id: {post_id}")
+    @step("Delete post by id: {post_id}")
     def delete_post(self, post_id: str, allow_not_found: bool = False) -> str | None:
         resp = self.delete_post_response(post_id)
         if allow_not_found and resp.status_code == 404:
@@ -134,17 +140,40 @@ class PostsAPI(Helper):
             return body.get("id") or body.get("data") or str(body)
         return str(body)
 
-    @allure.step("List posts")
-    def list_posts(self, limit: int = 10, page: int = 0) -> list[PostModel]:
+    @step("List posts")
+    def list_posts(
+            self, limit: int = 10, page: int = 0, interner: OwnerInterner | None = None,
+            view: bool = False,
+    ) -> list[PostModel] | list[PostView]:
         resp = self.list_posts_response(limit=limit, page=page)
-        body = resp.json()
-        assert resp.status_code == 200, body
-
-        return [PostModel.model_validate(item) for item in body.get("data", [])]
-
-    @allure.step("List posts by user: {user_id}")
-    def list_posts_by_user(self, user_id: str, limit: int = 10, page: int = 0) -> list[PostModel]:
+        if view:
+            return read_list_page(resp, PostView)
+        context = interner.context() if interner is not None else None
+        return read_list_page(resp, lambda item: PostModel.model_validate(item, context=context))
+
+    @step("List posts by user: {user_id}")
+    def list_posts_by_user(
+            self, user_id: str, limit: int = 10, page: int = 0, interner: OwnerInterner | None = None,
+            view: bool = False,
+    ) -> list[PostModel] | list[PostView]:
         resp = self.list_posts_by_user_response(user_id=user_id, limit=limit, page=page)
-        body = resp.json()
-        assert resp.status_code == 200, body
-        return [PostModel.model_validate(item) for item in body.get("data", [])]
\ No newline at end of file
+        if view:
+            return read_list_page(resp, PostView)
+        context = interner.context() if interner is not None else None
+        return read_list_page(resp, lambda item: PostModel.model_validate(item, context=context))
+
+    @step("Wait until post {post_id} is listed for user {user_id}")
+    def wait_post_visible_for_user(
+            self, user_id: str, post_id: str, timeout: float | None = None, limit: int = 50,
+    ) -> float:
+        """
+        Ждёт, пока только что созданный пост появится в GET /user/{id}/post (реплицируемый бэкенд),
+        и возвращает наблюдаемую задержку, сек. Проверка — только по id, без моделей.
+        """
+        url = self.endpoints.posts_by_user(user_id)
+        return wait_until_visible(
+            lambda: post_id in listed_ids(self.list_posts_by_user_response(user_id=user_id, limit=limit)),
+            route=route_template(url),
+            what=f"post {post_id}",
+            timeout=timeout,
+        )
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, ValidationInfo, field_validator
 from services.users.user_model import UserModel
+from utils.interning import intern_owner
 
 
 class PostModel(BaseModel):
@@ -9,3 +10,9 @@ class PostModel(BaseModel):
     image: str | None = None
     likes: int | None = None
     owner: UserModel
+
+    # Опционально: общий экземпляр владельца на страницу/обход (context={"owner_interner": ...})
+    @field_validator("owner", mode="wrap")
+    @classmethod
+    def _intern_owner(cls, value, handler, info: ValidationInfo):
+        return intern_owner(value, handler, info)
@@ -1,9 +1,11 @@
-import allure
 import requests
 from services.users.user_endpoints import UserEndpoints
 from services.users.user_payloads import UserPayloads
 from services.users.user_model import UserModel
 from utils.helper import Helper
+from utils.instrumentation import step
+from utils.json_stream import read_list_page
+from utils.model_views import UserView
 
 
 class UsersAPI(Helper):
@@ -25,7 +27,7 @@ class UsersAPI(Helper):
 # ======================================================================================================================
 # ================================================RAW=(no=asserts)======================================================
 
-    @allure.step("POST /user/create (raw)")
+    @step("POST /user/create (raw)")
     def create_user_response(self, payload: dict | None = None) -> requests.Response:
         if payload is None:
             payload = UserPayloads.create_user()
@@ -38,7 +40,7 @@ class UsersAPI(Helper):
         self.attach_response_safe(response)
         return response
 
-    @allure.step("GET /user/{user_id} (raw)")
+    @step("GET /user/{user_id} (raw)")
     def get_user_by_id_response(self, user_id: str) -> requests.Response:
         response = self.session.get(
             url=self.endpoints.get_user_by_id(user_id),
@@ -47,7 +49,7 @@ class UsersAPI(Helper):
         self.attach_response_safe(response)
         return response
 
-    @allure.step("GET /user (raw)")
+    @step("GET /user (raw)")
     def list_users_response(self, limit: int = 10, page: int = 0) -> requests.Response:
         resp = self.session.get(
             self.endpoints.get_users_list(),
@@ -57,7 +59,7 @@ class UsersAPI(Helper):
         self.attach_response_safe(resp)
         return resp
 
-    @allure.step("PUT /user/{user_id} (raw)")
+    @step("PUT /user/{user_id} (raw)")
     def update_user_response(self, user_id: str, payload: dict) -> requests.Response:
         response = self.session.put(
             url=self.endpoints.update_user(user_id),
@@ -67,7 +69,7 @@ class UsersAPI(Helper):
         self.attach_response_safe(response)
         return response
 
-    @allure.step("DELETE /user/{user_id} (raw)")
+    @step("DELETE /user/{user_id} (raw)")
     def delete_user_response(self, user_id: str) -> requests.Response:
         response = self.session.delete(
             url=self.endpoints.delete_user(user_id),
@@ -81,7 +83,7 @@ class UsersAPI(Helper):
 # ======================================================================================================================
 # ==================================================CHECKED=============================================================
 
-    @allure.step("Create user")
+    @step("Create user")
     def create_user(self, payload: dict | None = None) -> tuple[str, UserModel]:
         response = self.create_user_response(payload=payload)
         response_json = response.json()
@@ -94,35 +96,40 @@ class UsersAPI(Helper):
         # Pydantic v2: корректный способ валидации/парсинга
         return user_id, UserModel.model_validate(response_json)
 
-    @allure.step("Get user by id: {user_id}")
+    @step("Get user by id: {user_id}")
     def get_user_by_id(self, user_id: str) -> UserModel:
         response = self.get_user_by_id_response(user_id)
         response_json = response.json()
         assert response.status_code == 200, response_json
         return UserModel.model_validate(response_json)
 
-    @allure.step("List users")
-    def list_users(self, limit: int = 10, page: int = 0) -> list[UserModel]:
+    @step("List users")
+    def list_users(self, limit: int = 10, page: int = 0, view: bool = False) -> list[UserModel] | list[UserView]:
         """
         Обычно список лежит в поле "data":
         {"data": [ {...}, {...} ], "total": ..., ...}
 
         В UserModel стоит extra="ignore", поэтому лишние поля в элементах списка не мешают.
+
+        view=True — вместо моделей лёгкие UserView (utils/model_views.py): поля валидируются
+        при первом обращении. Удобно, когда из списка нужны только id.
+
+        Возвращается ListPage — обычный list + total/page/limit из конверта.
+        Если у сессии stream = True, тело разбирается потоково, по элементу (utils/json_stream.py).
         """
         resp = self.list_users_response(limit=limit, page=page)
-        body = resp.json()
-        assert resp.status_code == 200, body
-
-        return [UserModel.model_validate(item) for item in body.get("data", [])]
+        if view:
+            return read_list_page(resp, UserView)
+        return read_list_page(resp, UserModel.model_validate)
 
-    @allure.step("Update user by id: {user_id}")
+    @step("Update user by id: {user_id}")
     def update_user(self, user_id: str, payload: dict) -> UserModel:
         response = self.update_user_response(user_id, payload)
         response_json = response.json()
         assert response.status_code == 200, response_json
         return UserModel.model_validate(response_json)
 
-    @allure.step("Delete user by id: {user_id}")
+    @step("Delete user by id: {user_id}")
     def delete_user(self, user_id: str, allow_not_found: bool = False) -> None:
         response = self.delete_user_response(user_id)
 
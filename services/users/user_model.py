@@ -12,3 +12,12 @@ class UserModel(BaseModel):
     picture: str | None = None
     dateOfBirth: str | None = None
     phone: str | None = None
+
+
+class FrozenUserModel(UserModel):
+    """
+    Неизменяемый UserModel — для владельцев, которые делят между собой много постов/комментариев
+    (см. utils/interning.OwnerInterner): общий экземпляр нельзя случайно поменять "из одного поста".
+    """
+
+    model_config = ConfigDict(extra="ignore", frozen=True)
@@ -1,7 +1,22 @@
+from __future__ import annotations
+
 import uuid  # генерация уникальных значений (uuid4) — полезно, чтобы email не повторялся
-from faker import Faker  # генератор “фейковых” данных: имена, телефоны, даты и т.д.
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from faker import Faker  # генератор “фейковых” данных: имена, телефоны, даты и т.д.
+
+
+@lru_cache(maxsize=None)
+def _fake() -> Faker:
+    """
+    Экземпляр Faker создаём один раз, но лениво — при первой генерации payload'а.
+    Импорт faker + Faker() заметно дорогие, а при сборе тестов (и в тестах без payload'ов) они не нужны.
+    """
+    from faker import Faker
 
-fake = Faker()  # создаём экземпляр Faker один раз, чтобы использовать в методах
+    return Faker()
 
 
 class UserPayloads:
@@ -20,6 +35,7 @@ class UserPayloads:
         - многие API не разрешают создавать несколько пользователей с одинаковым email
         - в тестах важно избегать конфликтов/флаков из-за дублей
         """
+        fake = _fake()
         # uuid.uuid4().hex — это уникальная строка без дефисов
         unique_email = f"autotest_{uuid.uuid4().hex}@example.com"
 
@@ -39,6 +55,7 @@ class UserPayloads:
         Обычно при update не обязательно передавать все поля —
         можно менять только часть (firstName, lastName, phone).
         """
+        fake = _fake()
         return {
             "firstName": fake.first_name(),  # новое имя
             "lastName": fake.last_name(),    # новая фамилия
@@ -8,6 +8,7 @@ from config.base_test import BaseTest
 @pytest.mark.smoke
 class TestComments(BaseTest):
 
+    @pytest.mark.max_requests(10)
     @allure.title("Comment flow (CREATE -> LIST by post -> LIST by user -> DELETE -> verify deleted)")
     def test_comment_crud(self, created_user, post_factory, comment_factory):
         user_id, _ = created_user
@@ -2,8 +2,46 @@ import allure
 import pytest
 from config.base_test import BaseTest
 from utils.assertions import assert_dummyapi_error
+from utils.raw_http import RawPrefetch, RawRequest
 from services.comments.comment_payloads import CommentPayloads
 
+APP_ID_HEADERS = {"APP_ID_MISSING": None, "APP_ID_NOT_EXIST": {"app-id": "invalid-app-id"}}
+READ_PATHS = ["/comment?limit=5", "/post/{post_id}/comment?limit=5"]
+
+
+@pytest.fixture(scope="module")
+def prefetched(raw_http, users_api, posts_api, api_token: str, base_url: str):
+    """
+    Raw-запросы модуля уходят одним параллельным batch; каждый тест проверяет и прикрепляет свой ответ.
+    Пользователь и пост для create-payload'ов создаются один раз на модуль и удаляются после.
+    """
+    user_id, _ = users_api.create_user()
+    post_id, _ = posts_api.create_post(owner_id=user_id)
+    payload = CommentPayloads.create_comment(owner_id=user_id, post_id=post_id)
+
+    raw_requests = {
+        ("POST /comment/create", code): RawRequest(
+            "POST", f"{base_url}/comment/create", headers=headers, json_body=payload
+        )
+        for code, headers in APP_ID_HEADERS.items()
+    }
+    raw_requests.update({
+        (path, code): RawRequest("GET", base_url + path.format(post_id=post_id), headers=headers)
+        for path in READ_PATHS
+        for code, headers in APP_ID_HEADERS.items()
+    })
+    raw_requests.update({
+        "malformed_post_id": RawRequest(
+            "GET", f"{base_url}/post/123/comment?limit=10&page=0", headers={"app-id": api_token}
+        ),
+        "path_not_found": RawRequest("GET", f"{base_url}/commentzzz", headers={"app-id": api_token}),
+    })
+
+    yield RawPrefetch(raw_http, raw_requests)
+
+    posts_api.delete_post(post_id, allow_not_found=True)
+    users_api.delete_user(user_id, allow_not_found=True)
+
 
 @allure.epic("Administration")
 @allure.feature("Comments")
@@ -13,32 +51,22 @@ class TestCommentsNegative(BaseTest):
     # ---------------- APP_ID errors ----------------
 
     @allure.title("POST /comment/create without app-id -> 403 APP_ID_MISSING")
-    def test_create_comment_without_app_id(self, raw_comments, created_user, post_factory, base_url: str):
-        user_id, _ = created_user
-        post_id, _ = post_factory(owner_id=user_id)
-
-        payload = CommentPayloads.create_comment(owner_id=user_id, post_id=post_id)
-
-        resp = raw_comments.post(
-            f"{base_url}/comment/create",
-            json_body=payload,  # app-id НЕ передаём
-        )
+    def test_create_comment_without_app_id(self, prefetched: RawPrefetch):
+        resp = prefetched.response(("POST /comment/create", "APP_ID_MISSING"))  # app-id НЕ передаём
         assert_dummyapi_error(resp, 403, "APP_ID_MISSING")
 
     @allure.title("POST /comment/create with invalid app-id -> 403 APP_ID_NOT_EXIST")
-    def test_create_comment_with_invalid_app_id(self, raw_comments, created_user, post_factory, base_url: str):
-        user_id, _ = created_user
-        post_id, _ = post_factory(owner_id=user_id)
-
-        payload = CommentPayloads.create_comment(owner_id=user_id, post_id=post_id)
-
-        resp = raw_comments.post(
-            f"{base_url}/comment/create",
-            headers={"app-id": "invalid-app-id"},
-            json_body=payload,
-        )
+    def test_create_comment_with_invalid_app_id(self, prefetched: RawPrefetch):
+        resp = prefetched.response(("POST /comment/create", "APP_ID_NOT_EXIST"))
         assert_dummyapi_error(resp, 403, "APP_ID_NOT_EXIST")
 
+    @allure.title("GET {path} -> 403 {expected_error}")
+    @pytest.mark.parametrize("expected_error", APP_ID_HEADERS)
+    @pytest.mark.parametrize("path", READ_PATHS)
+    def test_read_endpoints_app_id_errors(self, prefetched: RawPrefetch, path: str, expected_error: str):
+        resp = prefetched.response((path, expected_error))
+        assert_dummyapi_error(resp, 403, expected_error)
+
     # ---------------- BODY_NOT_VALID ----------------
 
     @allure.title("POST /comment/create missing owner -> 400 BODY_NOT_VALID")
@@ -66,13 +94,8 @@ class TestCommentsNegative(BaseTest):
     # ---------------- PARAMS_NOT_VALID ----------------
 
     @allure.title("GET /post/{bad_id}/comment -> 400 PARAMS_NOT_VALID")
-    def test_list_comments_by_post_malformed_post_id(self, raw_comments, api_token: str, base_url: str):
-        bad_post_id = "123"
-
-        resp = raw_comments.get(
-            f"{base_url}/post/{bad_post_id}/comment?limit=10&page=0",
-            headers={"app-id": api_token},
-        )
+    def test_list_comments_by_post_malformed_post_id(self, prefetched: RawPrefetch):
+        resp = prefetched.response("malformed_post_id")
         assert_dummyapi_error(resp, 400, "PARAMS_NOT_VALID")
 
     # ---------------- RESOURCE_NOT_FOUND ----------------
@@ -86,9 +109,6 @@ class TestCommentsNegative(BaseTest):
     # ---------------- PATH_NOT_FOUND ----------------
 
     @allure.title("GET wrong path -> 404 PATH_NOT_FOUND")
-    def test_path_not_found(self, raw_comments, api_token: str, base_url: str):
-        resp = raw_comments.get(
-            f"{base_url}/commentzzz",
-            headers={"app-id": api_token},
-        )
+    def test_path_not_found(self, prefetched: RawPrefetch):
+        resp = prefetched.response("path_not_found")
         assert_dummyapi_error(resp, 404, "PATH_NOT_FOUND")
@@ -46,9 +46,8 @@ class TestComments(BaseTest):
             comment_id, _ = comment_factory(owner_id=user_id, post_id=post_id)
             assert comment_id
 
-        with allure.step("READ: list comments by post and verify created id is present"):
-            comments = self.api_comments.list_comments_by_post(post_id=post_id, limit=50, page=0)
-            assert comment_id in [c.id for c in comments]
+        with allure.step("READ: list comments by post and wait until created id is present"):
+            self.api_comments.wait_comment_visible_for_post(post_id=post_id, comment_id=comment_id)
 
     @allure.title("Get Comments By User -> GET /user/{user_id}/comment")
     def test_get_list_comments_by_user(self, created_user, post_factory, comment_factory):
@@ -85,4 +84,22 @@ class TestComments(BaseTest):
 
         with allure.step("VERIFY DELETE: повторный DELETE -> 404"):
             resp = self.api_comments.delete_comment_response(comment_id)
-            assert resp.status_code == 404, resp.text
\ No newline at end of file
+            assert resp.status_code == 404, resp.text
+
+    @pytest.mark.max_requests(34)
+    @allure.title("Comments of a user graph -> GET /post/{post_id}/comment, GET /user/{user_id}/comment")
+    def test_list_comments_in_entity_graph(self, entity_graph):
+        with allure.step("PRECONDITION: 2 users x 2 posts x 2 comments"):
+            graph = entity_graph(users=2, posts_per_user=2, comments_per_post=2)
+            assert len(graph.comments) == 8
+
+        with allure.step("READ: every post lists exactly its comments"):
+            for post in graph.posts:
+                comments = self.api_comments.list_comments_by_post(post_id=post.id, limit=50, page=0)
+                assert {c.id for c in comments} == {c.id for c in post.comments}
+
+        with allure.step("READ: every user lists the comments they wrote"):
+            for user in graph.users:
+                written = {c.id for c in graph.comments if c.owner_id == user.id}
+                comments = self.api_comments.list_comments_by_user(user_id=user.id, limit=50, page=0)
+                assert written <= {c.id for c in comments}
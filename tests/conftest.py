@@ -1,27 +1,162 @@
+from __future__ import annotations
+
+import time
+
+# Засекаем время импорта conftest — для отчёта --startup-report
+_CONFTEST_IMPORT_STARTED = time.perf_counter()
+
 import os  # работа с переменными окружения (ENV), например HOST и API_TOKEN
-import pytest  # pytest: фикстуры, тесты, ассерты
-import requests  # HTTP-клиент (мы будем делать запросы в API)
-from utils.raw_http import RawHttp
 from pathlib import Path  # удобная работа с путями к файлам
-from dotenv import load_dotenv  # загрузка переменных из .env файла в окружение
-
-# Импортируем API-клиенты и классы эндпоинтов (урлы/роуты)
-from services.users.api_users import UsersAPI
-from services.users.user_endpoints import UserEndpoints
-from services.posts.api_posts import PostsAPI
-from services.posts.post_endpoints import PostEndpoints
-from services.comments.api_comments import CommentsAPI
-from services.comments.comment_endpoints import CommentEndpoints
+from typing import TYPE_CHECKING
+import pytest  # pytest: фикстуры, тесты, ассерты
+from utils.startup_timing import StartupTimingPlugin
+
+# Тяжёлые модули (requests, dotenv, API-клиенты -> allure/pydantic/Faker) НЕ импортируем на старте:
+# они импортируются внутри фикстур, когда фикстура реально понадобилась.
+# Так "pytest -m smoke" на один тест не платит за импорт всего фреймворка при сборе.
+# Здесь — только для подсказок типов (IDE/линтер), в рантайме этот блок не выполняется.
+if TYPE_CHECKING:
+    import requests
+    from utils.connection_pool import ConnectionManager
+    from utils.raw_http import RawHttp
+    from utils.fault_proxy import FaultProxy
+    from services.users.api_users import UsersAPI
+    from services.users.user_endpoints import UserEndpoints
+    from services.posts.api_posts import PostsAPI
+    from services.posts.post_endpoints import PostEndpoints
+    from services.comments.api_comments import CommentsAPI
+    from services.comments.comment_endpoints import CommentEndpoints
 
 DEFAULT_TIMEOUT = 15  # таймаут для HTTP-запросов (сек), чтобы тесты не висли бесконечно
 
 # ---------- Загрузка переменных окружения из .env ----------
 # Ищем файл .env на уровень выше (parents[1]) относительно текущего файла (обычно conftest.py).
 dotenv_path = Path(__file__).resolve().parents[1] / ".env"
+_env_loaded = False
+
+
+def _load_env() -> None:
+    """
+    Если .env существует — загружаем из него переменные окружения (HOST, API_TOKEN и т.д.).
+    Делаем это лениво (первой фикстурой, которой нужно окружение), а не при импорте conftest.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    if dotenv_path.exists():
+        from dotenv import load_dotenv  # загрузка переменных из .env файла в окружение
+        load_dotenv(dotenv_path=dotenv_path)
+
+
+# ---------- Отчёты о производительности (--startup-report / --http-report) ----------
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--startup-report",
+        action="store_true",
+        default=False,
+        help="print startup timing: bootstrap, conftest import, collection, session fixtures",
+    )
+    parser.addoption(
+        "--http-report",
+        action="store_true",
+        default=False,
+        help="print per-route HTTP phase timing (dns/connect/tls/ttfb/download), cold vs warm",
+    )
+    parser.addoption(
+        "--requests-report",
+        action="store_true",
+        default=False,
+        help="print the tests that make the most HTTP requests (per phase and route)",
+    )
+    parser.addoption(
+        "--sweep-orphans",
+        action="store_true",
+        default=False,
+        help="before tests, delete autotest users/posts/comments left by crashed runs (older than SWEEP_MIN_AGE min)",
+    )
+    parser.addoption(
+        "--instrumentation",
+        choices=("full", "failures", "off"),
+        default=None,
+        help="allure steps/attachments of API clients: full (default), failures (attach only for failed tests), off",
+    )
+    parser.addoption(
+        "--event-log",
+        default=None,
+        metavar="DIR",
+        help="write every HTTP request as an NDJSON event to DIR (or env EVENT_LOG_DIR; EVENT_LOG_COMPRESS=1 for .gz)",
+    )
+    parser.addoption(
+        "--trace-timeline",
+        default=None,
+        metavar="DIR",
+        help="write test phases, fixtures, allure steps and HTTP calls as a Chrome trace to DIR/trace.json",
+    )
+    parser.addoption(
+        "--perf-history",
+        default=None,
+        metavar="PATH",
+        help="store test durations and route latencies in SQLite PATH and flag slowdowns vs previous runs "
+             "(or env PERF_HISTORY_DB)",
+    )
+    parser.addoption(
+        "--perf-suite",
+        default=None,
+        help="suite name for --perf-history (all/smoke/regression/negative); default: from -m, else all",
+    )
+    parser.addoption(
+        "--perf-fail-ratio",
+        type=float,
+        default=None,
+        help="fail the run if a flagged slowdown is at least RATIO times the baseline median (or env PERF_FAIL_RATIO)",
+    )
 
-# Если .env существует — загружаем из него переменные окружения (HOST, API_TOKEN и т.д.)
-if dotenv_path.exists():
-    load_dotenv(dotenv_path=dotenv_path)
+
+def pytest_configure(config):
+    # Уровень инструментирования читается клиентами один раз при импорте — задаём его ДО фикстур
+    if config.getoption("--instrumentation"):
+        os.environ["INSTRUMENTATION"] = config.getoption("--instrumentation")
+    from utils.instrumentation import InstrumentationPlugin  # лёгкий модуль: allure импортируется лениво
+    config.pluginmanager.register(InstrumentationPlugin(), name="instrumentation")
+    # Текущий тест/фаза (для журналов и учёта запросов) и бюджет запросов (@pytest.mark.max_requests) — всегда
+    from utils.request_budget import RequestBudgetPlugin
+    from utils.test_context import TestContextPlugin
+    config.pluginmanager.register(TestContextPlugin(), name="test-context")
+    report_top = 10 if config.getoption("--requests-report") or os.getenv("REQUESTS_REPORT") == "1" else None
+    config.pluginmanager.register(RequestBudgetPlugin(report_top=report_top), name="request-budget")
+    event_log_dir = config.getoption("--event-log") or os.getenv("EVENT_LOG_DIR")
+    if event_log_dir:
+        from utils.event_log import DEFAULT_MAX_FILE_BYTES, EventLogPlugin
+        max_mb = os.getenv("EVENT_LOG_MAX_MB")
+        config.pluginmanager.register(
+            EventLogPlugin(
+                event_log_dir,
+                compress=os.getenv("EVENT_LOG_COMPRESS") == "1",
+                max_file_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_FILE_BYTES,
+            ),
+            name="event-log",
+        )
+    trace_dir = config.getoption("--trace-timeline") or os.getenv("TRACE_TIMELINE_DIR")
+    if trace_dir:
+        from utils.trace_export import TraceTimelinePlugin  # импортирует allure и транспорт — только по флагу
+        config.pluginmanager.register(TraceTimelinePlugin(trace_dir), name="trace-timeline")
+    perf_db = config.getoption("--perf-history") or os.getenv("PERF_HISTORY_DB")
+    if perf_db:
+        from utils.perf_history import SUITES, PerfHistoryPlugin
+        markexpr = (config.getoption("markexpr") or "").strip()
+        suite = config.getoption("--perf-suite") or os.getenv("PERF_SUITE") or (markexpr if markexpr in SUITES else "all")
+        fail_ratio = config.getoption("--perf-fail-ratio") or (float(os.getenv("PERF_FAIL_RATIO", "0")) or None)
+        config.pluginmanager.register(PerfHistoryPlugin(perf_db, suite=suite, fail_ratio=fail_ratio), name="perf-history")
+    if config.getoption("--startup-report") or os.getenv("STARTUP_REPORT") == "1":
+        config.pluginmanager.register(
+            StartupTimingPlugin(_CONFTEST_IMPORT_STARTED, _CONFTEST_IMPORT_FINISHED),
+            name="startup-timing",
+        )
+    if config.getoption("--http-report") or os.getenv("HTTP_REPORT") == "1":
+        from utils.http_metrics import HttpMetricsPlugin  # импортирует транспорт — только когда отчёт включён
+        config.pluginmanager.register(HttpMetricsPlugin(), name="http-metrics")
 
 
 # ---------- Базовые фикстуры окружения (HOST / TOKEN / HTTP session) ----------
@@ -34,6 +169,7 @@ def base_url() -> str:
     - rstrip("/") убирает завершающий слэш, чтобы не получилось // в URL
     scope="session": создаётся один раз на всю тестовую сессию (быстрее).
     """
+    _load_env()
     host = os.getenv("HOST", "").strip().rstrip("/")
     # assert здесь — быстрый и понятный фейл, если переменная не задана
     assert host, f"HOST is not set. Set env var HOST or create {dotenv_path} (see .env)"
@@ -46,22 +182,45 @@ def api_token() -> str:
     Берём API_TOKEN (у DummyAPI это app-id).
     Если токена нет — падаем сразу, чтобы не бегать тестами впустую.
     """
+    _load_env()
     token = os.getenv("API_TOKEN", "").strip()
     assert token, f"API_TOKEN is not set. Set env var API_TOKEN or create {dotenv_path} (see .env)"
     return token
 
 
+@pytest.fixture(scope="session")
+def connection_manager(base_url: str) -> ConnectionManager:
+    """
+    Общий пул соединений на всю тестовую сессию.
+
+    - на старте заранее открывает POOL_PREWARM (по умолчанию 4) соединений к HOST (DNS + TCP + TLS)
+    - кэширует DNS и переиспользует TLS-сессии для соединений, открытых позже
+    - http-фикстура и RawHttp берут из него сессии, поэтому установка соединений уходит
+      с критического пути каждого теста
+    """
+    from utils.connection_pool import ConnectionManager
+
+    manager = ConnectionManager.from_env()
+    manager.prewarm(base_url, timeout=DEFAULT_TIMEOUT)
+    yield manager
+    manager.close()
+
+
 # Почему requests.Session — хорошо:
 # 1) соединения переиспользуются (быстрее, меньше накладных расходов)
 # 2) заголовки задаём один раз, не повторяем в каждом запросе
 # 3) можно централизованно менять поведение (ретраи/прокси/адаптеры и т.д.)
+# connection_manager.session() (через make_session()) по умолчанию возвращает ApiSession — наследника requests.Session: все запросы идут
+# через общий RateLimiter (token bucket + адаптивная конкурентность), который делят клиенты и RawHttp.
+# HTTP_TRANSPORT=http2 — вместо неё Http2Session (httpx) с тем же интерфейсом.
 @pytest.fixture(scope="session")
-def http(api_token: str) -> requests.Session:
+def http(api_token: str, connection_manager: ConnectionManager) -> requests.Session:
     """
     Создаём одну HTTP-сессию на всю тестовую сессию (scope="session").
     В неё сразу добавляем заголовки, которые нужны для каждого запроса.
+    Соединения берутся из общего тёплого пула connection_manager.
     """
-    session = requests.Session()
+    session = connection_manager.session()
 
     # headers.update добавляет дефолтные заголовки ко всем запросам этой session
     session.headers.update({
@@ -70,6 +229,11 @@ def http(api_token: str) -> requests.Session:
         "Content-Type": "application/json",  # обычно нужен для POST/PUT с JSON
     })
 
+    # HTTP_STREAM=1: тела ответов не читаются заранее — list-методы разбирают "data" потоково
+    # (utils/json_stream.py), остальные читают тело как обычно при resp.json()
+    if os.getenv("HTTP_STREAM") == "1":
+        session.stream = True
+
     # yield в фикстуре означает:
     # - всё до yield выполняется ДО тестов
     # - всё после yield выполняется ПОСЛЕ тестов (teardown/cleanup)
@@ -79,6 +243,24 @@ def http(api_token: str) -> requests.Session:
     session.close()
 
 
+@pytest.fixture(autouse=True, scope="session")
+def perf_history(request):
+    """
+    История производительности (--perf-history): после всех тестов сохраняет прогон в SQLite,
+    сравнивает с прошлыми прогонами того же suite и прикладывает отчёт в Allure.
+    Без флага фикстура ничего не делает.
+    """
+    plugin = request.config.pluginmanager.get_plugin("perf-history")
+    yield
+    if plugin is None:
+        return
+    import allure
+
+    plugin.finish()
+    allure.attach("\n".join(plugin.report_lines()), name="Performance history",
+                  attachment_type=allure.attachment_type.TEXT)
+
+
 @pytest.fixture(autouse=True, scope="session")
 def env_check(http: requests.Session, base_url: str):
     """
@@ -93,6 +275,31 @@ def env_check(http: requests.Session, base_url: str):
     assert response.status_code == 200, f"Env check failed: {response.status_code} {response.text}"
 
 
+@pytest.fixture(autouse=True, scope="session")
+def orphan_sweep(request, env_check, http: requests.Session, base_url: str):
+    """
+    Опциональная уборка перед прогоном (--sweep-orphans или SWEEP_ORPHANS=1):
+    удаляет тестовых пользователей/посты/комментарии, оставшиеся от упавших прогонов.
+    Трогает только то, что старше SWEEP_MIN_AGE минут (по умолчанию 60) — данные соседнего
+    идущего прогона не пострадают. Без флага фикстура ничего не делает.
+    """
+    if not (request.config.getoption("--sweep-orphans") or os.getenv("SWEEP_ORPHANS") == "1"):
+        return
+    from datetime import timedelta
+    from utils.sweeper import OrphanSweeper
+
+    min_age = timedelta(minutes=float(os.getenv("SWEEP_MIN_AGE", "60")))
+    report = OrphanSweeper(http, base_url, min_age=min_age, timeout=DEFAULT_TIMEOUT).sweep()
+    reporter = request.config.pluginmanager.get_plugin("terminalreporter")
+    capture = request.config.pluginmanager.get_plugin("capturemanager")
+    if reporter is not None and capture is not None:
+        # во время setup вывод перехвачен — печатаем в обход захвата, как это делает сам pytest
+        with capture.global_and_fixture_disabled():
+            reporter.write_line("")
+            for line in ["orphan sweep:", *report.format().splitlines()]:
+                reporter.write_line(line)
+
+
 # =======================================================USERS==========================================================
 # ======================================================================================================================
 # =======================================================USERS==========================================================
@@ -103,6 +310,8 @@ def user_endpoints(base_url: str) -> UserEndpoints:
     Создаём объект, который знает URL'ы юзер-эндпоинтов.
     Обычно внутри: /user, /user/{id}, и т.п.
     """
+    from services.users.user_endpoints import UserEndpoints
+
     return UserEndpoints(base_url)
 
 
@@ -115,6 +324,8 @@ def users_api(http: requests.Session, user_endpoints: UserEndpoints) -> UsersAPI
     - endpoints для формирования урлов
     - timeout для ограничения времени ожидания
     """
+    from services.users.api_users import UsersAPI
+
     return UsersAPI(
         session=http,
         endpoints=user_endpoints,
@@ -166,12 +377,16 @@ def created_user(user_factory):
 @pytest.fixture(scope="session")
 def post_endpoints(base_url: str) -> PostEndpoints:
     """Объект с URL'ами для постов."""
+    from services.posts.post_endpoints import PostEndpoints
+
     return PostEndpoints(base_url)
 
 
 @pytest.fixture(scope="session")
 def posts_api(http: requests.Session, post_endpoints: PostEndpoints) -> PostsAPI:
     """API-клиент для постов (создание/удаление/получение)."""
+    from services.posts.api_posts import PostsAPI
+
     return PostsAPI(
         session=http,
         endpoints=post_endpoints,
@@ -218,12 +433,16 @@ def created_post(post_factory):
 @pytest.fixture(scope="session")
 def comment_endpoints(base_url: str) -> CommentEndpoints:
     """Объект с URL'ами для комментариев."""
+    from services.comments.comment_endpoints import CommentEndpoints
+
     return CommentEndpoints(base_url)
 
 
 @pytest.fixture(scope="session")
 def comments_api(http: requests.Session, comment_endpoints: CommentEndpoints) -> CommentsAPI:
     """API-клиент для комментариев."""
+    from services.comments.api_comments import CommentsAPI
+
     return CommentsAPI(
         session=http,
         endpoints=comment_endpoints,
@@ -268,27 +487,129 @@ def created_comment(comment_factory):
     return comment_factory()
 
 
+# ====================================================ГРАФ=СУЩНОСТЕЙ====================================================
+# ======================================================================================================================
+# ====================================================ГРАФ=СУЩНОСТЕЙ====================================================
+
+@pytest.fixture
+def entity_graph(users_api: UsersAPI, posts_api: PostsAPI, comments_api: CommentsAPI):
+    """
+    Фабрика графа сущностей на тест: entity_graph(users=3, posts_per_user=4, comments_per_post=5).
+
+    В отличие от вложенных циклов по comment_factory, граф строится уровнями,
+    и create-запросы каждого уровня идут параллельно. Возвращает EntityGraph с индексами по id.
+    После теста всё созданное удаляется (комментарии -> посты -> пользователи).
+    """
+    from utils.entity_graph import EntityGraphBuilder
+
+    builder = EntityGraphBuilder(users_api, posts_api, comments_api)
+
+    yield builder.build
+
+    builder.cleanup()
+
+
 # ===============================================ДЛЯ=НЕГАТИВНЫХ=ТЕСТОВ==================================================
 # ======================================================================================================================
 # ===============================================ДЛЯ=НЕГАТИВНЫХ=ТЕСТОВ==================================================
 
 
-@pytest.fixture
-def raw_users(users_api):
-    raw = RawHttp(timeout=DEFAULT_TIMEOUT, attach=users_api.attach_response_safe)
+@pytest.fixture(scope="session")
+def raw_http(users_api, connection_manager) -> RawHttp:
+    """
+    Один RawHttp на всю тестовую сессию поверх общего тёплого пула.
+
+    Заголовки (нет app-id / неверный / валидный) задаются в каждом запросе, поэтому делить
+    экземпляр между тестами безопасно. Аттачи в Allure идут в тот тест, который сейчас выполняется.
+    """
+    from utils.instrumentation import OFF, level
+    from utils.raw_http import RawHttp
+
+    attach = None if level() == OFF else users_api.attach_response_safe
+    raw = RawHttp(timeout=DEFAULT_TIMEOUT, attach=attach, session=connection_manager.session())
     yield raw
     raw.close()
 
 
+# Имена по ресурсам оставлены для читаемости тестов — это один и тот же session-scoped клиент
+
 @pytest.fixture
-def raw_posts(posts_api):
-    raw = RawHttp(timeout=DEFAULT_TIMEOUT, attach=posts_api.attach_response_safe)
-    yield raw
-    raw.close()
+def raw_users(raw_http: RawHttp) -> RawHttp:
+    return raw_http
 
 
 @pytest.fixture
-def raw_comments(comments_api):
-    raw = RawHttp(timeout=DEFAULT_TIMEOUT, attach=comments_api.attach_response_safe)
-    yield raw
-    raw.close()
+def raw_posts(raw_http: RawHttp) -> RawHttp:
+    return raw_http
+
+
+@pytest.fixture
+def raw_comments(raw_http: RawHttp) -> RawHttp:
+    return raw_http
+
+
+# ===============================================ПРОКСИ=СО=СБОЯМИ======================================================
+# ======================================================================================================================
+# ===============================================ПРОКСИ=СО=СБОЯМИ======================================================
+
+
+@pytest.fixture(scope="session")
+def fault_proxy_server(base_url: str) -> FaultProxy:
+    """
+    Локальный прокси со сбоями (utils/fault_proxy.py) перед HOST — один на сессию, поднимается по первому запросу.
+    FAULT_SEED — seed генератора сбоев (по умолчанию 0: вероятностные сценарии повторяются от прогона к прогону).
+    """
+    from utils.fault_proxy import FaultProxy
+
+    proxy = FaultProxy(upstream=base_url, seed=int(os.getenv("FAULT_SEED", "0"))).start()
+    yield proxy
+    proxy.stop()
+
+
+@pytest.fixture
+def fault_proxy(fault_proxy_server: FaultProxy) -> FaultProxy:
+    """
+    Прокси со сбоями для теста: правила задаются прямо в тесте, после теста — сбрасываются.
+
+        fault_proxy.inject(route="/user/{id}", method="GET", status={503: 1.0}, times=2)
+    """
+    fault_proxy_server.clear()
+    yield fault_proxy_server
+    fault_proxy_server.clear()
+
+
+@pytest.fixture(scope="session")
+def proxied_http(api_token: str) -> requests.Session:
+    """
+    Сессия для запросов через прокси со СВОИМ RateLimiter: подстроенные 429/5xx и таймауты
+    режут AIMD-лимит только ей, а не общему лимитеру остальных тестов.
+    """
+    from utils.rate_limiter import RateLimiter
+    from utils.transport import make_session
+
+    session = make_session(limiter=RateLimiter.from_env())
+    session.headers.update({"app-id": api_token, "Accept": "application/json", "Content-Type": "application/json"})
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def proxied_users_api(proxied_http: requests.Session, fault_proxy: FaultProxy) -> UsersAPI:
+    """UsersAPI через прокси. Function scope: тест может менять timeout (proxied_users_api.timeout = 0.2)."""
+    from services.users.api_users import UsersAPI
+    from services.users.user_endpoints import UserEndpoints
+
+    return UsersAPI(session=proxied_http, endpoints=UserEndpoints(fault_proxy.base_url), timeout=DEFAULT_TIMEOUT)
+
+
+@pytest.fixture
+def proxied_raw_http(proxied_http: requests.Session, fault_proxy: FaultProxy) -> RawHttp:
+    """RawHttp через прокси: URL собираются от fault_proxy.base_url, app-id передаётся в запросе."""
+    from utils.raw_http import RawHttp
+
+    # Сессию не закрываем (close) — она общая, её закрывает proxied_http
+    return RawHttp(timeout=DEFAULT_TIMEOUT, session=proxied_http)
+
+
+# Конец импорта conftest (см. --startup-report)
+_CONFTEST_IMPORT_FINISHED = time.perf_counter()
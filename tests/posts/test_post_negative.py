@@ -2,8 +2,43 @@ import allure
 import pytest
 from config.base_test import BaseTest
 from utils.assertions import assert_dummyapi_error
+from utils.raw_http import RawPrefetch, RawRequest
 from services.posts.post_payloads import PostPayloads
 
+NON_EXISTENT_ID = "000000000000000000000000"
+APP_ID_HEADERS = {"APP_ID_MISSING": None, "APP_ID_NOT_EXIST": {"app-id": "invalid-app-id"}}
+READ_PATHS = ["/post?limit=5", "/post/{id}"]
+
+
+@pytest.fixture(scope="module")
+def prefetched(raw_http, users_api, api_token: str, base_url: str):
+    """
+    Raw-запросы модуля уходят одним параллельным batch; каждый тест проверяет и прикрепляет свой ответ.
+    Владелец для create-payload'ов создаётся один на модуль и удаляется после.
+    """
+    owner_id, _ = users_api.create_user()
+    payload = {
+        "text": "Hello world",
+        "image": "https://example.com/1.jpg",
+        "likes": 0,
+        "owner": owner_id,
+    }
+
+    raw_requests = {
+        ("POST /post/create", code): RawRequest("POST", f"{base_url}/post/create", headers=headers, json_body=payload)
+        for code, headers in APP_ID_HEADERS.items()
+    }
+    raw_requests.update({
+        (path, code): RawRequest("GET", base_url + path.format(id=NON_EXISTENT_ID), headers=headers)
+        for path in READ_PATHS
+        for code, headers in APP_ID_HEADERS.items()
+    })
+    raw_requests["path_not_found"] = RawRequest("GET", f"{base_url}/postzzz", headers={"app-id": api_token})
+
+    yield RawPrefetch(raw_http, raw_requests)
+
+    users_api.delete_user(owner_id, allow_not_found=True)
+
 
 @allure.epic("Administration")
 @allure.feature("Posts")
@@ -13,35 +48,22 @@ class TestPostsNegative(BaseTest):
     # ---------------- APP_ID errors ----------------
 
     @allure.title("POST /post/create without app-id -> 403 APP_ID_MISSING")
-    def test_create_post_without_app_id(self, raw_posts, created_user, base_url: str):
-        owner_id, _ = created_user
-        resp = raw_posts.post(
-            f"{base_url}/post/create",
-            json_body={
-                "text": "Hello world",
-                "image": "https://example.com/1.jpg",
-                "likes": 0,
-                "owner": owner_id,
-            },
-        )
+    def test_create_post_without_app_id(self, prefetched: RawPrefetch):
+        resp = prefetched.response(("POST /post/create", "APP_ID_MISSING"))
         assert_dummyapi_error(resp, 403, "APP_ID_MISSING")
 
     @allure.title("POST /post/create with invalid app-id -> 403 APP_ID_NOT_EXIST")
-    def test_create_post_with_invalid_app_id(self, raw_posts, created_user, base_url: str):
-        owner_id, _ = created_user
-
-        resp = raw_posts.post(
-            f"{base_url}/post/create",
-            headers={"app-id": "invalid-app-id"},
-            json_body={
-                "text": "Hello world",
-                "image": "https://example.com/1.jpg",
-                "likes": 0,
-                "owner": owner_id,
-            },
-        )
+    def test_create_post_with_invalid_app_id(self, prefetched: RawPrefetch):
+        resp = prefetched.response(("POST /post/create", "APP_ID_NOT_EXIST"))
         assert_dummyapi_error(resp, 403, "APP_ID_NOT_EXIST")
 
+    @allure.title("GET {path} -> 403 {expected_error}")
+    @pytest.mark.parametrize("expected_error", APP_ID_HEADERS)
+    @pytest.mark.parametrize("path", READ_PATHS)
+    def test_read_endpoints_app_id_errors(self, prefetched: RawPrefetch, path: str, expected_error: str):
+        resp = prefetched.response((path, expected_error))
+        assert_dummyapi_error(resp, 403, expected_error)
+
     # ---------------- BODY_NOT_VALID ----------------
 
     @allure.title("POST /post/create without owner -> 400 BODY_NOT_VALID")
@@ -85,9 +107,6 @@ class TestPostsNegative(BaseTest):
     # ---------------- PATH_NOT_FOUND ----------------
 
     @allure.title("GET wrong path -> 404 PATH_NOT_FOUND")
-    def test_path_not_found(self, raw_posts, api_token: str, base_url: str):
-        resp = raw_posts.get(
-            f"{base_url}/postzzz",
-            headers={"app-id": api_token},
-        )
-        assert_dummyapi_error(resp, 404, "PATH_NOT_FOUND")
\ No newline at end of file
+    def test_path_not_found(self, prefetched: RawPrefetch):
+        resp = prefetched.response("path_not_found")
+        assert_dummyapi_error(resp, 404, "PATH_NOT_FOUND")
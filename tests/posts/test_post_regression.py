@@ -88,6 +88,24 @@ class TestPosts(BaseTest):
             assert len(posts) > 0
             assert all(p.id for p in posts)
 
+    @allure.title("Get List By User as views -> GET /user/{user_id}/post (view=True matches full models)")
+    def test_get_list_by_user_views(self, created_user, post_factory):
+        user_id, _ = created_user
+
+        with allure.step("PRECONDITION: create 2 posts for user"):
+            for _ in range(2):
+                post_factory(owner_id=user_id)
+
+        with allure.step("READ: list posts by user as models and as lazy views"):
+            posts = self.api_posts.list_posts_by_user(user_id=user_id, limit=50, page=0)
+            views = self.api_posts.list_posts_by_user(user_id=user_id, limit=50, page=0, view=True)
+
+        with allure.step("ASSERT: views expose the same fields and promote to the same models"):
+            assert len(views) == 2
+            assert [v.id for v in views] == [p.id for p in posts]
+            assert all(v.owner.id == user_id for v in views)
+            assert [v.to_model() for v in views] == posts
+
     @allure.title("Get List By User -> GET /user/{user_id}/post (contains created post)")
     def test_get_list_by_user(self, created_user, post_factory):
         user_id, _ = created_user
@@ -96,11 +114,6 @@ class TestPosts(BaseTest):
             post_id, _ = post_factory(owner_id=user_id)
             assert post_id
 
-        with allure.step("READ: list posts by user and verify id is present"):
-            posts = self.api_posts.list_posts_by_user(
-                user_id=user_id,
-                limit=50,
-                page=0
-            )
-            ids = [p.id for p in posts]
-            assert post_id in ids
\ No newline at end of file
+        with allure.step("READ: list posts by user and wait until id is present"):
+            # список может отставать от create на реплицируемом бэкенде — опрос с backoff вместо sleep
+            self.api_posts.wait_post_visible_for_user(user_id=user_id, post_id=post_id)
\ No newline at end of file
@@ -0,0 +1,75 @@
+import time
+import allure
+import pytest
+import requests
+from utils.assertions import assert_dummyapi_error
+from utils.fault_proxy import Latency
+
+
+@allure.epic("Administration")
+@allure.feature("Fault injection")
+@pytest.mark.faults
+class TestFaultInjection:
+
+    @allure.title("Latency above client timeout -> ReadTimeout, without waiting DEFAULT_TIMEOUT")
+    def test_slow_response_times_out(self, created_user, fault_proxy, proxied_users_api):
+        user_id, _ = created_user
+        fault_proxy.inject(route="/user/{id}", method="GET", latency=Latency.fixed(2000))
+        proxied_users_api.timeout = 0.3
+
+        with allure.step("READ: GET /user/{id} through the proxy with a 0.3 s timeout"):
+            started = time.perf_counter()
+            with pytest.raises(requests.exceptions.ReadTimeout):
+                proxied_users_api.get_user_by_id(user_id)
+            assert time.perf_counter() - started < 1.5
+
+    @allure.title("Injected 503 for the first 2 requests, then the real response")
+    def test_injected_errors_then_recovery(self, created_user, fault_proxy, proxied_raw_http, api_token):
+        user_id, _ = created_user
+        fault_proxy.inject(route="/user/{id}", method="GET", status={503: 1.0}, times=2)
+        url = f"{fault_proxy.base_url}/user/{user_id}"
+
+        with allure.step("READ: two injected 503, third request reaches HOST"):
+            for _ in range(2):
+                resp = proxied_raw_http.get(url, headers={"app-id": api_token})
+                assert_dummyapi_error(resp, 503, "SERVER_ERROR")
+                assert resp.headers["X-Fault"] == "status"
+            resp = proxied_raw_http.get(url, headers={"app-id": api_token})
+            assert resp.status_code == 200, resp.text
+            assert resp.json()["id"] == user_id
+            assert fault_proxy.stats == {"status": 2, "pass": 1}
+
+    @allure.title("Injected 429 carries Retry-After")
+    def test_rate_limited_with_retry_after(self, fault_proxy, proxied_raw_http, api_token):
+        fault_proxy.inject(route="/user", status={429: 1.0}, retry_after=2)
+
+        resp = proxied_raw_http.get(f"{fault_proxy.base_url}/user?limit=5", headers={"app-id": api_token})
+        assert_dummyapi_error(resp, 429, "TOO_MANY_REQUESTS")
+        assert resp.headers["Retry-After"] == "2"
+
+    @allure.title("Connection reset -> ConnectionError")
+    def test_connection_reset(self, fault_proxy, proxied_users_api):
+        fault_proxy.inject(route="/user/create", method="POST", reset=1.0)
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            proxied_users_api.create_user_response()
+        assert fault_proxy.stats == {"reset": 1}
+
+    @allure.title("Body shorter than Content-Length -> ChunkedEncodingError")
+    def test_truncated_body(self, created_user, fault_proxy, proxied_users_api):
+        user_id, _ = created_user
+        fault_proxy.inject(route="/user/{id}", method="GET", truncate=1.0)
+
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            proxied_users_api.get_user_by_id(user_id)
+
+    @allure.title("Bandwidth cap stretches the download")
+    def test_bandwidth_cap(self, fault_proxy, proxied_raw_http, api_token):
+        fault_proxy.inject(route="/user", method="GET", bandwidth=4000)
+
+        started = time.perf_counter()
+        resp = proxied_raw_http.get(f"{fault_proxy.base_url}/user?limit=20", headers={"app-id": api_token})
+        elapsed = time.perf_counter() - started
+        assert resp.status_code == 200, resp.text
+        # последняя порция уходит без паузы после неё — отсюда запас в 1/BANDWIDTH_TICKS секунды
+        assert elapsed >= len(resp.content) / 4000 - 0.05
\ No newline at end of file
@@ -0,0 +1,107 @@
+import inspect
+import allure
+import pytest
+import requests
+from services.comments.api_comments import CommentsAPI
+from services.comments.comment_endpoints import CommentEndpoints
+from services.posts.api_posts import PostsAPI
+from services.posts.post_endpoints import PostEndpoints
+from services.users.api_users import UsersAPI
+from services.users.user_endpoints import UserEndpoints
+from utils.assertions import assert_dummyapi_error
+from utils.negative_matrix import NEGATIVE_CASES, NON_EXISTENT_ID, NegativeCase, NegativeMatrix
+from utils.routes import route_template
+
+
+class RecordingSession:
+    """Сессия без сети: запоминает (метод, шаблон роута) каждого запроса и отвечает 200 {}."""
+
+    def __init__(self):
+        self.routes: set[tuple[str, str]] = set()
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        self.routes.add((method.upper(), route_template(url)))
+        resp = requests.Response()
+        resp.status_code, resp.url, resp._content = 200, url, b"{}"
+        return resp
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+
+def client_routes() -> set[tuple[str, str]]:
+    """
+    (метод, роут) всех RAW-методов (*_response) UsersAPI / PostsAPI / CommentsAPI: URL клиенты берут
+    из классов *Endpoints, метод — свой. Новый эндпоинт в клиенте без клеток матрицы уронит тест покрытия.
+    """
+    session = RecordingSession()
+    clients = [
+        UsersAPI(session=session, endpoints=UserEndpoints("http://stub")),
+        PostsAPI(session=session, endpoints=PostEndpoints("http://stub")),
+        CommentsAPI(session=session, endpoints=CommentEndpoints("http://stub")),
+    ]
+    for client in clients:
+        for name, method in inspect.getmembers(client, inspect.ismethod):
+            if not name.endswith("_response"):
+                continue
+            args = {
+                param: ({} if param == "payload" else NON_EXISTENT_ID)
+                for param, spec in inspect.signature(method).parameters.items()
+                if spec.default is inspect.Parameter.empty
+            }
+            method(**args)
+    return session.routes
+
+
+@pytest.fixture(scope="module")
+def negative_matrix(request, raw_http, users_api, posts_api, base_url: str, api_token: str):
+    """
+    Матрица негативных кейсов на модуль:
+    - создаём одного пользователя и один пост (нужны валидным create-payload'ам), после — удаляем
+    - сразу отправляем ВСЕ выбранные в прогоне клетки параллельно (без повторов одинаковых запросов),
+      поэтому модуль идёт примерно столько, сколько самый медленный запрос
+    """
+    owner_id, _ = users_api.create_user()
+    post_id, _ = posts_api.create_post(owner_id=owner_id)
+
+    matrix = NegativeMatrix(raw_http, base_url=base_url, api_token=api_token, owner_id=owner_id, post_id=post_id)
+    selected = [
+        item.callspec.params["negative_case"]
+        for item in request.session.items
+        if "negative_case" in getattr(getattr(item, "callspec", None), "params", {})
+    ]
+    matrix.prefetch(selected)
+
+    yield matrix
+
+    posts_api.delete_post(post_id, allow_not_found=True)
+    users_api.delete_user(owner_id, allow_not_found=True)
+
+
+@allure.epic("Administration")
+@allure.feature("Negative matrix")
+@pytest.mark.negative
+class TestNegativeMatrix:
+
+    @pytest.mark.parametrize("negative_case", NEGATIVE_CASES, ids=lambda case: case.id)
+    def test_negative_case(self, negative_matrix: NegativeMatrix, negative_case: NegativeCase):
+        allure.dynamic.title(negative_case.title)
+        allure.dynamic.story(negative_case.resource)
+
+        resp = negative_matrix.response(negative_case)
+        assert_dummyapi_error(resp, negative_case.expected_status, negative_case.expected_error)
+
+    @allure.title("Matrix covers every route and method the API clients send")
+    def test_matrix_covers_client_routes(self):
+        matrix_routes = {(case.method, route_template(case.path)) for case in NEGATIVE_CASES}
+        missing = client_routes() - matrix_routes
+        assert not missing, f"no negative cases for: {sorted(missing)}"
@@ -0,0 +1,14 @@
+import pytest
+
+
+# Модульные тесты утилит и инструментов не ходят в API: отключаем сессионные проверки окружения
+# из tests/conftest.py (env_check / orphan_sweep), чтобы они шли и без HOST / API_TOKEN.
+
+@pytest.fixture(autouse=True, scope="session")
+def env_check():
+    return None
+
+
+@pytest.fixture(autouse=True, scope="session")
+def orphan_sweep():
+    return None
@@ -0,0 +1,43 @@
+import itertools
+import threading
+import pytest
+import requests
+from services.users.user_endpoints import UserEndpoints
+from utils.entity_graph import EntityGraphBuilder
+
+
+class FakeUsersAPI:
+    """UsersAPI без сети: create отвечает по очереди из replies ("{id}" в теле — следующий id)."""
+
+    def __init__(self, replies: list[tuple[int, str]]):
+        self.endpoints = UserEndpoints("http://stub/data/v1")
+        self.timeout = 5
+        self.session = self
+        self._replies = iter(replies)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def request(self, method, url, json=None, timeout=None):
+        resp = requests.Response()
+        with self._lock:
+            resp.status_code, text = next(self._replies)
+            if resp.status_code == 200:
+                text = text.replace("{id}", f"{next(self._ids):024x}")
+        resp._content = text.encode()
+        return resp
+
+    def attach_response_safe(self, resp) -> None:
+        pass
+
+
+class TestEntityGraphBuilder:
+
+    def test_non_json_error_keeps_created_ids_for_cleanup(self):
+        user = '{"id": "{id}", "firstName": "A", "lastName": "B", "email": "a@b.cd"}'
+        api = FakeUsersAPI([(200, user), (502, "<html>Bad Gateway</html>"), (200, user)])
+        builder = EntityGraphBuilder(api, None, None, max_workers=1)
+
+        with pytest.raises(AssertionError, match="create user: 502 <html>Bad Gateway</html>"):
+            builder.build(users=3)
+
+        assert builder._created["user"] == [f"{1:024x}", f"{2:024x}"]
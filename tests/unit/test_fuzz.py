@@ -0,0 +1,26 @@
+import json
+from tools.fuzz import ENCODING_VALUES, Finding, persist
+
+
+class TestFuzzPersist:
+
+    def test_persist_lone_surrogate_finding(self, tmp_path):
+        value = ENCODING_VALUES["lone_surrogate"]
+        finding = Finding(
+            signature=("create_user", 500, "SERVER_ERROR", ()),
+            target="create_user",
+            mutation=f"firstName = {value!r}",
+            kind="encoding",
+            payload={"firstName": value, "lastName": "Doe", "email": "a@b.cd"},
+            status=500,
+            body=json.dumps({"error": "SERVER_ERROR", "echo": value}),
+            minimized={"firstName": value},
+        )
+
+        paths = persist([finding], tmp_path)
+
+        assert len(paths) == 1
+        record = json.loads(paths[0].read_text(encoding="utf-8"))
+        assert record["payload"]["firstName"] == value
+        assert record["minimized_payload"] == {"firstName": value}
+        assert record["signature"] == ["create_user", 500, "SERVER_ERROR", []]
@@ -0,0 +1,59 @@
+import pytest
+import requests
+
+httpx = pytest.importorskip("httpx")
+
+from utils.http2_transport import Http2Session  # noqa: E402
+from utils.rate_limiter import AdaptiveConcurrency, RateLimiter, TokenBucket  # noqa: E402
+
+
+class StreamedBody(httpx.SyncByteStream):
+    """Тело, которое приходит по сети (а не готовыми байтами); error — обрыв после переданных кусков."""
+
+    def __init__(self, *chunks: bytes, error: Exception | None = None):
+        self.chunks = chunks
+        self.error = error
+
+    def __iter__(self):
+        yield from self.chunks
+        if self.error:
+            raise self.error
+
+
+def _session(handler) -> Http2Session:
+    session = Http2Session(limiter=RateLimiter(TokenBucket(rate=0, burst=1), AdaptiveConcurrency()))
+    session._client = httpx.Client(transport=httpx.MockTransport(handler))
+    return session
+
+
+class TestHttp2SessionErrors:
+
+    @pytest.mark.parametrize("raised, expected", [
+        (httpx.ReadTimeout, requests.exceptions.ReadTimeout),
+        (httpx.ConnectTimeout, requests.exceptions.ConnectTimeout),
+        (httpx.ConnectError, requests.exceptions.ConnectionError),
+        (httpx.RemoteProtocolError, requests.exceptions.ConnectionError),
+    ])
+    def test_transport_errors_map_to_requests(self, raised, expected):
+        def handler(request):
+            raise raised("boom", request=request)
+
+        with pytest.raises(expected) as info:
+            _session(handler).get("http://stub/data/v1/user")
+        assert isinstance(info.value.__cause__, raised)
+
+    def test_truncated_body_is_chunked_encoding_error(self):
+        session = _session(lambda request: httpx.Response(200, stream=StreamedBody(
+            b'{"id": ', error=httpx.RemoteProtocolError("peer closed connection without sending complete message body"),
+        )))
+
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            session.get("http://stub/data/v1/user")
+
+    def test_raise_for_status_raises_requests_http_error(self):
+        session = _session(lambda request: httpx.Response(404, stream=StreamedBody(b'{"error": "RESOURCE_NOT_FOUND"}')))
+        resp = session.get("http://stub/data/v1/user/000000000000000000000000")
+
+        with pytest.raises(requests.HTTPError) as info:
+            resp.raise_for_status()
+        assert info.value.response is resp
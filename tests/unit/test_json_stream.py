@@ -0,0 +1,91 @@
+import json
+import pytest
+from utils.json_stream import ResponseTooLarge, StreamedList
+
+
+class FakeStreamedResponse:
+    """Ответ с телом, которое приходит чанками заданного размера (как iter_content у stream=True)."""
+
+    def __init__(self, body: bytes, chunk: int, content_length: bool = True):
+        self.body = body
+        self.chunk = chunk
+        self.headers = {"Content-Length": str(len(body))} if content_length else {}
+        self.url = "http://stub/data/v1/user"
+        self.closed = False
+
+    def iter_content(self, chunk_size: int):
+        for start in range(0, len(self.body), self.chunk):
+            yield self.body[start:start + self.chunk]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _stream(payload, chunk: int, **kwargs) -> StreamedList:
+    body = payload if isinstance(payload, bytes) else json.dumps(payload, ensure_ascii=False).encode()
+    return StreamedList(FakeStreamedResponse(body, chunk), **kwargs)
+
+
+CHUNK_SIZES = [1, 2, 3, 5, 7, 13, 39]
+
+
+class TestStreamedList:
+
+    @pytest.mark.parametrize("chunk", CHUNK_SIZES)
+    def test_numbers_split_across_chunks(self, chunk):
+        items = [1234567890, -98765, 3.14159, 1e-7, 0, 123456789012345678901234567890]
+        stream = _stream({"data": items, "total": 1234567, "page": 0, "limit": 50}, chunk)
+
+        assert list(stream) == items
+        assert stream.total == 1234567
+
+    @pytest.mark.parametrize("chunk", CHUNK_SIZES)
+    def test_utf8_split_across_chunks(self, chunk):
+        items = [{"firstName": "Жанна", "lastName": "测试"}, {"text": "emoji \U0001F600\U0001F44D\U0001F3FD"}]
+        stream = _stream({"data": items, "total": 2}, chunk)
+
+        assert list(stream) == items
+
+    @pytest.mark.parametrize("chunk", CHUNK_SIZES)
+    def test_envelope_after_data(self, chunk):
+        items = [{"id": f"{i:024x}"} for i in range(5)]
+        stream = _stream({"data": items, "total": 77, "page": 3, "limit": 5}, chunk)
+
+        first = next(iter(stream))
+        # Конверт спросили до конца итерации — остаток элементов уходит в очередь, итерация продолжается
+        assert (stream.total, stream.page, stream.limit) == (77, 3, 5)
+        assert [first, *stream] == items
+
+    def test_envelope_before_data(self):
+        stream = _stream({"total": 2, "page": 0, "limit": 20, "data": [{"id": "a"}, {"id": "b"}]}, chunk=4)
+
+        assert stream.total == 2
+        assert [item["id"] for item in stream] == ["a", "b"]
+
+    @pytest.mark.parametrize("payload", [{"data": [], "total": 0}, {"data": None, "total": 0}])
+    def test_empty_or_null_data(self, payload):
+        stream = _stream(payload, chunk=3)
+
+        assert list(stream) == []
+        assert stream.total == 0
+        assert stream.done
+
+    def test_too_large_by_content_length(self):
+        resp = FakeStreamedResponse(json.dumps({"data": [1, 2, 3]}).encode(), chunk=4)
+
+        with pytest.raises(ResponseTooLarge):
+            StreamedList(resp, max_bytes=10)
+        assert resp.closed
+
+    def test_too_large_while_reading(self):
+        resp = FakeStreamedResponse(json.dumps({"data": list(range(100))}).encode(), chunk=16, content_length=False)
+        stream = StreamedList(resp, max_bytes=64)
+
+        with pytest.raises(ResponseTooLarge):
+            list(stream)
+        assert resp.closed
+        assert stream.bytes_read <= 64 + 16
+
+    def test_truncated_body(self):
+        with pytest.raises(json.JSONDecodeError):
+            list(_stream(b'{"data": [{"id": "a"}, {"id": "b', chunk=5))
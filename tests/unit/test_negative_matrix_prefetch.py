@@ -0,0 +1,47 @@
+import dataclasses
+import requests
+from utils.negative_matrix import NEGATIVE_CASES, NegativeMatrix
+from utils.raw_http import RawHttp
+
+
+class CountingSession:
+    """Сессия без сети: считает отправленные запросы, на всё отвечает 403."""
+
+    def __init__(self):
+        self.sent: list[tuple[str, str]] = []
+
+    def request(self, method, url, **kwargs):
+        self.sent.append((method, url))
+        resp = requests.Response()
+        resp.status_code, resp.url = 403, url
+        return resp
+
+
+def _matrix(session: CountingSession) -> NegativeMatrix:
+    return NegativeMatrix(RawHttp(timeout=5, session=session), base_url="http://stub/data/v1",
+                          api_token="app-id", owner_id="a" * 24, post_id="b" * 24)
+
+
+class TestNegativeMatrixPrefetch:
+
+    def test_identical_cells_send_one_request(self):
+        session = CountingSession()
+        matrix = _matrix(session)
+        case = next(c for c in NEGATIVE_CASES if c.method == "POST" and c.auth == "missing")
+        twin = dataclasses.replace(case, endpoint="twin")  # другая клетка, тот же запрос
+
+        matrix.prefetch([case, twin])
+
+        assert len(session.sent) == 1
+        assert matrix.requests_sent == 1
+        assert matrix.response(case) is matrix.response(twin)
+        assert len(session.sent) == 1
+
+    def test_different_cells_are_all_sent(self):
+        session = CountingSession()
+        matrix = _matrix(session)
+        cases = [c for c in NEGATIVE_CASES if c.resource == "user" and c.auth != "valid"]
+
+        matrix.prefetch(cases)
+
+        assert len(session.sent) == len(cases)
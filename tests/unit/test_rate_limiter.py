@@ -0,0 +1,143 @@
+import pytest
+from utils.rate_limiter import AdaptiveConcurrency, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Управляемые часы: время идёт только через advance()."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class TestTokenBucket:
+
+    def test_burst_then_wait(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=3, clock=clock)
+
+        assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.try_acquire() == pytest.approx(0.1)
+
+    def test_refill_by_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=2, clock=clock)
+        bucket.try_acquire(), bucket.try_acquire()
+
+        clock.advance(0.05)
+        assert bucket.try_acquire() == pytest.approx(0.05)
+        clock.advance(0.05)
+        assert bucket.try_acquire() == 0.0
+
+    def test_refill_capped_by_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=2, clock=clock)
+        bucket.try_acquire(), bucket.try_acquire()
+
+        clock.advance(60)
+        assert [bucket.try_acquire() for _ in range(2)] == [0.0, 0.0]
+        assert bucket.try_acquire() > 0
+
+    def test_zero_rate_is_unlimited(self):
+        bucket = TokenBucket(rate=0, burst=1, clock=FakeClock())
+
+        assert all(bucket.try_acquire() == 0.0 for _ in range(1000))
+
+
+class TestAdaptiveConcurrency:
+
+    def test_additive_increase(self):
+        aimd = AdaptiveConcurrency(initial=4, max_limit=8, clock=FakeClock())
+
+        for _ in range(4):
+            aimd.on_result(200, latency=0.1)
+        # +increase / limit за ответ: примерно +1 за окно из limit ответов
+        assert 4.9 < aimd.limit < 5.0
+
+    def test_increase_capped_by_max(self):
+        aimd = AdaptiveConcurrency(initial=4, max_limit=5, clock=FakeClock())
+
+        for _ in range(100):
+            aimd.on_result(200, latency=0.1)
+        assert aimd.limit == 5
+
+    @pytest.mark.parametrize("status_code", [429, 500, 503, None])
+    def test_multiplicative_decrease(self, status_code):
+        aimd = AdaptiveConcurrency(initial=16, backoff=0.5, clock=FakeClock())
+
+        aimd.on_result(status_code, latency=0.1)
+        assert aimd.limit == 8
+
+    def test_client_errors_are_not_overload(self):
+        aimd = AdaptiveConcurrency(initial=4, clock=FakeClock())
+
+        aimd.on_result(404, latency=0.1)
+        assert aimd.limit > 4
+
+    def test_backoff_once_per_cooldown(self):
+        clock = FakeClock()
+        aimd = AdaptiveConcurrency(initial=16, backoff=0.5, cooldown=1.0, clock=clock)
+
+        for _ in range(5):
+            aimd.on_result(429, latency=0.1)
+        assert aimd.limit == 8
+
+        clock.advance(1.0)
+        aimd.on_result(429, latency=0.1)
+        assert aimd.limit == 4
+
+    def test_decrease_floored_by_min(self):
+        clock = FakeClock()
+        aimd = AdaptiveConcurrency(initial=4, min_limit=2, clock=clock)
+
+        for _ in range(10):
+            aimd.on_result(500, latency=0.1)
+            clock.advance(1.0)
+        assert aimd.limit == 2
+
+    def test_latency_degradation_backs_off(self):
+        aimd = AdaptiveConcurrency(initial=16, latency_tolerance=2.0, clock=FakeClock())
+        for _ in range(20):
+            aimd.on_result(200, latency=0.1)
+        before = aimd.limit
+
+        aimd.on_result(200, latency=1.0)
+        assert aimd.limit == before * 0.5
+
+
+class TestRateLimiter:
+
+    def test_concurrency_limit_blocks_start(self):
+        limiter = RateLimiter(TokenBucket(rate=0, burst=1), AdaptiveConcurrency(initial=2, max_limit=2))
+
+        assert limiter._try_start() == 0.0
+        assert limiter._try_start() == 0.0
+        assert limiter._try_start() > 0
+        assert limiter.concurrency.in_flight == 2
+
+    def test_slot_releases_and_records_status(self):
+        limiter = RateLimiter(TokenBucket(rate=0, burst=1), AdaptiveConcurrency(initial=4, clock=FakeClock()))
+
+        with limiter.slot() as slot:
+            assert limiter.concurrency.in_flight == 1
+            slot.record(503)
+        assert limiter.concurrency.in_flight == 0
+        assert limiter.concurrency.limit == 2
+
+    def test_from_env_unlimited_by_default(self, monkeypatch):
+        monkeypatch.delenv("RATE_LIMIT_RPS", raising=False)
+        monkeypatch.delenv("RATE_LIMIT_BURST", raising=False)
+
+        assert RateLimiter.from_env().bucket.rate == 0
+
+    def test_from_env_rps(self, monkeypatch):
+        monkeypatch.setenv("RATE_LIMIT_RPS", "20")
+        monkeypatch.delenv("RATE_LIMIT_BURST", raising=False)
+
+        bucket = RateLimiter.from_env().bucket
+        assert (bucket.rate, bucket.burst) == (20, 20)
@@ -0,0 +1,45 @@
+import pytest
+import requests
+from utils.raw_http import RawHttp, RawPrefetch, RawRequest
+
+
+class FakeSession:
+    """Сессия без сети: ответ со статусом из URL (".../404"), "down" в URL — ConnectionError."""
+
+    def __init__(self):
+        self.sent: list[tuple[str, str]] = []
+
+    def request(self, method, url, **kwargs):
+        self.sent.append((method, url))
+        if "down" in url:
+            raise requests.ConnectionError(url)
+        resp = requests.Response()
+        resp.status_code = int(url.rsplit("/", 1)[-1])
+        resp.url = url
+        return resp
+
+
+class TestRawPrefetch:
+
+    def test_sends_all_once_and_attaches_on_demand(self):
+        attached = []
+        session = FakeSession()
+        prefetch = RawPrefetch(
+            RawHttp(timeout=5, attach=attached.append, session=session),
+            {"a": RawRequest("GET", "http://stub/403"), ("b", 1): RawRequest("DELETE", "http://stub/404")},
+        )
+
+        assert sorted(session.sent) == [("DELETE", "http://stub/404"), ("GET", "http://stub/403")]
+        assert attached == []
+        assert prefetch.response(("b", 1)).status_code == 404
+        assert [resp.status_code for resp in attached] == [404]
+
+    def test_error_raised_only_for_its_key(self):
+        prefetch = RawPrefetch(
+            RawHttp(timeout=5, session=FakeSession()),
+            {"ok": RawRequest("GET", "http://stub/200"), "broken": RawRequest("GET", "http://down/200")},
+        )
+
+        assert prefetch.response("ok").status_code == 200
+        with pytest.raises(requests.ConnectionError):
+            prefetch.response("broken")
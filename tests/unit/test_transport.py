@@ -0,0 +1,106 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from utils.rate_limiter import AdaptiveConcurrency, RateLimiter, TokenBucket
+from utils.transport import ApiSession, add_response_observer, remove_response_observer
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b'{"data": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/data/v1/user"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def refused_url():
+    """URL, на котором никто не слушает: порт заняли и сразу освободили."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/data/v1/user/000000000000000000000000"
+
+
+@pytest.fixture
+def observed():
+    calls = []
+
+    def observer(timings, response):
+        calls.append((timings, response))
+
+    add_response_observer(observer)
+    yield calls
+    remove_response_observer(observer)
+
+
+@pytest.fixture
+def session():
+    limiter = RateLimiter(TokenBucket(rate=0, burst=1), AdaptiveConcurrency(initial=4))
+    with ApiSession(limiter=limiter) as s:
+        yield s
+
+
+class TestResponseObservers:
+
+    def test_failed_request_reaches_observers(self, session, refused_url, observed):
+        with pytest.raises(requests.ConnectionError):
+            session.get(refused_url, timeout=5)
+
+        [(timings, response)] = observed
+        assert response is None
+        assert timings.status_code is None
+        assert timings.error == "ConnectionError"
+        assert (timings.method, timings.route) == ("GET", "/user/{id}")
+        assert session.get_adapter(refused_url).limiter.concurrency.in_flight == 0
+
+    def test_broken_observer_does_not_fail_request(self, session, local_url, caplog):
+        calls = []
+
+        def broken(timings, response):
+            raise RuntimeError("metrics plugin bug")
+
+        def recording(timings, response):
+            calls.append(timings.status_code)
+
+        add_response_observer(broken)      # падает первым — следующие наблюдатели всё равно вызываются
+        add_response_observer(recording)
+        try:
+            resp = session.get(local_url, timeout=5)
+        finally:
+            remove_response_observer(broken)
+            remove_response_observer(recording)
+
+        assert resp.status_code == 200
+        assert calls == [200]
+        assert "metrics plugin bug" in caplog.text
+
+    def test_broken_observer_keeps_original_error(self, session, refused_url, observed):
+        def broken(timings, response):
+            raise RuntimeError("metrics plugin bug")
+
+        add_response_observer(broken)
+        try:
+            with pytest.raises(requests.ConnectionError):
+                session.get(refused_url, timeout=5)
+        finally:
+            remove_response_observer(broken)
+
+        assert len(observed) == 1
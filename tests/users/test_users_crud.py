@@ -8,6 +8,7 @@ import allure
 @pytest.mark.smoke
 class TestUsers(BaseTest):
 
+    @pytest.mark.max_requests(7)
     @allure.title("User flow (CREATE -> GET by id -> UPDATE -> GET by id -> DELETE -> GET 404)")
     def test_user_crud(self, user_factory):
 
@@ -2,8 +2,44 @@ import allure
 import pytest
 from config.base_test import BaseTest
 from utils.assertions import assert_dummyapi_error
+from utils.raw_http import RawPrefetch, RawRequest
 from services.users.user_payloads import UserPayloads
 
+NON_EXISTENT_ID = "000000000000000000000000"
+APP_ID_HEADERS = {"APP_ID_MISSING": None, "APP_ID_NOT_EXIST": {"app-id": "invalid-app-id"}}
+READ_PATHS = ["/user/{id}", "/user/{id}/post"]
+
+
+@pytest.fixture(scope="module")
+def prefetched(raw_http, api_token: str, base_url: str) -> RawPrefetch:
+    """Raw-запросы модуля уходят одним параллельным batch; каждый тест проверяет и прикрепляет свой ответ."""
+    valid = {"app-id": api_token}
+    missing_last_name = UserPayloads.create_user()  # 100% валидная база
+    missing_last_name.pop("lastName")               # ломаем ровно 1 поле
+
+    raw_requests = {
+        ("GET /user", code): RawRequest("GET", f"{base_url}/user?limit=5", headers=headers)
+        for code, headers in APP_ID_HEADERS.items()
+    }
+    raw_requests.update({
+        ("POST /user/create", code): RawRequest(
+            "POST", f"{base_url}/user/create", headers=headers, json_body=UserPayloads.create_user()
+        )
+        for code, headers in APP_ID_HEADERS.items()
+    })
+    raw_requests.update({
+        (path, code): RawRequest("GET", base_url + path.format(id=NON_EXISTENT_ID), headers=headers)
+        for path in READ_PATHS
+        for code, headers in APP_ID_HEADERS.items()
+    })
+    raw_requests.update({
+        "missing_fields": RawRequest("POST", f"{base_url}/user/create", headers=valid, json_body=missing_last_name),
+        "bad_id": RawRequest("GET", f"{base_url}/user/123", headers=valid),
+        "not_found": RawRequest("GET", f"{base_url}/user/{NON_EXISTENT_ID}", headers=valid),
+        "path_not_found": RawRequest("GET", f"{base_url}/userzzz", headers=valid),
+    })
+    return RawPrefetch(raw_http, raw_requests)
+
 
 @allure.epic("Administration")
 @allure.feature("Users")
@@ -13,67 +49,51 @@ class TestUsersNegative(BaseTest):
     # ---------------- APP_ID errors ----------------
 
     @allure.title("GET /user without app-id -> 403 APP_ID_MISSING")
-    def test_get_users_without_app_id(self, raw_users, base_url: str):
-        resp = raw_users.get(f"{base_url}/user?limit=5")
+    def test_get_users_without_app_id(self, prefetched: RawPrefetch):
+        resp = prefetched.response(("GET /user", "APP_ID_MISSING"))
         assert_dummyapi_error(resp, 403, "APP_ID_MISSING")
 
     @allure.title("GET /user with invalid app-id -> 403 APP_ID_NOT_EXIST")
-    def test_get_users_with_invalid_app_id(self, raw_users, base_url: str):
-        resp = raw_users.get(
-            f"{base_url}/user?limit=5",
-            headers={"app-id": "invalid-app-id"},
-        )
+    def test_get_users_with_invalid_app_id(self, prefetched: RawPrefetch):
+        resp = prefetched.response(("GET /user", "APP_ID_NOT_EXIST"))
         assert_dummyapi_error(resp, 403, "APP_ID_NOT_EXIST")
 
     @allure.title("POST /user/create without app-id -> 403 APP_ID_MISSING")
-    def test_create_user_without_app_id(self, raw_users, base_url: str):
-        payload = UserPayloads.create_user()  # валидная база
-        resp = raw_users.post(f"{base_url}/user/create", json_body=payload)
+    def test_create_user_without_app_id(self, prefetched: RawPrefetch):
+        resp = prefetched.response(("POST /user/create", "APP_ID_MISSING"))
         assert_dummyapi_error(resp, 403, "APP_ID_MISSING")
 
     @allure.title("POST /user/create with invalid app-id -> 403 APP_ID_NOT_EXIST")
-    def test_create_user_with_invalid_app_id(self, raw_users, base_url: str):
-        payload = UserPayloads.create_user()  # валидная база
-        resp = raw_users.post(
-            f"{base_url}/user/create",
-            headers={"app-id": "invalid-app-id"},
-            json_body=payload,
-        )
+    def test_create_user_with_invalid_app_id(self, prefetched: RawPrefetch):
+        resp = prefetched.response(("POST /user/create", "APP_ID_NOT_EXIST"))
         assert_dummyapi_error(resp, 403, "APP_ID_NOT_EXIST")
 
+    @allure.title("GET {path} -> 403 {expected_error}")
+    @pytest.mark.parametrize("expected_error", APP_ID_HEADERS)
+    @pytest.mark.parametrize("path", READ_PATHS)
+    def test_read_endpoints_app_id_errors(self, prefetched: RawPrefetch, path: str, expected_error: str):
+        resp = prefetched.response((path, expected_error))
+        assert_dummyapi_error(resp, 403, expected_error)
+
     # ---------------- BODY_NOT_VALID ----------------
 
     @allure.title("POST /user/create missing lastName -> 400 BODY_NOT_VALID")
-    def test_create_user_missing_fields(self, raw_users, api_token: str, base_url: str):
-        payload = UserPayloads.create_user()  # 100% валидная база
-        payload.pop("lastName")               # ломаем ровно 1 поле
-
-        resp = raw_users.post(
-            f"{base_url}/user/create",
-            headers={"app-id": api_token},
-            json_body=payload,
-        )
+    def test_create_user_missing_fields(self, prefetched: RawPrefetch):
+        resp = prefetched.response("missing_fields")
         assert_dummyapi_error(resp, 400, "BODY_NOT_VALID")
 
     # ---------------- PARAMS_NOT_VALID ----------------
 
     @allure.title("GET /user/{bad_id} -> 400 PARAMS_NOT_VALID")
-    def test_get_user_bad_id(self, raw_users, api_token: str, base_url: str):
-        resp = raw_users.get(
-            f"{base_url}/user/123",
-            headers={"app-id": api_token},
-        )
+    def test_get_user_bad_id(self, prefetched: RawPrefetch):
+        resp = prefetched.response("bad_id")
         assert_dummyapi_error(resp, 400, "PARAMS_NOT_VALID")
 
     # ---------------- RESOURCE_NOT_FOUND ----------------
 
     @allure.title("GET /user/{id} not found -> 404 RESOURCE_NOT_FOUND")
-    def test_get_user_not_found(self, raw_users, api_token: str, base_url: str):
-        non_exist_id = "000000000000000000000000"
-        resp = raw_users.get(
-            f"{base_url}/user/{non_exist_id}",
-            headers={"app-id": api_token},
-        )
+    def test_get_user_not_found(self, prefetched: RawPrefetch):
+        resp = prefetched.response("not_found")
         assert_dummyapi_error(resp, 404, "RESOURCE_NOT_FOUND")
 
     @allure.title("DELETE /user/{id} not found -> 404 RESOURCE_NOT_FOUND")
@@ -85,9 +105,6 @@ class TestUsersNegative(BaseTest):
     # ---------------- PATH_NOT_FOUND ----------------
 
     @allure.title("GET wrong path -> 404 PATH_NOT_FOUND")
-    def test_path_not_found(self, raw_users, api_token: str, base_url: str):
-        resp = raw_users.get(
-            f"{base_url}/userzzz",
-            headers={"app-id": api_token},
-        )
+    def test_path_not_found(self, prefetched: RawPrefetch):
+        resp = prefetched.response("path_not_found")
         assert_dummyapi_error(resp, 404, "PATH_NOT_FOUND")
@@ -0,0 +1,55 @@
+"""
+Общая обвязка CLI-инструментов (tools/*): загрузка .env, HOST / API_TOKEN и HTTP-сессия со своим
+RateLimiter — темп каждого инструмента задаётся его --rps / --concurrency, а не лимитами тестового прогона.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+from typing import Optional
+from dotenv import load_dotenv
+from utils.rate_limiter import AdaptiveConcurrency, RateLimiter, TokenBucket
+from utils.transport import make_session
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def load_env() -> None:
+    """Переменные из .env в корне репозитория (если файл есть); уже заданные в окружении не перетираются."""
+    dotenv_path = ROOT / ".env"
+    if dotenv_path.exists():
+        load_dotenv(dotenv_path=dotenv_path)
+
+
+def env_credentials() -> tuple[str, str]:
+    """(HOST без "/" на конце, API_TOKEN) из окружения; пустые строки, если не заданы."""
+    return os.getenv("HOST", "").strip().rstrip("/"), os.getenv("API_TOKEN", "").strip()
+
+
+def require_credentials(parser: argparse.ArgumentParser, alternative: Optional[str] = None) -> tuple[str, str]:
+    """(HOST, API_TOKEN) или ошибка argparse; alternative — флаг, которым можно обойтись без них (--offline)."""
+    host, token = env_credentials()
+    if not host or not token:
+        hint = f", or use {alternative}" if alternative else ""
+        parser.error(f"HOST and API_TOKEN must be set (env or .env){hint}")
+    return host, token
+
+
+def tool_session(rps: float, concurrency: int, app_id: Optional[str] = None, burst: Optional[float] = None):
+    """
+    Сессия инструмента (make_session) со своим RateLimiter: не больше rps запросов в секунду
+    (пачка — burst, по умолчанию rps / 10, но не меньше 1) и не больше concurrency одновременно.
+
+    app_id — заголовок app-id на все запросы, как у сессии http в conftest. Без него заголовки задаются
+    на каждый запрос (RawHttp: фаззеру нужны и запросы без app-id).
+    """
+    limiter = RateLimiter(
+        TokenBucket(rate=rps, burst=burst if burst is not None else max(1.0, rps / 10)),
+        AdaptiveConcurrency(initial=concurrency, min_limit=1, max_limit=concurrency),
+    )
+    session = make_session(limiter=limiter)
+    session.headers.update({"Accept": "application/json"})
+    if app_id is not None:
+        session.headers.update({"app-id": app_id})
+    return session
@@ -0,0 +1,269 @@
+"""
+Аудит ссылочной целостности: posts.owner -> users, comments.post -> posts, comments.owner -> users.
+
+- /user, /post, /comment выгружаются одновременно (utils/pagination.iter_pages, окно страниц на каждый список)
+  или читаются из готового снимка tools/export (--from-snapshot) — тогда без единого запроса
+- индексы id — множества 12-байтных ключей (bytes.fromhex от 24 hex-символов): сотни тысяч id — это
+  единицы мегабайт, а проверка ссылки — один lookup в set
+- "висячие" ссылки при живом аудите перепроверяются точечным GET: сущность могла появиться уже после того,
+  как её список был просканирован (гонка с чужими прогонами), такие не считаются нарушением
+- для выборки пользователей (--count-sample, 0 = все) число постов и комментариев по спискам
+  сравнивается с total из /user/{id}/post и /user/{id}/comment
+
+Запуск (HOST / API_TOKEN — из окружения или .env):
+    python -m tools.audit --rps 20 --concurrency 8 --count-sample 200
+    python -m tools.audit --from-snapshot snapshots/staging --json audit.json
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+from tools._common import env_credentials, load_env, tool_session
+from tools.export import id_key
+from utils.concurrency import run_concurrently
+from utils.pagination import iter_pages, page_fetcher
+
+RESOURCE_PATHS = {"users": "/user", "posts": "/post", "comments": "/comment"}
+MAX_RECHECK = 1000  # сколько висячих ссылок перепроверять точечными GET
+MAX_SAMPLES = 20
+
+
+def _ref_id(value) -> Optional[str]:
+    """Ссылка в элементе списка — либо строка-id, либо превью {"id": ...}."""
+    if isinstance(value, dict):
+        return value.get("id")
+    return value if isinstance(value, str) else None
+
+
+@dataclass
+class Dangling:
+    relation: str         # "post.owner -> user" и т.п.
+    source_id: str
+    target_id: str
+
+
+@dataclass
+class AuditReport:
+    counts: dict[str, int] = field(default_factory=dict)
+    dangling: list[Dangling] = field(default_factory=list)
+    recovered: int = 0                      # висячие, которые при перепроверке нашлись
+    count_mismatches: list[dict] = field(default_factory=list)
+    users_count_checked: int = 0
+    load_seconds: float = 0.0
+    check_seconds: float = 0.0
+
+    def by_relation(self) -> Counter:
+        return Counter(d.relation for d in self.dangling)
+
+    def format(self) -> str:
+        items = sum(self.counts.values())
+        lines = [
+            f"loaded: {', '.join(f'{k}={v}' for k, v in self.counts.items())} in {self.load_seconds:.1f}s "
+            f"({items / self.load_seconds if self.load_seconds else 0:.0f} items/s)",
+            f"dangling references: {len(self.dangling)}"
+            + (f" ({', '.join(f'{r}: {n}' for r, n in self.by_relation().items())})" if self.dangling else "")
+            + (f"; {self.recovered} appeared during the scan and were ignored" if self.recovered else ""),
+        ]
+        for d in self.dangling[:MAX_SAMPLES]:
+            lines.append(f"  {d.relation}: {d.source_id} -> {d.target_id}")
+        if self.users_count_checked:
+            lines.append(f"per-user counts: {self.users_count_checked} users checked, "
+                         f"{len(self.count_mismatches)} mismatches")
+            for m in self.count_mismatches[:MAX_SAMPLES]:
+                lines.append(f"  user {m['user']}: {m['kind']} listed={m['listed']} endpoint={m['endpoint']}")
+        lines.append(f"checks took {self.check_seconds:.1f}s")
+        return "\n".join(lines)
+
+
+class IntegrityIndex:
+    """
+    Компактные индексы для аудита. На элемент хранится только то, что нужно для проверки:
+    id сущности и ключи её ссылок (по 12 байт), плюс счётчики постов/комментариев на пользователя.
+    """
+
+    def __init__(self) -> None:
+        self.users: set[bytes] = set()
+        self.posts: set[bytes] = set()
+        self.post_owner: list[tuple[bytes, bytes]] = []               # (post, owner)
+        self.comment_refs: list[tuple[bytes, bytes, bytes]] = []      # (comment, post, owner)
+        self.posts_per_user: Counter = Counter()
+        self.comments_per_user: Counter = Counter()
+        self.counts = {"users": 0, "posts": 0, "comments": 0}
+
+    def add(self, resource: str, item: dict) -> None:
+        # Каждый ресурс пишет только в свои поля — поэтому три загрузки могут идти параллельно без блокировок
+        self.counts[resource] += 1
+        key = id_key(item.get("id"))
+        if resource == "users":
+            self.users.add(key)
+        elif resource == "posts":
+            owner = id_key(_ref_id(item.get("owner")))
+            self.posts.add(key)
+            self.post_owner.append((key, owner))
+            self.posts_per_user[owner] += 1
+        else:
+            owner = id_key(_ref_id(item.get("owner")))
+            self.comment_refs.append((key, id_key(_ref_id(item.get("post"))), owner))
+            self.comments_per_user[owner] += 1
+
+    def dangling(self) -> Iterator[tuple[str, str, bytes]]:
+        """(relation, source_id, target_key) для каждой ссылки, которой нет в индексах."""
+        for post, owner in self.post_owner:
+            if owner not in self.users:
+                yield "post.owner -> user", _key_str(post), owner
+        for comment, post, owner in self.comment_refs:
+            if post not in self.posts:
+                yield "comment.post -> post", _key_str(comment), post
+            if owner not in self.users:
+                yield "comment.owner -> user", _key_str(comment), owner
+
+
+def _key_str(key: bytes) -> str:
+    return key.hex() if len(key) == 12 else key.decode(errors="replace")
+
+
+def load_live(index: IntegrityIndex, session, base_url: str, concurrency: int, timeout: float) -> None:
+    def load(resource: str) -> None:
+        fetch = page_fetcher(session, f"{base_url}{RESOURCE_PATHS[resource]}", timeout=timeout)
+        for page in iter_pages(fetch, max_workers=concurrency):
+            for item in page.items:
+                index.add(resource, item)
+
+    run_concurrently([lambda r=r: load(r) for r in RESOURCE_PATHS], max_workers=len(RESOURCE_PATHS))
+
+
+def load_snapshot(index: IntegrityIndex, snapshot: Path) -> None:
+    def load(resource: str) -> None:
+        with gzip.open(snapshot / f"{resource}.ndjson.gz", "rt", encoding="utf-8") as f:
+            for line in f:
+                index.add(resource, json.loads(line))
+        # Не прошедшие валидацию модели экспортёр пишет отдельно — а это часто как раз висячие ссылки
+        # (превью удалённого владельца содержит только id)
+        invalid = snapshot / f"{resource}.invalid.ndjson.gz"
+        if invalid.exists():
+            with gzip.open(invalid, "rt", encoding="utf-8") as f:
+                for line in f:
+                    index.add(resource, json.loads(line)["item"])
+
+    run_concurrently([lambda r=r: load(r) for r in RESOURCE_PATHS], max_workers=len(RESOURCE_PATHS))
+
+
+def recheck(dangling: list[tuple[str, str, bytes]], session, base_url: str, concurrency: int,
+            timeout: float) -> set[bytes]:
+    """Точечные GET по целям висячих ссылок; возвращает ключи, которые на самом деле существуют."""
+    targets = {}
+    for relation, _, target in dangling:
+        kind = "post" if relation.endswith("post") else "user"
+        targets.setdefault(target, kind)
+    targets = dict(list(targets.items())[:MAX_RECHECK])
+
+    def exists(key: bytes, kind: str) -> bool:
+        response = session.get(f"{base_url}/{kind}/{_key_str(key)}", timeout=timeout)
+        return response.status_code == 200
+
+    keys = list(targets)
+    results = run_concurrently([lambda k=k: exists(k, targets[k]) for k in keys],
+                               max_workers=concurrency, return_exceptions=True)
+    return {k for k, ok in zip(keys, results) if ok is True}
+
+
+def check_counts(index: IntegrityIndex, sample: int, session, base_url: str, concurrency: int,
+                 timeout: float) -> tuple[int, list[dict]]:
+    users = list(index.users)
+    if sample and sample < len(users):
+        users = random.sample(users, sample)
+
+    def endpoint_total(user: bytes, kind: str) -> int:
+        response = session.get(f"{base_url}/user/{_key_str(user)}/{kind}", params={"limit": 1, "page": 0},
+                               timeout=timeout)
+        response.raise_for_status()
+        return response.json().get("total", 0)
+
+    calls = [lambda u=u, k=k: endpoint_total(u, k) for u in users for k in ("post", "comment")]
+    totals = run_concurrently(calls, max_workers=concurrency, return_exceptions=True)
+    mismatches = []
+    for i, user in enumerate(users):
+        for j, (kind, counter) in enumerate((("post", index.posts_per_user), ("comment", index.comments_per_user))):
+            endpoint = totals[2 * i + j]
+            if isinstance(endpoint, BaseException):
+                mismatches.append({"user": _key_str(user), "kind": kind, "listed": counter[user],
+                                   "endpoint": f"error: {endpoint}"})
+            elif endpoint != counter[user]:
+                mismatches.append({"user": _key_str(user), "kind": kind, "listed": counter[user],
+                                   "endpoint": endpoint})
+    return len(users), mismatches
+
+
+def main() -> None:
+    load_env()
+
+    parser = argparse.ArgumentParser(description="Referential-integrity audit of users/posts/comments")
+    parser.add_argument("--from-snapshot", help="каталог снимка tools/export вместо живого обхода")
+    parser.add_argument("--count-sample", type=int, default=200,
+                        help="сколько пользователей сверить с /user/{id}/post|comment (0 = всех, -1 = не сверять)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=20, help="максимум запросов в секунду")
+    parser.add_argument("--timeout", type=float, default=15)
+    parser.add_argument("--json", help="сохранить отчёт в JSON")
+    args = parser.parse_args()
+
+    host, token = env_credentials()
+    live = not args.from_snapshot
+    session = None
+    if host and token:
+        session = tool_session(args.rps, args.concurrency * 3, app_id=token)
+    elif live:
+        parser.error("HOST and API_TOKEN must be set (env or .env), or use --from-snapshot")
+
+    index = IntegrityIndex()
+    report = AuditReport()
+    started = time.perf_counter()
+    if live:
+        load_live(index, session, host, args.concurrency, args.timeout)
+    else:
+        load_snapshot(index, Path(args.from_snapshot))
+    report.counts = dict(index.counts)
+    report.load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    dangling = list(index.dangling())
+    if live and dangling:
+        existing = recheck(dangling, session, host, args.concurrency * 3, args.timeout)
+        report.recovered = sum(1 for _, _, target in dangling if target in existing)
+        dangling = [d for d in dangling if d[2] not in existing]
+    report.dangling = [Dangling(relation, source, _key_str(target)) for relation, source, target in dangling]
+
+    # Сверка счётчиков имеет смысл только против того же стенда, что и данные (живой обход)
+    if live and args.count_sample >= 0:
+        report.users_count_checked, report.count_mismatches = check_counts(
+            index, args.count_sample, session, host, args.concurrency * 3, args.timeout,
+        )
+    report.check_seconds = time.perf_counter() - started
+    if session is not None:
+        session.close()
+
+    print(report.format())
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "counts": report.counts,
+            "dangling": [d.__dict__ for d in report.dangling],
+            "dangling_by_relation": dict(report.by_relation()),
+            "recovered": report.recovered,
+            "users_count_checked": report.users_count_checked,
+            "count_mismatches": report.count_mismatches,
+            "load_seconds": round(report.load_seconds, 3),
+            "check_seconds": round(report.check_seconds, 3),
+        }, indent=2), encoding="utf-8")
+    sys.exit(1 if report.dangling or report.count_mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
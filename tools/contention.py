@@ -0,0 +1,283 @@
+"""
+Конкурентная запись в ОДИН ресурс: K одновременных PostsAPI.update_post / UsersAPI.update_user
+с разными payload'ами — пропускная способность, латентность и согласованность под "горячим ключом".
+
+Раунд = K писателей стартуют одновременно (threading.Barrier), у каждого свой payload:
+    post: text "Auto post <токен>" + likes = уникальное число   (маркер текста сохраняется — пост найдёт sweep)
+    user: firstName / lastName / phone из токена писателя
+После раунда ресурс читается заново (GET) и проверяется last-write-wins:
+    - ok        — итоговое состояние целиком совпадает с payload ровно одного успешного писателя
+    - torn      — поля от РАЗНЫХ писателей или часть полей старые (запись не атомарна)
+    - lost      — итог не совпадает ни с одним успешным писателем (все записи раунда потеряны)
+    - phantom   — итог совпадает с писателем, у которого запрос завершился ошибкой
+    - echo      — ответ PUT показал не тот payload, что отправил писатель (чужая запись в ответе)
+    - last win  — доля раундов, где победил писатель, чей ответ пришёл последним (чем ниже, тем
+                  сильнее порядок применения на сервере расходится с порядком ответов)
+
+Результат — таблица по уровням конкурентности (--levels): как бэкенд деградирует под hot-key записью.
+
+Запуск (HOST / API_TOKEN — из окружения или .env):
+    python -m tools.contention --resource post --levels 1,2,4,8,16 --rounds 20
+    python -m tools.contention --resource user --levels 1,8,32 --rounds 10 --rps 100 --json
+"""
+from __future__ import annotations
+
+import abc
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+# Allure-вложения на каждый PUT здесь только мешают замеру латентности
+os.environ.setdefault("INSTRUMENTATION", "off")
+
+from services.posts.api_posts import PostsAPI  # noqa: E402 — после выбора уровня инструментирования
+from services.posts.post_endpoints import PostEndpoints  # noqa: E402
+from services.posts.post_payloads import PostPayloads  # noqa: E402
+from services.users.api_users import UsersAPI  # noqa: E402
+from services.users.user_endpoints import UserEndpoints  # noqa: E402
+from tools._common import load_env, require_credentials, tool_session  # noqa: E402
+from utils.concurrency import run_concurrently  # noqa: E402
+
+DEFAULT_TIMEOUT = 15
+OUTCOMES = ("ok", "torn", "lost", "phantom")
+
+
+@dataclass
+class Write:
+    writer: int
+    payload: dict
+    latency: float = 0.0
+    finished_at: float = 0.0
+    error: Optional[str] = None
+    echo: Optional[dict] = None
+
+
+@dataclass
+class LevelStats:
+    level: int
+    rounds: int = 0
+    writes: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+    latencies: list[float] = field(default_factory=list)
+    wall: float = 0.0
+    outcomes: dict[str, int] = field(default_factory=lambda: dict.fromkeys(OUTCOMES, 0))
+    echo_mismatch: int = 0
+    last_wins: int = 0
+
+    def row(self) -> dict:
+        ok_writes = self.writes - sum(self.errors.values())
+        lat = sorted(self.latencies) or [0.0]
+        return {
+            "level": self.level,
+            "rounds": self.rounds,
+            "writes": self.writes,
+            "errors": dict(self.errors),
+            "throughput_wps": ok_writes / self.wall if self.wall else 0.0,
+            "p50_ms": statistics.median(lat) * 1000,
+            "p95_ms": lat[min(len(lat) - 1, int(round(0.95 * (len(lat) - 1))))] * 1000,
+            "max_ms": lat[-1] * 1000,
+            **self.outcomes,
+            "echo_mismatch": self.echo_mismatch,
+            "last_win_share": self.last_wins / self.rounds if self.rounds else 0.0,
+        }
+
+
+# ---------- ресурсы ----------
+
+class Target(abc.ABC):
+    """Ресурс под записью: payload писателя, сам PUT и чтение состояния (только проверяемые поля)."""
+
+    fields: tuple[str, ...] = ()
+
+    @abc.abstractmethod
+    def payload(self, round_no: int, writer: int) -> dict:
+        """Уникальный payload писателя writer в раунде round_no."""
+
+    @abc.abstractmethod
+    def write(self, payload: dict) -> dict:
+        """PUT payload'а; возвращает проверяемые поля из ответа."""
+
+    @abc.abstractmethod
+    def read(self) -> dict:
+        """GET ресурса; возвращает проверяемые поля."""
+
+    @abc.abstractmethod
+    def cleanup(self) -> None:
+        """Удалить созданное под раунды."""
+
+    def project(self, data: Any) -> dict:
+        if hasattr(data, "model_dump"):
+            data = data.model_dump()
+        return {name: data.get(name) for name in self.fields}
+
+
+class PostTarget(Target):
+    fields = ("text", "likes")
+
+    def __init__(self, users_api: UsersAPI, posts_api: PostsAPI):
+        self.users_api, self.posts_api = users_api, posts_api
+        self.owner_id, _ = users_api.create_user()
+        self.post_id, _ = posts_api.create_post(owner_id=self.owner_id)
+
+    def payload(self, round_no: int, writer: int) -> dict:
+        # "Auto post" + 8 hex — маркер sweep'а остаётся, даже если harness упадёт посреди раунда
+        return PostPayloads.update_post(text=f"Auto post {round_no:04x}{writer:04x}", likes=round_no * 1000 + writer)
+
+    def write(self, payload: dict) -> dict:
+        return self.project(self.posts_api.update_post(self.post_id, payload))
+
+    def read(self) -> dict:
+        return self.project(self.posts_api.get_post_by_id(self.post_id))
+
+    def cleanup(self) -> None:
+        self.posts_api.delete_post(self.post_id, allow_not_found=True)
+        self.users_api.delete_user(self.owner_id, allow_not_found=True)
+
+
+class UserTarget(Target):
+    fields = ("firstName", "lastName", "phone")
+
+    def __init__(self, users_api: UsersAPI):
+        self.users_api = users_api
+        self.user_id, _ = users_api.create_user()
+
+    def payload(self, round_no: int, writer: int) -> dict:
+        token = f"{round_no:04d}{writer:04d}"
+        return {"firstName": f"Writer{token}", "lastName": f"Round{token}", "phone": f"7{token}"}
+
+    def write(self, payload: dict) -> dict:
+        return self.project(self.users_api.update_user(self.user_id, payload))
+
+    def read(self) -> dict:
+        return self.project(self.users_api.get_user_by_id(self.user_id))
+
+    def cleanup(self) -> None:
+        self.users_api.delete_user(self.user_id, allow_not_found=True)
+
+
+# ---------- раунд ----------
+
+def run_round(target: Target, level: int, round_no: int) -> tuple[list[Write], float]:
+    writes = [Write(writer=i, payload=target.payload(round_no, i)) for i in range(level)]
+    barrier = threading.Barrier(level)
+
+    def writer(w: Write) -> Callable[[], None]:
+        def call() -> None:
+            barrier.wait()
+            started = time.perf_counter()
+            try:
+                w.echo = target.write(w.payload)
+            except Exception as e:  # noqa: BLE001 — ошибка записи — это результат замера, а не сбой harness
+                w.error = f"{type(e).__name__}: {str(e).splitlines()[0][:80] if str(e) else ''}"
+            w.finished_at = time.perf_counter()
+            w.latency = w.finished_at - started
+        return call
+
+    started = time.perf_counter()
+    run_concurrently([writer(w) for w in writes], max_workers=level)
+    return writes, time.perf_counter() - started
+
+
+def classify(target: Target, final: dict, writes: list[Write]) -> tuple[str, Optional[Write]]:
+    """Итог раунда по last-write-wins и писатель-победитель (если он однозначен)."""
+    matches = [w for w in writes if target.project(w.payload) == final]
+    succeeded = [w for w in matches if w.error is None]
+    if succeeded:
+        return "ok", succeeded[0]
+    if matches:
+        return "phantom", matches[0]
+    sources = {name: {w.writer for w in writes if w.payload.get(name) == value} for name, value in final.items()}
+    if any(sources.values()):
+        return "torn", None  # поля от разных писателей или вперемешку со старым состоянием
+    return "lost", None
+
+
+def run_level(target: Target, level: int, rounds: int, first_round: int) -> LevelStats:
+    stats = LevelStats(level=level)
+    for r in range(rounds):
+        round_no = first_round + r
+        writes, wall = run_round(target, level, round_no)
+        final = target.read()
+        outcome, winner = classify(target, final, writes)
+
+        stats.rounds += 1
+        stats.wall += wall
+        stats.outcomes[outcome] += 1
+        for w in writes:
+            stats.writes += 1
+            stats.latencies.append(w.latency)
+            if w.error:
+                stats.errors[w.error] = stats.errors.get(w.error, 0) + 1
+            elif w.echo != target.project(w.payload):
+                stats.echo_mismatch += 1
+        done = [w for w in writes if w.error is None]
+        if winner is not None and done and winner is max(done, key=lambda w: w.finished_at):
+            stats.last_wins += 1
+    return stats
+
+
+def format_table(rows: list[dict]) -> list[str]:
+    lines = [f"{'K':>4} {'rounds':>6} {'writes':>6} {'err':>5} {'w/s':>8} {'p50':>8} {'p95':>8} {'max':>8} "
+             f"{'ok':>4} {'torn':>5} {'lost':>5} {'phant':>5} {'echo':>5} {'last win':>9}"]
+    for r in rows:
+        lines.append(
+            f"{r['level']:>4} {r['rounds']:>6} {r['writes']:>6} {sum(r['errors'].values()):>5} "
+            f"{r['throughput_wps']:>8.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['max_ms']:>8.1f} "
+            f"{r['ok']:>4} {r['torn']:>5} {r['lost']:>5} {r['phantom']:>5} {r['echo_mismatch']:>5} "
+            f"{r['last_win_share']:>9.0%}"
+        )
+    return lines
+
+
+def main() -> None:
+    load_env()
+
+    parser = argparse.ArgumentParser(description="Concurrent hot-key writes: throughput, latency, last-write-wins")
+    parser.add_argument("--resource", choices=("post", "user"), default="post")
+    parser.add_argument("--levels", default="1,2,4,8,16", help="уровни конкурентности K через запятую")
+    parser.add_argument("--rounds", type=int, default=20, help="раундов на уровень")
+    parser.add_argument("--rps", type=float, default=50, help="максимум запросов в секунду (общий лимитер)")
+    parser.add_argument("--json", action="store_true", help="вывести результат JSON'ом")
+    args = parser.parse_args()
+
+    host, token = require_credentials(parser)
+    levels = [int(x) for x in args.levels.split(",") if x.strip()]
+    if not levels or min(levels) < 1:
+        parser.error("--levels: positive integers, e.g. 1,2,4,8")
+
+    # Конкурентность лимитера — не меньше максимального K, иначе он сам сериализует писателей
+    session = tool_session(args.rps, max(levels), app_id=token, burst=max(float(max(levels)), args.rps / 10))
+    users_api = UsersAPI(session=session, endpoints=UserEndpoints(host), timeout=DEFAULT_TIMEOUT)
+    posts_api = PostsAPI(session=session, endpoints=PostEndpoints(host), timeout=DEFAULT_TIMEOUT)
+
+    target: Target = PostTarget(users_api, posts_api) if args.resource == "post" else UserTarget(users_api)
+    rows = []
+    try:
+        for n, level in enumerate(levels):
+            rows.append(run_level(target, level, args.rounds, first_round=n * args.rounds).row())
+            if not args.json:
+                print(f"level {level}: done", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("\ninterrupted — reporting completed levels", file=sys.stderr)
+    finally:
+        target.cleanup()
+        session.close()
+
+    if args.json:
+        print(json.dumps({"resource": args.resource, "levels": rows}, indent=2, ensure_ascii=False))
+    else:
+        print(f"\nPUT /{args.resource}/{{id}}: {args.rounds} rounds per level, latency in ms\n")
+        for line in format_table(rows):
+            print(line)
+    inconsistent = sum(r["torn"] + r["lost"] + r["phantom"] + r["echo_mismatch"] for r in rows)
+    sys.exit(1 if inconsistent else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Снимок всего набора данных стенда: /user, /post, /comment -> gzip NDJSON (по файлу на ресурс) + summary.json.
+
+- три списка обходятся одновременно, страницы каждого — окном параллельных запросов (utils/pagination.iter_pages)
+- каждый элемент валидируется моделью (UserModel / PostModel / CommentModel); невалидные пишутся отдельно
+  в <resource>.invalid.ndjson.gz вместе с ошибкой
+- элементы пишутся потоком, страница за страницей: память не растёт с размером стенда
+  (кроме множества уже виденных id — нужно для поиска дублей)
+- summary: total из API, сколько выгружено, дубли между страницами, недостающие (total − уникальные),
+  скорость обхода
+
+Запуск (HOST / API_TOKEN — из окружения или .env):
+    python -m tools.export --out snapshots/staging --concurrency 8 --rps 20
+    zcat snapshots/staging/posts.ndjson.gz | jq -r .id | sort > a.txt   # дальше — diff двух стендов
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+from pydantic import BaseModel, ValidationError
+from services.comments.comment_model import CommentModel
+from services.posts.post_model import PostModel
+from services.users.user_model import UserModel
+from tools._common import load_env, require_credentials, tool_session
+from utils.concurrency import run_concurrently
+from utils.pagination import MAX_PAGE_LIMIT, iter_pages, page_fetcher
+
+RESOURCES: dict[str, tuple[str, type[BaseModel]]] = {
+    "users": ("/user", UserModel),
+    "posts": ("/post", PostModel),
+    "comments": ("/comment", CommentModel),
+}
+MAX_ERROR_SAMPLES = 10
+
+
+@dataclass
+class CrawlStats:
+    resource: str
+    reported_total: Optional[int] = None
+    pages: int = 0
+    items: int = 0
+    exported: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    missing: int = 0
+    seconds: float = 0.0
+    bytes_written: int = 0
+    error_samples: list[str] = field(default_factory=list)
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.seconds if self.seconds else 0.0
+
+
+def id_key(entity_id: str) -> bytes:
+    """
+    Ключ id для множества виденных: 24 hex-символа DummyAPI -> 12 байт (bytes.fromhex).
+    Не-hex id берутся как есть (байты строки любой длины) — дубли ищутся и для них.
+    """
+    try:
+        return bytes.fromhex(entity_id)
+    except (TypeError, ValueError):
+        return str(entity_id).encode()
+
+
+def crawl(session, base_url: str, resource: str, out_dir: Path, limit: int, max_workers: int,
+          timeout: float) -> CrawlStats:
+    path, model = RESOURCES[resource]
+    stats = CrawlStats(resource=resource)
+    seen: set[bytes] = set()
+    started = time.perf_counter()
+    fetch = page_fetcher(session, f"{base_url}{path}", limit=limit, timeout=timeout)
+    out_path = out_dir / f"{resource}.ndjson.gz"
+    invalid_path = out_dir / f"{resource}.invalid.ndjson.gz"
+
+    with gzip.open(out_path, "wt", encoding="utf-8", compresslevel=6) as out, \
+            gzip.open(invalid_path, "wt", encoding="utf-8", compresslevel=6) as invalid_out:
+        for page in iter_pages(fetch, limit=limit, max_workers=max_workers):
+            stats.pages += 1
+            if page.total is not None:
+                stats.reported_total = page.total
+            for item in page.items:
+                stats.items += 1
+                key = id_key(item.get("id"))
+                if key in seen:
+                    stats.duplicates += 1  # элемент "переехал" на следующую страницу, пока шёл обход
+                    continue
+                seen.add(key)
+                try:
+                    model.model_validate(item)
+                except ValidationError as e:
+                    stats.invalid += 1
+                    if len(stats.error_samples) < MAX_ERROR_SAMPLES:
+                        stats.error_samples.append(f"{item.get('id')}: {e.errors()[0]['loc']} {e.errors()[0]['msg']}")
+                    invalid_out.write(json.dumps({"item": item, "error": e.errors(include_url=False)},
+                                                 ensure_ascii=False, default=str) + "\n")
+                    continue
+                out.write(json.dumps(item, ensure_ascii=False) + "\n")
+                stats.exported += 1
+
+    if not stats.invalid:
+        invalid_path.unlink()
+    if stats.reported_total is not None:
+        stats.missing = max(0, stats.reported_total - len(seen))
+    stats.bytes_written = out_path.stat().st_size
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def format_stats(rows: list[CrawlStats], elapsed: float) -> str:
+    header = f"{'resource':10} {'total':>8} {'exported':>9} {'dupes':>6} {'invalid':>8} {'missing':>8} " \
+             f"{'pages':>6} {'sec':>7} {'items/s':>8} {'gz KiB':>8}"
+    lines = [header, "-" * len(header)]
+    for s in rows:
+        total = "-" if s.reported_total is None else str(s.reported_total)
+        lines.append(
+            f"{s.resource:10} {total:>8} {s.exported:>9} {s.duplicates:>6} {s.invalid:>8} {s.missing:>8} "
+            f"{s.pages:>6} {s.seconds:>7.1f} {s.items_per_second:>8.0f} {s.bytes_written / 1024:>8.1f}"
+        )
+    items = sum(s.items for s in rows)
+    lines.append(f"crawled {items} items in {elapsed:.1f}s ({items / elapsed if elapsed else 0:.0f} items/s)")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    load_env()
+
+    parser = argparse.ArgumentParser(description="Export all users/posts/comments to gzip NDJSON")
+    parser.add_argument("--out", default=f"snapshots/{time.strftime('%Y%m%d-%H%M%S')}", help="каталог снимка")
+    parser.add_argument("--resources", nargs="+", choices=list(RESOURCES), default=list(RESOURCES))
+    parser.add_argument("--limit", type=int, default=MAX_PAGE_LIMIT, help="размер страницы")
+    parser.add_argument("--concurrency", type=int, default=8, help="страниц в полёте на один ресурс")
+    parser.add_argument("--rps", type=float, default=20, help="максимум запросов в секунду (на все ресурсы)")
+    parser.add_argument("--timeout", type=float, default=15)
+    args = parser.parse_args()
+
+    host, token = require_credentials(parser)
+    session = tool_session(args.rps, args.concurrency * len(args.resources), app_id=token)
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    rows = run_concurrently(
+        [lambda r=r: crawl(session, host, r, out_dir, args.limit, args.concurrency, args.timeout)
+         for r in args.resources],
+        max_workers=len(args.resources),
+    )
+    elapsed = time.perf_counter() - started
+    session.close()
+
+    summary = {
+        "host": host,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "seconds": round(elapsed, 3),
+        "resources": {s.resource: {**asdict(s), "items_per_second": round(s.items_per_second, 1)} for s in rows},
+    }
+    (out_dir / "summary.json").write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print(format_stats(rows, elapsed))
+    print(f"snapshot: {out_dir}")
+    for s in rows:
+        for sample in s.error_samples[:3]:
+            print(f"invalid {s.resource}: {sample}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Прокси со сбоями (utils/fault_proxy.py) как отдельный процесс: весь прогон тестов / инструмента через медленную сеть.
+
+Правило (--rule, можно несколько; порядок как в FaultProxy — последнее подходящее главнее):
+    "[METHOD] [route] key=value ..."      ключи: latency, bandwidth, reset, truncate, status, retry_after, times
+    latency=lognormal:150,0.8   bandwidth=20000   reset=0.01   truncate=0.01   status=429:0.05,503:0.02
+
+Запуск (upstream — HOST из окружения / .env или --upstream):
+    python -m tools.fault_proxy --port 8899 --rule "* latency=lognormal:150,0.6 status=503:0.02"
+    python -m tools.fault_proxy --port 8899 --rule "GET /user/{id} latency=uniform:1000-3000" --rule "POST * reset=0.1"
+    HOST=http://127.0.0.1:8899/data/v1 pytest -m smoke
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shlex
+from tools._common import load_env
+from utils.fault_proxy import FaultProxy, FaultRule, Latency
+
+_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "*"}
+
+
+def parse_rule(spec: str) -> FaultRule:
+    """'GET /user/{id} latency=200 status=503:0.5' -> FaultRule; METHOD и route можно опустить (= "*")."""
+    method, route, faults = "*", "*", {}
+    for token in shlex.split(spec):
+        key, sep, value = token.partition("=")
+        if not sep:
+            if token.upper() in _METHODS and method == "*" and route == "*":
+                method = token.upper()
+            else:
+                route = token
+        elif key == "latency":
+            faults["latency"] = Latency.parse(value)
+        elif key in ("bandwidth", "times"):
+            faults[key] = int(value)
+        elif key in ("reset", "truncate", "retry_after"):
+            faults[key] = float(value)
+        elif key == "status":
+            faults["status"] = {int(code): float(rate) for code, rate in
+                                (pair.split(":") for pair in value.split(","))}
+        else:
+            raise ValueError(f"unknown fault {key!r} in rule {spec!r}")
+    return FaultRule(route=route, method=method, **faults)
+
+
+def main() -> None:
+    load_env()
+
+    parser = argparse.ArgumentParser(description="Local reverse proxy injecting latency, bandwidth caps and faults")
+    parser.add_argument("--upstream", default=None, help="куда пересылать (по умолчанию HOST)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--seed", type=int, default=0, help="seed генератора сбоев (повторяемый сценарий)")
+    parser.add_argument("--rule", action="append", default=[], help="правило сбоев, см. описание модуля")
+    args = parser.parse_args()
+
+    upstream = (args.upstream or os.getenv("HOST", "")).strip().rstrip("/")
+    if not upstream:
+        parser.error("--upstream or HOST must be set (env or .env)")
+    try:
+        rules = [parse_rule(spec) for spec in args.rule]
+    except ValueError as e:
+        parser.error(str(e))
+
+    proxy = FaultProxy(upstream, host=args.host, port=args.port, seed=args.seed)
+    for rule in rules:
+        proxy.add_rule(rule)
+    print(f"fault proxy: HOST={proxy.base_url} -> {upstream}")
+    for rule in rules:
+        print(f"  {rule.method} {rule.route}: "
+              + ", ".join(f"{k}={v}" for k, v in vars(rule).items() if v and k not in ("route", "method")))
+    try:
+        proxy.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("\n" + ", ".join(f"{fault}={n}" for fault, n in proxy.stats.most_common()))
+        proxy.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
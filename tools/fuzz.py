@@ -0,0 +1,392 @@
+"""
+Мутационный фаззер create/update payload'ов DummyAPI.
+
+Берёт валидные payload'ы фабрик (UserPayloads.create_user, PostPayloads.create_post / update_post,
+CommentPayloads.create_comment) и ломает их мутациями четырёх видов:
+- type       — другой тип значения (число, bool, null, массив, объект, строка-число)
+- length     — граничные и запредельные длины строк (по лимитам DummyAPI)
+- encoding   — emoji, RTL, zero-width, NUL, комбинируемые символы, CJK, инъекции
+- structure  — убрать поле, лишнее поле, оператор-объект вместо значения, тело-массив, тысяча ключей
+
+Запросы идут параллельно с контролируемым темпом (свой RateLimiter: --rps / --concurrency).
+Ответы классифицируются по (статус, код ошибки). Находки:
+- любой 5xx
+- 2xx там, где мутация нарушает документированное ограничение (обязательное поле, тип, длина)
+Для каждой уникальной сигнатуры ответа (цель + статус + ошибка + поля из data) находка минимизируется
+(убираем лишние поля, укорачиваем строку, пока сигнатура сохраняется) и сохраняется в --out как JSON.
+Всё, что фаззер успешно создал (2xx на create), в конце удаляется.
+
+Запуск:
+    python -m tools.fuzz --rounds 3 --rps 50 --concurrency 16            # HOST / API_TOKEN из .env
+    python -m tools.fuzz --offline --rounds 5 --rps 500 --concurrency 32  # против tools/stub_api.py
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+from services.comments.comment_payloads import CommentPayloads
+from services.posts.post_payloads import PostPayloads
+from services.users.user_payloads import UserPayloads
+from tools._common import load_env, require_credentials, tool_session
+from utils.raw_http import RawHttp
+
+# Документированные лимиты длины строк DummyAPI
+FIELD_LIMITS = {"firstName": (2, 50), "lastName": (2, 50), "text": (6, 1000), "message": (2, 500)}
+
+# Поля-ссылки на сущности: любое не-id значение должно отклоняться
+_ID_FIELDS = ("owner", "post")
+
+TYPE_VALUES: list[Any] = [0, -1, 1.5, True, None, [], {}, ["x"], {"a": 1}, "123"]
+
+ENCODING_VALUES = {
+    "emoji": "\U0001F600\U0001F44D\U0001F3FD emoji",
+    "rtl": "\u202eabc def",
+    "zero_width": "a\u200bb\u200cc\u200dd\ufeff",
+    "nul": "ab\x00cd efg",
+    "combining": "e\u0301e\u0301e\u0301",
+    "lone_surrogate": "ab\ud800cd efg",
+    "cjk": "\u6e2c\u8a66\u6e2c\u8a66",
+    "latin1": "\u00d1and\u00fa fa\u00e7ade",
+    "html": "<script>alert(1)</script>",
+    "sql": "' OR 1=1 -- ",
+    "percent": "%00%ff%2e%2e/",
+    "long_unicode": "\u0436" * 5000,
+}
+
+
+@dataclass
+class FuzzContext:
+    """Реальные сущности, на которые ссылаются payload'ы постов/комментариев (создаются на старте)."""
+
+    owner_id: str = ""
+    post_id: str = ""
+
+
+@dataclass(frozen=True)
+class Target:
+    name: str
+    method: str
+    path: str                                   # относительно HOST, может содержать {post_id}
+    base_payload: Callable[[FuzzContext], dict]
+    required: tuple[str, ...] = ()
+    resource: Optional[str] = None              # что создаёт 2xx (для уборки): user / post / comment
+
+
+TARGETS = {
+    "create_user": Target(
+        "create_user", "POST", "/user/create",
+        lambda ctx: UserPayloads.create_user(),
+        required=("firstName", "lastName", "email"), resource="user",
+    ),
+    "create_post": Target(
+        "create_post", "POST", "/post/create",
+        lambda ctx: PostPayloads.create_post(owner_id=ctx.owner_id),
+        required=("owner",), resource="post",
+    ),
+    "update_post": Target(
+        "update_post", "PUT", "/post/{post_id}",
+        lambda ctx: PostPayloads.update_post(text="Fuzzed post text", image="https://example.com/1.jpg", likes=1),
+    ),
+    "create_comment": Target(
+        "create_comment", "POST", "/comment/create",
+        lambda ctx: CommentPayloads.create_comment(owner_id=ctx.owner_id, post_id=ctx.post_id),
+        required=("message", "owner", "post"), resource="comment",
+    ),
+}
+
+
+@dataclass(frozen=True)
+class Mutation:
+    kind: str                         # type / length / encoding / structure
+    field: Optional[str]
+    description: str
+    apply: Callable[[dict], Any]      # валидный payload -> сломанный (новый объект)
+    must_reject: bool                 # нарушено документированное ограничение: 2xx = находка
+
+
+def _replace(name: str, value: Any) -> Callable[[dict], Any]:
+    return lambda payload: {**payload, name: value}
+
+
+def _violates_length(name: str, value: Any) -> bool:
+    limits = FIELD_LIMITS.get(name)
+    return limits is not None and isinstance(value, str) and not limits[0] <= len(value) <= limits[1]
+
+
+def mutations(target: Target, sample: dict) -> Iterator[Mutation]:
+    """Все мутации цели. sample — пример валидного payload'а (берём из него имена и типы полей)."""
+    for name, original in sample.items():
+        required = name in target.required
+        limited = name in FIELD_LIMITS
+
+        for value in TYPE_VALUES:
+            if type(value) is type(original):
+                continue
+            yield Mutation("type", name, f"{name} = {value!r}", _replace(name, value), required or limited)
+
+        if isinstance(original, str):
+            low, high = FIELD_LIMITS.get(name, (1, 255))
+            for length in sorted({0, 1, max(low - 1, 0), low, high, high + 1, 10_000}):
+                value = "x" * length
+                must_reject = _violates_length(name, value) or (required and length == 0) or name in _ID_FIELDS
+                yield Mutation("length", name, f"len({name}) = {length}", _replace(name, value), must_reject)
+
+            for label, value in ENCODING_VALUES.items():
+                must_reject = _violates_length(name, value) or name in _ID_FIELDS or name == "email"
+                yield Mutation("encoding", name, f"{name} = <{label}>", _replace(name, value), must_reject)
+
+        yield Mutation(
+            "structure", name, f"drop {name}",
+            lambda payload, n=name: {k: v for k, v in payload.items() if k != n},
+            required,
+        )
+        yield Mutation("structure", name, f"{name} = {{'$ne': null}}", _replace(name, {"$ne": None}), required or limited)
+
+    for owner_field in _ID_FIELDS:
+        if owner_field in sample:
+            for value in ("123", "0" * 24):
+                yield Mutation("structure", owner_field, f"{owner_field} = {value!r}", _replace(owner_field, value), True)
+
+    yield Mutation("structure", None, "unknown field", lambda p: {**p, "__fuzz": 1}, False)
+    yield Mutation("structure", None, "1000 extra keys", lambda p: {**p, **{f"k{i}": i for i in range(1000)}}, False)
+    yield Mutation("structure", None, "body is array", lambda p: [p], True)
+    if target.required:
+        yield Mutation("structure", None, "empty object", lambda p: {}, True)
+
+
+def response_signature(target: Target, resp) -> tuple:
+    """Сигнатура ответа для классификации/дедупликации: (цель, статус, код ошибки, поля из data)."""
+    try:
+        body = resp.json()
+    except ValueError:
+        return target.name, resp.status_code, "<non-json>", ()
+    if not isinstance(body, dict):
+        return target.name, resp.status_code, "<non-object>", ()
+    error = body.get("error") or ("OK" if resp.status_code < 300 else "<no error code>")
+    data = body.get("data")
+    detail = tuple(sorted(data.keys())) if resp.status_code >= 400 and isinstance(data, dict) else ()
+    return target.name, resp.status_code, error, detail
+
+
+@dataclass
+class Finding:
+    signature: tuple
+    target: str
+    mutation: str
+    kind: str
+    payload: Any
+    status: int
+    body: str
+    count: int = 1
+    minimized: Any = None
+
+
+@dataclass
+class Fuzzer:
+    raw: RawHttp
+    base_url: str
+    app_id: str
+    context: FuzzContext = field(default_factory=FuzzContext)
+    classes: Counter = field(default_factory=Counter)
+    findings: dict[tuple, Finding] = field(default_factory=dict)
+    created: list[tuple[str, str]] = field(default_factory=list)
+    sent: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def url(self, target: Target) -> str:
+        return self.base_url + target.path.format(post_id=self.context.post_id)
+
+    def send(self, target: Target, payload: Any):
+        resp = self.raw.request(target.method, self.url(target), headers={"app-id": self.app_id}, json_body=payload)
+        with self._lock:
+            self.sent += 1
+            if target.resource and resp.status_code < 300:
+                created_id = _body_id(resp)
+                if created_id:
+                    self.created.append((target.resource, created_id))
+        return resp
+
+    def run_one(self, target: Target, mutation: Mutation) -> None:
+        payload = mutation.apply(target.base_payload(self.context))  # свежий payload: уникальный email и т.п.
+        try:
+            resp = self.send(target, payload)
+        except Exception as e:  # таймаут/обрыв — тоже класс ответа
+            with self._lock:
+                self.classes[(target.name, 0, type(e).__name__)] += 1
+            return
+
+        signature = response_signature(target, resp)
+        interesting = resp.status_code >= 500 or (resp.status_code < 300 and mutation.must_reject)
+        # Дедупликация: одна находка на сигнатуру ответа и поле (у всех "лишних" 2xx сигнатура одинаковая)
+        key = signature + (mutation.field or "",)
+        with self._lock:
+            self.classes[signature[:3]] += 1
+            if not interesting:
+                return
+            if key in self.findings:
+                self.findings[key].count += 1
+                return
+            self.findings[key] = Finding(
+                signature, target.name, mutation.description, mutation.kind, payload, resp.status_code, resp.text[:2000],
+            )
+
+    def minimize(self, finding: Finding, max_steps: int = 40) -> None:
+        """Жадная минимизация: убираем поля / укорачиваем строки, пока сигнатура ответа та же."""
+        target = TARGETS[finding.target]
+        current = finding.payload
+        steps = 0
+
+        def same(candidate: Any) -> bool:
+            nonlocal steps
+            steps += 1
+            try:
+                return response_signature(target, self.send(target, candidate)) == finding.signature
+            except Exception:
+                return False
+
+        if isinstance(current, dict):
+            for key in list(current):
+                if steps >= max_steps:
+                    break
+                candidate = {k: v for k, v in current.items() if k != key}
+                if same(candidate):
+                    current = candidate
+            for key, value in list(current.items()):
+                while isinstance(value, str) and len(value) > 8 and steps < max_steps:
+                    candidate = {**current, key: value[: len(value) // 2]}
+                    if not same(candidate):
+                        break
+                    current, value = candidate, candidate[key]
+        finding.minimized = current
+
+    def cleanup(self) -> None:
+        # Сначала дети, потом родители: комментарии -> посты -> пользователи
+        order = {"comment": 0, "post": 1, "user": 2}
+        for resource, entity_id in sorted(self.created, key=lambda item: order[item[0]]):
+            self.raw.request("DELETE", f"{self.base_url}/{resource}/{entity_id}", headers={"app-id": self.app_id})
+        self.created.clear()
+
+
+def _body_id(resp) -> Optional[str]:
+    try:
+        body = resp.json()
+    except ValueError:
+        return None
+    return body.get("id") if isinstance(body, dict) else None
+
+
+def persist(findings: list[Finding], out_dir: Path) -> list[Path]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for f in findings:
+        # ensure_ascii: одиночные суррогаты из мутаций (lone_surrogate) не кодируются в UTF-8
+        digest = hashlib.sha1(json.dumps(f.signature).encode()).hexdigest()[:8]
+        path = out_dir / f"{f.target}-{f.status}-{f.signature[2]}-{digest}.json".replace("<", "").replace(">", "")
+        record = {
+            "target": f.target,
+            "method": TARGETS[f.target].method,
+            "path": TARGETS[f.target].path,
+            "signature": list(f.signature),
+            "mutation": f.mutation,
+            "kind": f.kind,
+            "count": f.count,
+            "payload": f.payload,
+            "minimized_payload": f.minimized,
+            "status": f.status,
+            "response": f.body,
+        }
+        path.write_text(json.dumps(record, indent=2), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def _setup_context(fuzzer: Fuzzer) -> None:
+    owner = fuzzer.raw.post(f"{fuzzer.base_url}/user/create",
+                            headers={"app-id": fuzzer.app_id}, json_body=UserPayloads.create_user())
+    owner_id = _body_id(owner)
+    assert owner.status_code == 200 and owner_id, f"cannot create fuzz owner: {owner.status_code} {owner.text}"
+    post = fuzzer.raw.post(f"{fuzzer.base_url}/post/create",
+                           headers={"app-id": fuzzer.app_id}, json_body=PostPayloads.create_post(owner_id))
+    post_id = _body_id(post)
+    assert post.status_code == 200 and post_id, f"cannot create fuzz post: {post.status_code} {post.text}"
+    fuzzer.context = FuzzContext(owner_id=owner_id, post_id=post_id)
+    fuzzer.created += [("user", owner_id), ("post", post_id)]
+
+
+def run(base_url: str, app_id: str, targets: list[str], rounds: int, rps: float, concurrency: int,
+        out_dir: Path, timeout: float = 15) -> Fuzzer:
+    # app-id задаётся на каждый запрос: сессия без заголовка по умолчанию
+    raw = RawHttp(timeout=timeout, session=tool_session(rps, concurrency))
+    fuzzer = Fuzzer(raw=raw, base_url=base_url.rstrip("/"), app_id=app_id)
+    try:
+        _setup_context(fuzzer)
+        jobs = []
+        for _ in range(rounds):
+            for name in targets:
+                target = TARGETS[name]
+                jobs += [(target, m) for m in mutations(target, target.base_payload(fuzzer.context))]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(lambda job: fuzzer.run_one(*job), jobs))
+        elapsed = time.perf_counter() - started
+
+        for finding in fuzzer.findings.values():
+            fuzzer.minimize(finding)
+        paths = persist(list(fuzzer.findings.values()), out_dir) if fuzzer.findings else []
+        _report(fuzzer, len(jobs), elapsed, paths)
+    finally:
+        fuzzer.cleanup()
+        raw.close()
+    return fuzzer
+
+
+def _report(fuzzer: Fuzzer, jobs: int, elapsed: float, paths: list[Path]) -> None:
+    print(f"mutations sent: {jobs} in {elapsed:.1f}s ({jobs / elapsed if elapsed else 0:.0f} req/s), "
+          f"total requests incl. minimization: {fuzzer.sent}")
+    print(f"{'target':<16}{'status':>7}  {'error':<24}{'count':>7}")
+    for (target, status, error), count in sorted(fuzzer.classes.items()):
+        print(f"{target:<16}{status:>7}  {error:<24}{count:>7}")
+    print(f"findings (unique signatures): {len(fuzzer.findings)}")
+    for f, path in zip(fuzzer.findings.values(), paths):
+        print(f"  {f.status} {f.signature[2]} {f.target}: {f.mutation} (x{f.count}) -> {path}")
+
+
+def main() -> None:
+    load_env()
+
+    parser = argparse.ArgumentParser(description="Mutation fuzzer for DummyAPI create/update payloads")
+    parser.add_argument("--targets", default=",".join(TARGETS), help=f"через запятую: {', '.join(TARGETS)}")
+    parser.add_argument("--rounds", type=int, default=1, help="сколько раз прогнать полный набор мутаций")
+    parser.add_argument("--rps", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--out", default="fuzz-findings", help="каталог для воспроизводящих payload'ов")
+    parser.add_argument("--offline", action="store_true", help="поднять локальный tools/stub_api.py и бить в него")
+    args = parser.parse_args()
+
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    unknown = set(targets) - set(TARGETS)
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(sorted(unknown))}")
+
+    if args.offline:
+        from tools.stub_api import StubServer
+
+        with StubServer() as stub:
+            run(stub.base_url, stub.app_id, targets, args.rounds, args.rps, args.concurrency, Path(args.out))
+        return
+
+    host, token = require_credentials(parser, alternative="--offline")
+    run(host, token, targets, args.rounds, args.rps, args.concurrency, Path(args.out))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Массовое наполнение стенда (users -> posts -> comments) с возобновлением и быстрым teardown.
+
+Работает через обычные клиенты фреймворка (UsersAPI / PostsAPI / CommentsAPI) и payload-фабрики.
+Каждая созданная сущность сразу дописывается в манифест (JSONL) под логическим ключом:
+    u17          — 18-й пользователь
+    u17/p2       — 3-й пост этого пользователя
+    u17/p2/c0    — 1-й комментарий к этому посту
+Повторный запуск с тем же манифестом пропускает уже созданные ключи — прерванный сид (Ctrl+C, обрыв сети)
+продолжается без дублей. teardown удаляет всё из манифеста (дети -> родители) и тоже возобновляем:
+удаления дописываются в манифест отметками {"key": ..., "deleted": true}.
+
+Запуск (HOST / API_TOKEN — из окружения или .env):
+    python -m tools.seed run --users 10000 --posts-per-user 3 --comments-per-post 2 --rps 20 --concurrency 16
+    python -m tools.seed teardown --rps 20 --concurrency 16
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+from services.comments.api_comments import CommentsAPI
+from services.comments.comment_endpoints import CommentEndpoints
+from services.posts.api_posts import PostsAPI
+from services.posts.post_endpoints import PostEndpoints
+from services.users.api_users import UsersAPI
+from services.users.user_endpoints import UserEndpoints
+from tools._common import load_env, require_credentials, tool_session
+from utils.concurrency import run_concurrently
+
+DEFAULT_MANIFEST = "seed-manifest.jsonl"
+DEFAULT_TIMEOUT = 15
+
+
+class Manifest:
+    """
+    Журнал созданных сущностей: одна JSON-строка на событие, дописывается сразу (flush) — это и есть checkpoint.
+
+    {"key": "u3/p1", "kind": "post", "id": "...", "parent": "u3"}
+    {"key": "u3/p1", "deleted": true}
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if path.exists():
+            with path.open(encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # оборванная последняя строка после аварийного завершения
+                    if record.get("deleted"):
+                        self.entries.pop(record["key"], None)
+                    elif "key" in record:
+                        self.entries[record["key"]] = record
+        self._file = path.open("a", encoding="utf-8")
+
+    def id_of(self, key: str) -> Optional[str]:
+        entry = self.entries.get(key)
+        return entry["id"] if entry else None
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def add(self, key: str, kind: str, entity_id: str, parent: Optional[str] = None) -> None:
+        record = {"key": key, "kind": kind, "id": entity_id, "parent": parent}
+        with self._lock:
+            self.entries[key] = record
+            self._write(record)
+
+    def mark_deleted(self, key: str) -> None:
+        with self._lock:
+            self.entries.pop(key, None)
+            self._write({"key": key, "deleted": True})
+
+    def of_kind(self, kind: str) -> list[dict]:
+        with self._lock:
+            return [e for e in self.entries.values() if e["kind"] == kind]
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class Progress:
+    """Счётчики и периодическая строка прогресса (раз в `every` секунд)."""
+
+    def __init__(self, every: float = 5.0):
+        self.every = every
+        self.counts: dict[str, int] = {}
+        self.started = time.perf_counter()
+        self._last = self.started
+        self._lock = threading.Lock()
+
+    def add(self, kind: str) -> None:
+        with self._lock:
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+            now = time.perf_counter()
+            if now - self._last >= self.every:
+                self._last = now
+                print(self.line(), flush=True)
+
+    def line(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        total = sum(self.counts.values())
+        parts = ", ".join(f"{k}={v}" for k, v in sorted(self.counts.items()))
+        return f"[{elapsed:7.1f}s] {parts or 'nothing yet'} ({total / elapsed if elapsed else 0:.1f}/s)"
+
+
+def make_clients(host: str, token: str, rps: float, concurrency: int) -> tuple[UsersAPI, PostsAPI, CommentsAPI]:
+    """Клиенты как в conftest (одна сессия с app-id), но со своим лимитером: темп задаёт --rps."""
+    session = tool_session(rps, concurrency, app_id=token)
+    return (
+        UsersAPI(session=session, endpoints=UserEndpoints(host), timeout=DEFAULT_TIMEOUT),
+        PostsAPI(session=session, endpoints=PostEndpoints(host), timeout=DEFAULT_TIMEOUT),
+        CommentsAPI(session=session, endpoints=CommentEndpoints(host), timeout=DEFAULT_TIMEOUT),
+    )
+
+
+def seed_user(i: int, posts_per_user: int, comments_per_post: int, clients, manifest: Manifest, progress: Progress) -> None:
+    """Поддерево одного пользователя; всё, что уже есть в манифесте, пропускается."""
+    users_api, posts_api, comments_api = clients
+    user_key = f"u{i}"
+    user_id = manifest.id_of(user_key)
+    if user_id is None:
+        user_id, _ = users_api.create_user()
+        manifest.add(user_key, "user", user_id)
+        progress.add("users")
+
+    for j in range(posts_per_user):
+        post_key = f"{user_key}/p{j}"
+        post_id = manifest.id_of(post_key)
+        if post_id is None:
+            post_id, _ = posts_api.create_post(owner_id=user_id)
+            manifest.add(post_key, "post", post_id, parent=user_key)
+            progress.add("posts")
+
+        for k in range(comments_per_post):
+            comment_key = f"{post_key}/c{k}"
+            if manifest.id_of(comment_key) is None:
+                comment_id, _ = comments_api.create_comment(owner_id=user_id, post_id=post_id)
+                manifest.add(comment_key, "comment", comment_id, parent=post_key)
+                progress.add("comments")
+
+
+def _run_all(tasks: Iterator, concurrency: int) -> int:
+    """Гоняет задачи в пуле; Ctrl+C отменяет ещё не начатые (манифест остаётся консистентным). Возвращает число ошибок."""
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+    futures = [pool.submit(task) for task in tasks]
+    errors = 0
+    try:
+        for future in futures:
+            error = future.exception()
+            if error is not None:
+                errors += 1
+                if errors <= 5:
+                    print(f"error: {type(error).__name__}: {str(error)[:200]}", file=sys.stderr)
+    except KeyboardInterrupt:
+        pool.shutdown(wait=True, cancel_futures=True)
+        raise
+    pool.shutdown(wait=True)
+    return errors
+
+
+def cmd_run(args, host: str, token: str) -> int:
+    manifest = Manifest(Path(args.manifest))
+    clients = make_clients(host, token, args.rps, args.concurrency)
+    progress = Progress()
+    already = len(manifest.entries)
+    print(f"seeding {args.users} users x {args.posts_per_user} posts x {args.comments_per_post} comments "
+          f"(manifest {args.manifest}: {already} entities already present)")
+    try:
+        errors = _run_all(
+            (lambda i=i: seed_user(i, args.posts_per_user, args.comments_per_post, clients, manifest, progress)
+             for i in range(args.users)),
+            args.concurrency,
+        )
+    except KeyboardInterrupt:
+        print(f"\ninterrupted: {progress.line()} — run the same command again to resume")
+        return 130
+    finally:
+        manifest.close()
+    print(f"done: {progress.line()}, errors={errors}" + (" — re-run to retry failed subtrees" if errors else ""))
+    return 1 if errors else 0
+
+
+def cmd_teardown(args, host: str, token: str) -> int:
+    manifest = Manifest(Path(args.manifest))
+    users_api, posts_api, comments_api = make_clients(host, token, args.rps, args.concurrency)
+    deleters = {
+        "comment": comments_api.delete_comment,
+        "post": posts_api.delete_post,
+        "user": users_api.delete_user,
+    }
+    progress = Progress()
+    errors = 0
+    try:
+        # Дети -> родители: иначе на стенде остались бы комментарии/посты удалённых пользователей
+        for kind in ("comment", "post", "user"):
+            entries = manifest.of_kind(kind)
+
+            def delete(entry: dict, kind: str = kind) -> None:
+                deleters[kind](entry["id"], allow_not_found=True)
+                manifest.mark_deleted(entry["key"])
+                progress.add(f"{kind}s deleted")
+
+            results = run_concurrently([lambda e=e: delete(e) for e in entries],
+                                       max_workers=args.concurrency, return_exceptions=True)
+            errors += sum(isinstance(r, BaseException) for r in results)
+    except KeyboardInterrupt:
+        print(f"\ninterrupted: {progress.line()} — run teardown again to continue")
+        return 130
+    finally:
+        manifest.close()
+    print(f"teardown done: {progress.line()}, errors={errors}")
+    return 1 if errors else 0
+
+
+def main() -> None:
+    load_env()
+
+    parser = argparse.ArgumentParser(description="Resumable bulk seeding of users/posts/comments")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def common(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--manifest", default=DEFAULT_MANIFEST, help="JSONL-манифест созданных id (checkpoint)")
+        p.add_argument("--rps", type=float, default=20, help="максимум запросов в секунду")
+        p.add_argument("--concurrency", type=int, default=16)
+
+    run_parser = sub.add_parser("run", help="создать (или досоздать) сущности по форме")
+    run_parser.add_argument("--users", type=int, required=True)
+    run_parser.add_argument("--posts-per-user", type=int, default=0)
+    run_parser.add_argument("--comments-per-post", type=int, default=0)
+    common(run_parser)
+
+    teardown_parser = sub.add_parser("teardown", help="удалить всё, что записано в манифесте")
+    common(teardown_parser)
+    args = parser.parse_args()
+
+    host, token = require_credentials(parser)
+
+    handler = cmd_run if args.command == "run" else cmd_teardown
+    sys.exit(handler(args, host, token))
+
+
+if __name__ == "__main__":
+    main()
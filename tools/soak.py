@@ -0,0 +1,347 @@
+"""
+Soak-прогон: CRUD-сценарии (tests/*/test_*_crud.py) в цикле часами — в ОДНОЙ pytest-сессии, через те же
+клиенты и фикстуры, что и обычный прогон. Ищет утечки на стороне клиента и дрейф латентности.
+
+Тесты собираются один раз, дальше плагин SoakLoop гоняет их по кругу: session-фикстуры (requests.Session,
+пул соединений, RawHttp) живут весь прогон, поэтому копящееся в них состояние и видно в замерах.
+Инструментирование — обычное (full, как у pytest): буферы вложений тоже в замерах; --instrumentation off
+отключает шаги и вложения.
+
+Каждое окно (--window минут) пишет строку в <out>/samples.ndjson:
+    RSS, память tracemalloc, открытые fd и сокеты, число итераций/падений,
+    по каждому роуту — n / p50 / p95 запросов этого окна.
+В конце — <out>/report.json и сводка:
+    - монотонный рост RSS / tracemalloc (буферы вложений, состояние Session, Faker, ...)
+    - рост числа fd / сокетов (незакрытые соединения)
+    - top аллокаторов по приросту памяти (tracemalloc, после первого окна — прогрев)
+    - дрейф латентности: p50 последних окон против первых
+
+Запуск (HOST / API_TOKEN — из окружения или .env):
+    python -m tools.soak --duration 240 --window 10 --out soak-report
+    python -m tools.soak --iterations 50 --window 1 --fail-on-leak -- -m smoke
+    python -m tools.soak --duration 60 --instrumentation off
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Optional
+import pytest
+from tools._common import ROOT, load_env, require_credentials
+from utils.request_timing import RequestTimings
+from utils.transport import add_response_observer, remove_response_observer
+
+DEFAULT_TESTS = sorted(str(p.relative_to(ROOT)) for p in ROOT.glob("tests/*/test_*_crud.py"))
+
+RSS_GROWTH_MB = 5.0          # рост меньше — не утечка, а шум аллокатора
+MONOTONIC_SHARE = 0.8        # доля окон, где значение выросло относительно предыдущего
+FD_GROWTH = 5
+DRIFT_RATIO = 1.5
+DRIFT_MIN_MS = 5.0
+TOP_ALLOCATORS = 10
+
+
+# ---------- замеры процесса ----------
+
+def rss_mb() -> float:
+    """Текущий RSS (Linux: /proc/self/status); иначе — пиковый ru_maxrss."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def open_fds() -> tuple[Optional[int], Optional[int]]:
+    """(все fd, из них сокеты) процесса; (None, None), если /proc недоступен."""
+    fd_dir = Path("/proc/self/fd")
+    if not fd_dir.exists():
+        return None, None
+    fds = sockets = 0
+    for entry in fd_dir.iterdir():
+        try:
+            target = os.readlink(entry)
+        except OSError:
+            continue  # fd закрылся между listdir и readlink
+        fds += 1
+        sockets += target.startswith("socket:")
+    return fds, sockets
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class WindowLatency:
+    """Наблюдатель транспорта: латентность запросов по роутам за текущее окно."""
+
+    def __init__(self) -> None:
+        self._samples: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, timings: RequestTimings, response: Any = None) -> None:
+        with self._lock:
+            self._samples.setdefault(f"{timings.method} {timings.route}", []).append(timings.total * 1000)
+
+    def take(self) -> dict[str, dict]:
+        with self._lock:
+            samples, self._samples = self._samples, {}
+        return {
+            route: {"n": len(v), "p50_ms": round(statistics.median(v), 3), "p95_ms": round(_percentile(v, 0.95), 3)}
+            for route, v in sorted(samples.items())
+        }
+
+
+# ---------- анализ ----------
+
+def growth(series: list[float]) -> dict:
+    """Рост ряда после прогрева: начало, конец, итог и доля окон с ростом (наклон — slope_per_hour)."""
+    deltas = [b - a for a, b in zip(series, series[1:])]
+    return {
+        "start": series[0],
+        "end": series[-1],
+        "delta": series[-1] - series[0],
+        "rising_share": sum(d > 0 for d in deltas) / len(deltas) if deltas else 0.0,
+    }
+
+
+def slope_per_hour(times: list[float], values: list[float]) -> float:
+    if len(times) < 2:
+        return 0.0
+    mean_t, mean_v = statistics.fmean(times), statistics.fmean(values)
+    var = sum((t - mean_t) ** 2 for t in times)
+    if not var:
+        return 0.0
+    return sum((t - mean_t) * (v - mean_v) for t, v in zip(times, values)) / var * 3600
+
+
+def analyze(windows: list[dict]) -> dict:
+    """Выводы по окнам: первое окно — прогрев (импорты, пул соединений, кэши) и в тренд не входит."""
+    steady = windows[1:] if len(windows) > 2 else windows
+    findings: list[str] = []
+    result: dict[str, Any] = {"windows": len(windows), "findings": findings}
+    times = [w["elapsed_s"] for w in steady]
+
+    for key, unit, threshold in (("rss_mb", "MB", RSS_GROWTH_MB), ("traced_mb", "MB", RSS_GROWTH_MB)):
+        values = [w[key] for w in steady if w.get(key) is not None]
+        if len(values) < 2:
+            continue
+        g = growth(values)
+        g["slope_per_hour"] = slope_per_hour(times[: len(values)], values)
+        result[key] = g
+        if g["delta"] > threshold and g["rising_share"] >= MONOTONIC_SHARE:
+            findings.append(f"monotonic {key} growth: {g['start']:.1f} -> {g['end']:.1f} {unit} "
+                            f"({g['slope_per_hour']:+.1f} {unit}/h, rising in {g['rising_share']:.0%} of windows)")
+
+    for key in ("fds", "sockets"):
+        values = [w[key] for w in steady if w.get(key) is not None]
+        if len(values) < 2:
+            continue
+        g = growth(values)
+        result[key] = g
+        if g["delta"] >= FD_GROWTH:
+            findings.append(f"{key} growth: {g['start']} -> {g['end']} (unclosed files/connections?)")
+
+    drift = {}
+    head, tail = steady[:3], steady[-3:]
+    if len(steady) >= 6:
+        for route in {r for w in steady for r in w["routes"]}:
+            first = [w["routes"][route]["p50_ms"] for w in head if route in w["routes"]]
+            last = [w["routes"][route]["p50_ms"] for w in tail if route in w["routes"]]
+            if not first or not last:
+                continue
+            before, after = statistics.median(first), statistics.median(last)
+            drift[route] = {"first_p50_ms": before, "last_p50_ms": after}
+            if after >= before * DRIFT_RATIO and after - before >= DRIFT_MIN_MS:
+                findings.append(f"latency drift {route}: p50 {before:.1f} -> {after:.1f} ms")
+    result["latency_drift"] = drift
+    return result
+
+
+def top_allocators(baseline: tracemalloc.Snapshot, final: tracemalloc.Snapshot) -> list[dict]:
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, __file__),  # собственные окна замеров soak
+        # Механика самого pytest (отчёты, хуки, разбор опций) — не клиентские утечки
+        tracemalloc.Filter(False, "*/_pytest/*"),
+        tracemalloc.Filter(False, "*/pluggy/*"),
+        tracemalloc.Filter(False, argparse.__file__),
+    ]
+    stats = final.filter_traces(filters).compare_to(baseline.filter_traces(filters), "lineno")
+    return [
+        {"where": str(stat.traceback), "size_diff_kib": round(stat.size_diff / 1024, 1), "count_diff": stat.count_diff}
+        for stat in stats[:TOP_ALLOCATORS]
+        if stat.size_diff > 0
+    ]
+
+
+# ---------- цикл ----------
+
+class SoakLoop:
+    """
+    pytest-плагин: вместо одного прохода по собранным тестам крутит их по кругу до дедлайна / N итераций.
+
+    Последнему тесту итерации следующим передаётся первый тест (nextitem) — pytest разбирает только
+    function/class/module-фикстуры, session-фикстуры остаются. nextitem=None — только в последней итерации.
+    Между итерациями, если окно истекло, снимается замер (close_window).
+    """
+
+    def __init__(self, deadline: float, iterations: int, window_s: float, samples_path: Path) -> None:
+        self.deadline = deadline
+        self.max_iterations = iterations
+        self.window_s = window_s
+        self.samples_path = samples_path
+        self.latency = WindowLatency()
+        self.started = time.monotonic()
+        self.windows: list[dict] = []
+        self.baseline_snapshot: Optional[tracemalloc.Snapshot] = None
+        self.iteration = self.passed = self.failed = 0
+        self.window_iterations = 0
+
+    def _last_iteration(self) -> bool:
+        if self.max_iterations and self.iteration + 1 >= self.max_iterations:
+            return True
+        return time.monotonic() >= self.deadline
+
+    def pytest_runtest_logreport(self, report) -> None:
+        if report.when == "call" and report.passed:
+            self.passed += 1
+        elif report.failed:
+            self.failed += 1
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session) -> bool:
+        if session.testsfailed and not session.config.option.continue_on_collection_errors:
+            raise session.Interrupted(f"{session.testsfailed} errors during collection")
+        if session.config.option.collectonly or not session.items:
+            return True
+        items = session.items
+        window_end = self.started + self.window_s
+        try:
+            while True:
+                last = False
+                for index, item in enumerate(items):
+                    if index + 1 < len(items):
+                        nextitem = items[index + 1]
+                    else:
+                        last = self._last_iteration()
+                        nextitem = None if last else items[0]
+                    item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+                    if session.shouldfail:
+                        raise session.Failed(session.shouldfail)
+                    if session.shouldstop:
+                        raise session.Interrupted(session.shouldstop)
+                self.iteration += 1
+                self.window_iterations += 1
+                if time.monotonic() >= window_end:
+                    self.close_window()
+                    window_end = time.monotonic() + self.window_s
+                if last:
+                    return True
+        finally:
+            if self.window_iterations:
+                self.close_window()
+
+    def close_window(self) -> None:
+        gc.collect()
+        fds, sockets = open_fds()
+        traced = tracemalloc.get_traced_memory()[0] / (1024 * 1024) if tracemalloc.is_tracing() else None
+        sample = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "elapsed_s": round(time.monotonic() - self.started, 1),
+            "iterations": self.iteration,
+            "window_iterations": self.window_iterations,
+            "passed": self.passed,
+            "failed": self.failed,
+            "rss_mb": round(rss_mb(), 2),
+            "traced_mb": round(traced, 2) if traced is not None else None,
+            "fds": fds,
+            "sockets": sockets,
+            "routes": self.latency.take(),
+        }
+        self.windows.append(sample)
+        with self.samples_path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(sample, ensure_ascii=False) + "\n")
+        print(f"\n[soak] {sample['elapsed_s']:>8.0f}s it={self.iteration} failed={self.failed} "
+              f"rss={sample['rss_mb']:.1f}MB traced={sample['traced_mb']} fds={fds} sockets={sockets}", flush=True)
+        if len(self.windows) == 1 and tracemalloc.is_tracing():
+            self.baseline_snapshot = tracemalloc.take_snapshot()  # после прогрева
+        self.window_iterations = 0
+
+
+def main() -> None:
+    load_env()
+
+    parser = argparse.ArgumentParser(description="Run CRUD journeys in a loop and watch for leaks and latency drift")
+    parser.add_argument("--duration", type=float, default=60, help="сколько минут крутить (по умолчанию 60)")
+    parser.add_argument("--iterations", type=int, default=0, help="остановиться после N итераций (0 — по времени)")
+    parser.add_argument("--window", type=float, default=5, help="окно замеров, минут")
+    parser.add_argument("--out", default="soak-report", help="каталог для samples.ndjson и report.json")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="без tracemalloc (он замедляет аллокации)")
+    parser.add_argument("--instrumentation", choices=("full", "failures", "off"), default=None,
+                        help="уровень allure-шагов/вложений клиентов (по умолчанию — как у pytest, full)")
+    parser.add_argument("--fail-on-leak", action="store_true", help="exit 1, если найдены утечки или дрейф")
+    parser.add_argument("--tests", nargs="*", default=DEFAULT_TESTS, help="какие тесты крутить")
+    parser.add_argument("pytest_args", nargs="*", help="доп. аргументы pytest (после --)")
+    args = parser.parse_args()
+
+    require_credentials(parser)
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    samples_path = out / "samples.ndjson"
+    samples_path.write_text("", encoding="utf-8")
+    pytest_argv = ["-qq", "-p", "no:cacheprovider", *args.tests, *args.pytest_args]
+    if args.instrumentation:
+        pytest_argv += ["--instrumentation", args.instrumentation]
+
+    if not args.no_tracemalloc:
+        tracemalloc.start(1)
+    started = time.monotonic()
+    soak = SoakLoop(deadline=started + args.duration * 60, iterations=args.iterations,
+                    window_s=args.window * 60, samples_path=samples_path)
+    add_response_observer(soak.latency.record)
+    try:
+        exit_code = pytest.main(pytest_argv, plugins=[soak])
+    finally:
+        remove_response_observer(soak.latency.record)
+    if exit_code == pytest.ExitCode.INTERRUPTED:
+        print("\n[soak] interrupted — writing report for completed windows")
+
+    windows = soak.windows
+    report = analyze(windows) if windows else {"windows": 0, "findings": []}
+    report.update({"iterations": soak.iteration, "passed": soak.passed, "failed": soak.failed, "tests": args.tests})
+    if soak.baseline_snapshot is not None:
+        report["top_allocators"] = top_allocators(soak.baseline_snapshot, tracemalloc.take_snapshot())
+    (out / "report.json").write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print(f"\n[soak] {soak.iteration} iterations, {soak.passed} passed, {soak.failed} failed, "
+          f"{len(windows)} windows -> {out}")
+    for alloc in report.get("top_allocators", [])[:5]:
+        print(f"  +{alloc['size_diff_kib']:>9.1f} KiB  {alloc['where']}")
+    if report["findings"]:
+        print("[soak] findings:")
+        for finding in report["findings"]:
+            print(f"  - {finding}")
+    else:
+        print("[soak] no leaks or latency drift detected")
+    sys.exit(1 if (args.fail_on_leak and report["findings"]) or soak.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
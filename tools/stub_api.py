@@ -0,0 +1,412 @@
+"""
+Локальная имитация DummyAPI (users / posts / comments / tags) для офлайн-прогонов инструментов.
+
+Повторяет то, на что опираются тесты и инструменты:
+- app-id: нет заголовка -> 403 APP_ID_MISSING, неизвестный -> 403 APP_ID_NOT_EXIST
+- id не 24-hex -> 400 PARAMS_NOT_VALID, нет сущности -> 404 RESOURCE_NOT_FOUND, нет пути -> 404 PATH_NOT_FOUND
+- валидация тела -> 400 BODY_NOT_VALID с деталями {"data": {"поле": "причина"}}
+- списки {"data": [...], "total", "page", "limit"} (limit 1..50, по умолчанию 20)
+- удаление пользователя/поста НЕ каскадное — как у DummyAPI (посты/комментарии удалённого остаются)
+Любое необработанное исключение -> 500 {"error": "SERVER_ERROR"} (фаззер такие ответы и ищет).
+
+Запуск:
+    python -m tools.stub_api --port 8080 --app-id local-app-id --seed-users 20
+    HOST=http://127.0.0.1:8080/data/v1 API_TOKEN=local-app-id pytest -m smoke
+
+Из кода (инструменты с --offline): with StubServer(app_id="...") as stub: stub.base_url
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import secrets
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+API_PREFIX = "/data/v1"
+DEFAULT_APP_ID = "local-app-id"
+MAX_BODY_BYTES = 1024 * 1024
+
+_OBJECT_ID = re.compile(r"^[0-9a-f]{24}$")
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+_URL = re.compile(r"^https?://\S+$")
+
+USER_TITLES = {"mr", "ms", "mrs", "miss", "dr", ""}
+USER_GENDERS = {"male", "female", "other", ""}
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, error: str, data: Optional[dict] = None):
+        super().__init__(error)
+        self.status = status
+        self.error = error
+        self.data = data
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _check_str(errors: dict, body: dict, field: str, min_len: int, max_len: int, required: bool = False) -> None:
+    if field not in body:
+        if required:
+            errors[field] = f"Path `{field}` is required."
+        return
+    value = body[field]
+    if not isinstance(value, str):
+        errors[field] = f"Cast to string failed for value `{value!r}`"
+    elif not min_len <= len(value) <= max_len:
+        errors[field] = f"Path `{field}` length must be {min_len}..{max_len}."
+
+
+def _check_choice(errors: dict, body: dict, field: str, choices: set[str]) -> None:
+    if field in body and body[field] not in choices:
+        errors[field] = f"`{body[field]}` is not a valid enum value for path `{field}`."
+
+
+def _check_url(errors: dict, body: dict, field: str) -> None:
+    if field in body and not (isinstance(body[field], str) and _URL.match(body[field])):
+        errors[field] = f"Path `{field}` must be a valid url."
+
+
+class Store:
+    """Данные стенда в памяти. Все операции под одной блокировкой — стенд не про скорость."""
+
+    def __init__(self, app_ids: set[str]):
+        self.app_ids = app_ids
+        self.users: dict[str, dict] = {}
+        self.posts: dict[str, dict] = {}
+        self.comments: dict[str, dict] = {}
+        self.lock = threading.Lock()
+
+    # ---------- представления ----------
+
+    def user_preview(self, user_id: str) -> dict:
+        user = self.users.get(user_id)
+        if user is None:  # владелец удалён — DummyAPI в таком случае отдаёт только id
+            return {"id": user_id}
+        return {k: user[k] for k in ("id", "title", "firstName", "lastName", "picture") if k in user}
+
+    def post_view(self, post: dict) -> dict:
+        return {**post, "owner": self.user_preview(post["owner"])}
+
+    def comment_view(self, comment: dict) -> dict:
+        return {**comment, "owner": self.user_preview(comment["owner"])}
+
+    # ---------- валидация ----------
+
+    def validate_user(self, body: dict, create: bool) -> dict:
+        errors: dict[str, str] = {}
+        _check_str(errors, body, "firstName", 2, 50, required=create)
+        _check_str(errors, body, "lastName", 2, 50, required=create)
+        _check_choice(errors, body, "title", USER_TITLES)
+        _check_choice(errors, body, "gender", USER_GENDERS)
+        _check_str(errors, body, "phone", 0, 20)
+        _check_url(errors, body, "picture")
+        if "dateOfBirth" in body:
+            try:
+                born = datetime.fromisoformat(str(body["dateOfBirth"]).replace("Z", "+00:00"))
+                if not (1900 <= born.year <= datetime.now().year):
+                    raise ValueError
+            except ValueError:
+                errors["dateOfBirth"] = "Path `dateOfBirth` must be a date between 1900 and now."
+        if create:
+            email = body.get("email")
+            if email is None:
+                errors["email"] = "Path `email` is required."
+            elif not (isinstance(email, str) and _EMAIL.match(email)):
+                errors["email"] = "Path `email` is invalid."
+            elif any(u["email"] == email for u in self.users.values()):
+                errors["email"] = "Email already used"
+        if errors:
+            raise ApiError(400, "BODY_NOT_VALID", errors)
+        fields = ("title", "firstName", "lastName", "gender", "dateOfBirth", "phone", "picture", "location")
+        if create:
+            fields += ("email",)  # email нельзя обновить — при PUT игнорируется
+        return {k: body[k] for k in fields if k in body}
+
+    def validate_post(self, body: dict, create: bool) -> dict:
+        errors: dict[str, str] = {}
+        _check_str(errors, body, "text", 6, 1000)
+        _check_url(errors, body, "image")
+        if "likes" in body and (not isinstance(body["likes"], int) or isinstance(body["likes"], bool)):
+            errors["likes"] = "Cast to Number failed."
+        if "tags" in body and not (isinstance(body["tags"], list) and all(isinstance(t, str) for t in body["tags"])):
+            errors["tags"] = "Path `tags` must be an array of strings."
+        if create:
+            owner = body.get("owner")
+            if owner is None:
+                errors["owner"] = "Path `owner` is required."
+            elif not (isinstance(owner, str) and owner in self.users):
+                errors["owner"] = "Path `owner` must be an existing user id."
+        if errors:
+            raise ApiError(400, "BODY_NOT_VALID", errors)
+        fields = ("text", "image", "likes", "tags", "link")
+        if create:
+            fields += ("owner",)  # owner нельзя обновить
+        return {k: body[k] for k in fields if k in body}
+
+    def validate_comment(self, body: dict) -> dict:
+        errors: dict[str, str] = {}
+        _check_str(errors, body, "message", 2, 500, required=True)
+        owner, post = body.get("owner"), body.get("post")
+        if owner is None:
+            errors["owner"] = "Path `owner` is required."
+        elif not (isinstance(owner, str) and owner in self.users):
+            errors["owner"] = "Path `owner` must be an existing user id."
+        if post is None:
+            errors["post"] = "Path `post` is required."
+        elif not (isinstance(post, str) and post in self.posts):
+            errors["post"] = "Path `post` must be an existing post id."
+        if errors:
+            raise ApiError(400, "BODY_NOT_VALID", errors)
+        return {"message": body["message"], "owner": owner, "post": post}
+
+    # ---------- сид ----------
+
+    def seed(self, users: int, posts_per_user: int = 2, comments_per_post: int = 2) -> None:
+        for i in range(users):
+            user_id = secrets.token_hex(12)
+            self.users[user_id] = {
+                "id": user_id, "title": "mr", "firstName": f"Seed{i}", "lastName": "User",
+                "email": f"seed_{user_id}@example.com", "registerDate": _now(), "updatedDate": _now(),
+            }
+            for j in range(posts_per_user):
+                post_id = secrets.token_hex(12)
+                self.posts[post_id] = {
+                    "id": post_id, "text": f"Seed post {i}-{j}", "image": "https://example.com/1.jpg",
+                    "likes": j, "tags": ["seed", f"t{j}"], "owner": user_id, "publishDate": _now(),
+                }
+                for k in range(comments_per_post):
+                    comment_id = secrets.token_hex(12)
+                    self.comments[comment_id] = {
+                        "id": comment_id, "message": f"Seed comment {k}", "owner": user_id,
+                        "post": post_id, "publishDate": _now(),
+                    }
+
+
+def _page(items: list[dict], query: dict[str, list[str]]) -> dict:
+    try:
+        limit = int(query.get("limit", ["20"])[0])
+        page = int(query.get("page", ["0"])[0])
+    except ValueError:
+        raise ApiError(400, "PARAMS_NOT_VALID")
+    if not (1 <= limit <= 50 and 0 <= page <= 999):
+        raise ApiError(400, "PARAMS_NOT_VALID")
+    return {"data": items[page * limit:(page + 1) * limit], "total": len(items), "page": page, "limit": limit}
+
+
+def _object_id(value: str) -> str:
+    if not _OBJECT_ID.match(value):
+        raise ApiError(400, "PARAMS_NOT_VALID")
+    return value
+
+
+def _get(table: dict[str, dict], entity_id: str) -> dict:
+    entity = table.get(_object_id(entity_id))
+    if entity is None:
+        raise ApiError(404, "RESOURCE_NOT_FOUND")
+    return entity
+
+
+def route(store: Store, method: str, path: str, query: dict[str, list[str]], body: Any) -> tuple[int, Any]:
+    """Диспетчер запросов (без HTTP): удобно и для сервера, и для проверок в коде."""
+    if path.startswith(API_PREFIX):
+        path = path[len(API_PREFIX):]
+    parts = [p for p in path.split("/") if p]
+
+    def body_dict() -> dict:
+        if not isinstance(body, dict):
+            raise ApiError(400, "BODY_NOT_VALID")
+        return body
+
+    with store.lock:
+        match (method, parts):
+            case ("GET", ["user"]):
+                users = [store.user_preview(uid) for uid in store.users]
+                return 200, _page(users, query)
+            case ("POST", ["user", "create"]):
+                data = store.validate_user(body_dict(), create=True)
+                user_id = secrets.token_hex(12)
+                user = store.users[user_id] = {"id": user_id, **data, "registerDate": _now(), "updatedDate": _now()}
+                return 200, user
+            case ("GET", ["user", user_id]):
+                return 200, _get(store.users, user_id)
+            case ("PUT", ["user", user_id]):
+                user = _get(store.users, user_id)
+                user.update(store.validate_user(body_dict(), create=False), updatedDate=_now())
+                return 200, user
+            case ("DELETE", ["user", user_id]):
+                _get(store.users, user_id)
+                del store.users[user_id]
+                return 200, {"id": user_id}
+            case ("GET", ["user", user_id, "post"]):
+                _object_id(user_id)
+                posts = [store.post_view(p) for p in store.posts.values() if p["owner"] == user_id]
+                return 200, _page(posts, query)
+            case ("GET", ["user", user_id, "comment"]):
+                _object_id(user_id)
+                comments = [store.comment_view(c) for c in store.comments.values() if c["owner"] == user_id]
+                return 200, _page(comments, query)
+            case ("GET", ["post"]):
+                return 200, _page([store.post_view(p) for p in store.posts.values()], query)
+            case ("POST", ["post", "create"]):
+                data = store.validate_post(body_dict(), create=True)
+                post_id = secrets.token_hex(12)
+                data.setdefault("likes", 0)
+                data.setdefault("tags", [])
+                post = store.posts[post_id] = {"id": post_id, **data, "publishDate": _now()}
+                return 200, store.post_view(post)
+            case ("GET", ["post", post_id]):
+                return 200, store.post_view(_get(store.posts, post_id))
+            case ("PUT", ["post", post_id]):
+                post = _get(store.posts, post_id)
+                post.update(store.validate_post(body_dict(), create=False))
+                return 200, store.post_view(post)
+            case ("DELETE", ["post", post_id]):
+                _get(store.posts, post_id)
+                del store.posts[post_id]
+                return 200, {"id": post_id}
+            case ("GET", ["post", post_id, "comment"]):
+                _object_id(post_id)
+                comments = [store.comment_view(c) for c in store.comments.values() if c["post"] == post_id]
+                return 200, _page(comments, query)
+            case ("GET", ["tag"]):
+                tags = sorted({t for p in store.posts.values() for t in p.get("tags", [])})
+                return 200, {"data": tags}
+            case ("GET", ["tag", tag, "post"]):
+                posts = [store.post_view(p) for p in store.posts.values() if tag in p.get("tags", [])]
+                return 200, _page(posts, query)
+            case ("GET", ["comment"]):
+                return 200, _page([store.comment_view(c) for c in store.comments.values()], query)
+            case ("POST", ["comment", "create"]):
+                data = store.validate_comment(body_dict())
+                comment_id = secrets.token_hex(12)
+                comment = store.comments[comment_id] = {"id": comment_id, **data, "publishDate": _now()}
+                return 200, store.comment_view(comment)
+            case ("DELETE", ["comment", comment_id]):
+                _get(store.comments, comment_id)
+                del store.comments[comment_id]
+                return 200, {"id": comment_id}
+        raise ApiError(404, "PATH_NOT_FOUND")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, как у настоящего API
+    disable_nagle_algorithm = True  # заголовки и тело уходят разными write — без этого +40 мс (delayed ACK)
+    store: Store
+    latency: float = 0.0
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 - сигнатура BaseHTTPRequestHandler
+        pass
+
+    def _reply(self, status: int, payload: Any, head: bool = False) -> None:
+        data = json.dumps(payload).encode("utf-8")  # ensure_ascii: одиночные суррогаты из тела не ломают ответ
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(data)
+
+    def _handle(self, method: str) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            app_id = self.headers.get("app-id")
+            if not app_id:
+                raise ApiError(403, "APP_ID_MISSING")
+            if app_id not in self.store.app_ids:
+                raise ApiError(403, "APP_ID_NOT_EXIST")
+            if length > MAX_BODY_BYTES:
+                raise ApiError(400, "BODY_NOT_VALID", {"body": "too large"})
+            try:
+                body = json.loads(raw) if raw else None
+            except ValueError:
+                raise ApiError(400, "BODY_NOT_VALID", {"body": "invalid JSON"})
+            split = urlsplit(self.path)
+            status, payload = route(self.store, method, split.path, parse_qs(split.query), body)
+        except ApiError as e:
+            status, payload = e.status, {"error": e.error, **({"data": e.data} if e.data else {})}
+        except Exception:  # баг стенда — отдаём 500, как сделал бы реальный сервер
+            status, payload = 500, {"error": "SERVER_ERROR"}
+        self._reply(status, payload, head=method == "HEAD")
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_HEAD(self) -> None:
+        self._handle("HEAD")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_PUT(self) -> None:
+        self._handle("PUT")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+
+class StubServer:
+    """Стенд в фоновом потоке. base_url — уже с /data/v1, как HOST в .env."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, app_id: str = DEFAULT_APP_ID,
+                 seed_users: int = 0, latency: float = 0.0):
+        self.app_id = app_id
+        self.store = Store({app_id})
+        self.store.seed(seed_users)
+        handler = type("StubHandler", (_Handler,), {"store": self.store, "latency": latency})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="stub-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local DummyAPI stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--app-id", default=DEFAULT_APP_ID)
+    parser.add_argument("--seed-users", type=int, default=0, help="сколько пользователей (с постами/комментариями) создать")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="искусственная задержка каждого ответа")
+    args = parser.parse_args()
+
+    stub = StubServer(args.host, args.port, args.app_id, args.seed_users, args.latency_ms / 1000)
+    print(f"DummyAPI stub: HOST={stub.base_url} API_TOKEN={args.app_id}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Уборка тестовых данных, оставшихся от упавших прогонов (utils/sweeper.OrphanSweeper).
+
+Запуск (HOST / API_TOKEN — из окружения или .env):
+    python -m tools.sweep --dry-run --list                   # только отчёт: что было бы удалено
+    python -m tools.sweep --older-than 60 --rps 20           # удалить всё старше часа
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import timedelta
+from tools._common import load_env, require_credentials, tool_session
+from utils.sweeper import KINDS, OrphanSweeper
+
+
+def main() -> None:
+    load_env()
+
+    parser = argparse.ArgumentParser(description="Delete orphaned autotest users/posts/comments")
+    parser.add_argument("--dry-run", action="store_true", help="только скан и отчёт, ничего не удалять")
+    parser.add_argument("--list", action="store_true", help="напечатать найденные сущности")
+    parser.add_argument("--older-than", type=float, default=0, help="не трогать созданное позже N минут назад")
+    parser.add_argument("--rps", type=float, default=20, help="максимум запросов в секунду")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    host, token = require_credentials(parser)
+    session = tool_session(args.rps, args.concurrency, app_id=token)
+
+    sweeper = OrphanSweeper(
+        session, host, min_age=timedelta(minutes=args.older_than), max_workers=args.concurrency,
+    )
+    report = sweeper.scan()
+    if args.list:
+        for kind in KINDS:
+            for orphan in report.orphans[kind]:
+                print(f"{kind:8} {orphan.id}  {orphan.label}  {orphan.created_at or '-'}")
+    if not args.dry_run:
+        sweeper.delete(report)
+    session.close()
+
+    print(report.format())
+    for error in report.delete_errors[:5]:
+        print(f"error: {error}", file=sys.stderr)
+    sys.exit(1 if report.delete_errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 from __future__ import annotations  # делает аннотации "ленивыми" (как строки) — полезно для совместимости/циклов типов
-from typing import Any  # Any = "любой тип" (когда структура данных может быть разной)
+from typing import TYPE_CHECKING, Any  # Any = "любой тип" (когда структура данных может быть разной)
 import allure  # для прикрепления деталей в Allure-отчёт
-import requests  # чтобы типизировать resp как requests.Response
+
+if TYPE_CHECKING:
+    import requests  # чтобы типизировать resp как requests.Response (в рантайме не нужен)
 
 
 def assert_dummyapi_error(
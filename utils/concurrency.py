@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Sequence, TypeVar, Union
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 16
+
+
+def run_concurrently(
+    calls: Sequence[Callable[[], T]],
+    max_workers: Optional[int] = None,
+    return_exceptions: bool = False,
+) -> list[Union[T, BaseException]]:
+    """
+    Выполняет независимые вызовы параллельно (потоки) и возвращает результаты В ТОМ ЖЕ ПОРЯДКЕ.
+
+    Реальную нагрузку на API всё равно ограничивает общий RateLimiter транспорта,
+    max_workers — только верхняя граница потоков (по умолчанию min(len(calls), 16)).
+
+    return_exceptions=False: дожидаемся всех вызовов и пробрасываем первое (по порядку) исключение.
+    return_exceptions=True: исключения возвращаются на месте результата (как asyncio.gather).
+    """
+    if not calls:
+        return []
+    if len(calls) == 1:
+        try:
+            return [calls[0]()]
+        except Exception as e:
+            if return_exceptions:
+                return [e]
+            raise
+
+    workers = max_workers or min(len(calls), DEFAULT_MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(call) for call in calls]
+
+    results: list[Union[T, BaseException]] = []
+    for future in futures:
+        error = future.exception()
+        if error is not None and not return_exceptions:
+            raise error
+        results.append(error if error is not None else future.result())
+    return results
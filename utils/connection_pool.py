@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import os
+import socket
+import ssl
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import requests
+from requests.utils import DEFAULT_CA_BUNDLE_PATH, extract_zipped_paths
+from utils.rate_limiter import RateLimiter
+from utils.transport import ApiAdapter, make_session, transport_name
+
+
+class PoolStats:
+    """Счётчики общего пула: сколько соединений открыто, сколько TLS-сессий возобновлено, DNS hit/miss."""
+
+    def __init__(self) -> None:
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.tls_resumed = 0
+        self.dns_hits = 0
+        self.dns_misses = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(self.__dict__)
+
+
+class DnsCache:
+    """
+    Потокобезопасный кэш DNS (getaddrinfo) с TTL.
+
+    Каждое новое соединение urllib3 по умолчанию заново резолвит хост;
+    с кэшем резолв делается один раз на TTL (по умолчанию 5 минут) на весь процесс.
+    """
+
+    def __init__(self, ttl: float = 300.0, stats: Optional[PoolStats] = None):
+        self.ttl = ttl
+        self.stats = stats or PoolStats()
+        self._entries: dict[tuple[str, int], tuple[float, list[str]]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int) -> list[str]:
+        """Возвращает список IP-адресов хоста (в порядке getaddrinfo)."""
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self.stats.dns_hits += 1
+                return entry[1]
+
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))  # уникальные, порядок сохраняем
+        with self._lock:
+            self._entries[key] = (now + self.ttl, addresses)
+            self.stats.dns_misses += 1
+        return addresses
+
+    def invalidate(self, host: str, port: int) -> None:
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+
+class ResumingSSLContext(ssl.SSLContext):
+    """
+    SSLContext, который переиспользует TLS-сессии между соединениями (session resumption).
+
+    urllib3 вызывает context.wrap_socket(sock, server_hostname=...) для каждого нового соединения.
+    Мы подставляем session= из последнего живого сокета к тому же хосту, поэтому повторные
+    соединения делают сокращённый handshake (без полного обмена сертификатами/ключами).
+
+    В TLS 1.3 тикет сессии приходит ПОСЛЕ handshake (при первом чтении), поэтому храним
+    слабые ссылки на недавние сокеты и забираем .session лениво — когда он уже есть.
+    """
+
+    @classmethod
+    def create(cls, stats: Optional[PoolStats] = None, verify: bool | str = True) -> "ResumingSSLContext":
+        """verify — как у requests: True (certifi) или путь к CA-бандлу / каталогу (REQUESTS_CA_BUNDLE)."""
+        ctx = cls(ssl.PROTOCOL_TLS_CLIENT)
+        if verify is True:
+            ctx.load_verify_locations(extract_zipped_paths(DEFAULT_CA_BUNDLE_PATH))  # те же CA, что у requests
+        elif os.path.isdir(verify):
+            ctx.load_verify_locations(capath=verify)
+        else:
+            ctx.load_verify_locations(cafile=verify)
+        ctx.stats = stats or PoolStats()
+        ctx._sessions = {}
+        ctx._recent = {}
+        ctx._session_lock = threading.Lock()
+        return ctx
+
+    def _session_for(self, hostname: Optional[str]) -> Optional[ssl.SSLSession]:
+        with self._session_lock:
+            for ref in self._recent.get(hostname, []):
+                sock = ref()
+                session = sock.session if sock is not None else None
+                if session is not None and session.has_ticket:
+                    self._sessions[hostname] = session
+            return self._sessions.get(hostname)
+
+    def _remember(self, hostname: Optional[str], sock: ssl.SSLSocket) -> None:
+        with self._session_lock:
+            alive = [r for r in self._recent.get(hostname, []) if r() is not None][-7:]
+            alive.append(weakref.ref(sock))
+            self._recent[hostname] = alive
+
+    def wrap_socket(self, sock, server_side=False, do_handshake_on_connect=True,
+                    suppress_ragged_eofs=True, server_hostname=None, session=None):
+        if session is None and not server_side:
+            session = self._session_for(server_hostname)
+        try:
+            ssock = super().wrap_socket(
+                sock,
+                server_side=server_side,
+                do_handshake_on_connect=do_handshake_on_connect,
+                suppress_ragged_eofs=suppress_ragged_eofs,
+                server_hostname=server_hostname,
+                session=session,
+            )
+        except ssl.SSLError:
+            if session is None:
+                raise
+            # Сервер не принял сохранённую сессию (например, протух тикет) — забываем её.
+            # Сокет после неудачного handshake не переиспользовать, поэтому просто пробрасываем ошибку:
+            # urllib3/requests откроют новое соединение, и оно уже пойдёт без session.
+            with self._session_lock:
+                self._sessions.pop(server_hostname, None)
+            raise
+
+        if not server_side:
+            self.stats.tls_handshakes += 1
+            if ssock.session_reused:
+                self.stats.tls_resumed += 1
+            self._remember(server_hostname, ssock)
+        return ssock
+
+
+class PooledApiAdapter(ApiAdapter):
+    """
+    ApiAdapter с общим пулом: DNS-кэш + переиспользование TLS-сессий.
+
+    Один экземпляр монтируется во все сессии ConnectionManager'а (http-фикстура, RawHttp),
+    поэтому тёплые соединения живут всю тестовую сессию, а не одну фикстуру.
+    """
+
+    def __init__(self, dns_cache: DnsCache, stats: PoolStats, limiter: Optional[RateLimiter] = None, **kwargs):
+        # Атрибуты нужны уже в _connection_attrs(), который вызывается из ApiAdapter.__init__
+        self.dns_cache = dns_cache
+        self.stats = stats
+        # Один SSLContext на каждый вариант verify (True / путь к CA из REQUESTS_CA_BUNDLE и т.п.)
+        self._ssl_contexts: dict[bool | str, ResumingSSLContext] = {}
+        self._ssl_lock = threading.Lock()
+        super().__init__(limiter=limiter, **kwargs)
+
+    def ssl_context_for(self, verify: bool | str) -> ResumingSSLContext:
+        with self._ssl_lock:
+            ctx = self._ssl_contexts.get(verify)
+            if ctx is None:
+                ctx = self._ssl_contexts[verify] = ResumingSSLContext.create(stats=self.stats, verify=verify)
+            return ctx
+
+    def _connection_attrs(self) -> dict:
+        # Соединения резолвят хост через общий DnsCache и считают открытые соединения в PoolStats
+        return {"dns_cache": self.dns_cache, "stats": self.stats}
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        # Иначе urllib3 создаёт новый SSLContext на каждое соединение и TLS-сессии не переиспользуются.
+        # verify=False (без проверки сертификата) оставляем как есть.
+        if verify is not False:
+            pool_kwargs["ssl_context"] = self.ssl_context_for(verify)
+        return host_params, pool_kwargs
+
+
+class ConnectionManager:
+    """
+    Общий менеджер соединений на тестовую сессию.
+
+    - prewarm(): заранее открывает N соединений (DNS + TCP + TLS) к HOST
+    - session(): отдаёт новую сессию (без дефолтных заголовков!) поверх общего тёплого пула —
+      RawHttp сохраняет семантику "app-id по умолчанию НЕ добавляется"
+    - DNS-кэш и TLS session resumption для соединений, которые всё же открываются по ходу прогона
+
+    Настройки (env): POOL_MAXSIZE (10), POOL_PREWARM (4), DNS_CACHE_TTL (300 сек).
+    Для HTTP_TRANSPORT=http2 пул не нужен: Http2Session мультиплексирует всё в одно соединение.
+    """
+
+    def __init__(self, pool_maxsize: int = 10, dns_ttl: float = 300.0, limiter: Optional[RateLimiter] = None):
+        self.stats = PoolStats()
+        self.dns_cache = DnsCache(ttl=dns_ttl, stats=self.stats)
+        self.adapter = PooledApiAdapter(
+            dns_cache=self.dns_cache,
+            stats=self.stats,
+            limiter=limiter,
+            pool_connections=4,
+            pool_maxsize=pool_maxsize,
+        )
+        self.pool_maxsize = pool_maxsize
+        self.prewarm_connections = 0
+
+    @classmethod
+    def from_env(cls) -> "ConnectionManager":
+        manager = cls(
+            pool_maxsize=int(os.getenv("POOL_MAXSIZE", "10")),
+            dns_ttl=float(os.getenv("DNS_CACHE_TTL", "300")),
+        )
+        manager.prewarm_connections = int(os.getenv("POOL_PREWARM", "4"))
+        return manager
+
+    def session(self):
+        """Новая сессия поверх общего пула. Её close() не закрывает сам пул."""
+        return make_session(adapter=self.adapter)
+
+    def prewarm(self, url: str, connections: Optional[int] = None, timeout: float = 15) -> int:
+        """
+        Открывает `connections` тёплых соединений к хосту из url. Возвращает, сколько прогрето.
+
+        Только обычные HEAD-запросы через сессию пула (без app-id: DummyAPI быстро ответит 403/404),
+        поэтому прогрев идёт через RateLimiter и считается в http-метриках как обычный запрос:
+        1) одно соединение — последовательно; чтение ответа заодно забирает TLS 1.3 тикет для resumption
+        2) затем `connections` HEAD параллельно с stream=True: непрочитанный ответ держит своё соединение,
+           и пока все ждут на барьере, пулу приходится открыть `connections` разных соединений.
+           Потом ответы дочитываются — соединения возвращаются в пул тёплыми.
+
+        Больше pool_maxsize соединений пул не хранит (лишние urllib3 закрывает при возврате), поэтому
+        `connections` ограничивается pool_maxsize.
+        """
+        connections = self.prewarm_connections if connections is None else connections
+        connections = min(connections, self.pool_maxsize)
+        if connections <= 0 or transport_name() == "http2":
+            return 0
+
+        session = self.session()
+        try:
+            try:
+                session.head(url, timeout=timeout)
+            except requests.RequestException:
+                return 0  # хост недоступен — пусть это нормально сообщит env_check, а не прогрев
+
+            barrier = threading.Barrier(connections)
+
+            def warm(_: int) -> bool:
+                try:
+                    resp = session.head(url, timeout=timeout, stream=True)
+                except requests.RequestException:
+                    barrier.abort()  # остальные не ждут упавшего
+                    return False
+                try:
+                    barrier.wait(timeout=timeout)
+                except threading.BrokenBarrierError:
+                    pass
+                resp.content  # дочитываем (у HEAD тела нет) — соединение возвращается в пул
+                return True
+
+            with ThreadPoolExecutor(max_workers=connections) as pool_threads:
+                return sum(pool_threads.map(warm, range(connections)))
+        finally:
+            session.close()
+
+    def close(self) -> None:
+        self.adapter.close()
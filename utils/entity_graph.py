@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Optional
+import allure
+from services.comments.comment_model import CommentModel
+from services.comments.comment_payloads import CommentPayloads
+from services.posts.post_model import PostModel
+from services.posts.post_payloads import PostPayloads
+from services.users.user_model import UserModel
+from services.users.user_payloads import UserPayloads
+from utils.concurrency import run_concurrently
+
+if TYPE_CHECKING:
+    import requests
+    from services.comments.api_comments import CommentsAPI
+    from services.posts.api_posts import PostsAPI
+    from services.users.api_users import UsersAPI
+
+    ApiClient = UsersAPI | PostsAPI | CommentsAPI
+
+
+@dataclass
+class GraphComment:
+    id: str
+    model: CommentModel
+    post_id: str
+    owner_id: str
+
+
+@dataclass
+class GraphPost:
+    id: str
+    model: PostModel
+    owner_id: str
+    comments: list[GraphComment] = field(default_factory=list)
+
+
+@dataclass
+class GraphUser:
+    id: str
+    model: UserModel
+    posts: list[GraphPost] = field(default_factory=list)
+
+
+@dataclass
+class EntityGraph:
+    """
+    Построенный граф: users -> posts -> comments, плюс индексы по id.
+
+        g = entity_graph(users=3, posts_per_user=4, comments_per_post=5)
+        g.users[0].posts[1].comments[2].id
+        g.post(post_id).owner_id
+        g.comments   # все комментарии графа (плоский список)
+    """
+
+    users: list[GraphUser] = field(default_factory=list)
+    users_by_id: dict[str, GraphUser] = field(default_factory=dict)
+    posts_by_id: dict[str, GraphPost] = field(default_factory=dict)
+    comments_by_id: dict[str, GraphComment] = field(default_factory=dict)
+
+    @property
+    def posts(self) -> list[GraphPost]:
+        return [p for u in self.users for p in u.posts]
+
+    @property
+    def comments(self) -> list[GraphComment]:
+        return [c for p in self.posts for c in p.comments]
+
+    def user(self, user_id: str) -> GraphUser:
+        return self.users_by_id[user_id]
+
+    def post(self, post_id: str) -> GraphPost:
+        return self.posts_by_id[post_id]
+
+    def comment(self, comment_id: str) -> GraphComment:
+        return self.comments_by_id[comment_id]
+
+
+class EntityGraphBuilder:
+    """
+    Строит граф сущностей по декларативной форме — уровень за уровнем:
+    сначала все пользователи, затем все посты, затем все комментарии.
+    Внутри уровня create-запросы идут ПАРАЛЛЕЛЬНО (общий RateLimiter транспорта держит темп),
+    поэтому время ≈ 3 самых медленных запроса, а не users * posts * comments последовательных.
+
+    В рабочих потоках — только отправка через session клиента, без allure-шагов и вложений:
+    как и в RawHttp.batch, ответы прикрепляются и проверяются уже в потоке теста, иначе allure
+    привязал бы вложения не к тому тесту.
+
+    Всё созданное (в т.ч. при частичном падении уровня) регистрируется для cleanup(),
+    который удаляет дети -> родители: комментарии, посты, пользователи.
+    """
+
+    def __init__(
+        self,
+        users_api: UsersAPI,
+        posts_api: PostsAPI,
+        comments_api: CommentsAPI,
+        max_workers: Optional[int] = None,
+    ):
+        self.users_api = users_api
+        self.posts_api = posts_api
+        self.comments_api = comments_api
+        self.max_workers = max_workers
+        self._created: dict[str, list[str]] = {"comment": [], "post": [], "user": []}
+        self._lock = threading.Lock()
+
+    def _send_all(self, api: ApiClient, method: str, requests_: list[tuple[str, Optional[dict]]]
+                  ) -> list[requests.Response | BaseException]:
+        """(url, json) параллельно через session клиента; исключения возвращаются на месте ответа."""
+        return run_concurrently(
+            [lambda u=url, b=body: api.session.request(method, u, json=b, timeout=api.timeout)
+             for url, body in requests_],
+            max_workers=self.max_workers,
+            return_exceptions=True,
+        )
+
+    def _level(self, kind: str, api: ApiClient, model: Callable[[dict], Any], url: str,
+               payloads: list[dict]) -> list[tuple[str, Any]]:
+        """
+        Create-запросы уровня параллельно; в потоке теста — аттачи, проверка статуса и моделей.
+        Все созданные id регистрируются для cleanup до того, как пробрасывается первая ошибка.
+        """
+        results = self._send_all(api, "POST", [(url, payload) for payload in payloads])
+        errors: list[BaseException] = []
+        bodies: list[dict] = []
+        for resp in results:
+            if isinstance(resp, BaseException):
+                errors.append(resp)
+                continue
+            api.attach_response_safe(resp)
+            try:
+                body = resp.json()
+            except ValueError:
+                body = None  # не-JSON тело ошибки (HTML 502, пустой 429) — не повод потерять уже созданные id
+            if resp.status_code in (200, 201) and isinstance(body, dict) and body.get("id"):
+                bodies.append(body)
+            else:
+                detail = body if body is not None else resp.text
+                errors.append(AssertionError(f"create {kind}: {resp.status_code} {detail}"))
+        with self._lock:
+            self._created[kind] += [body["id"] for body in bodies]
+        if errors:
+            raise errors[0]
+        return [(body["id"], model(body)) for body in bodies]
+
+    def build(self, users: int = 1, posts_per_user: int = 0, comments_per_post: int = 0) -> EntityGraph:
+        """
+        users × posts_per_user × comments_per_post.
+        Авторы комментариев — пользователи графа по кругу (комментарий j к посту пользователя i пишет
+        пользователь (i + j) % users), чтобы граф был "живым", а не только owner -> свой пост.
+        """
+        graph = EntityGraph()
+
+        with allure.step(f"GRAPH: create {users} users"):
+            created = self._level("user", self.users_api, UserModel.model_validate,
+                                  self.users_api.endpoints.create_user,
+                                  [UserPayloads.create_user() for _ in range(users)])
+            for user_id, model in created:
+                graph.users.append(GraphUser(id=user_id, model=model))
+
+        with allure.step(f"GRAPH: create {users * posts_per_user} posts"):
+            owners = [u for u in graph.users for _ in range(posts_per_user)]
+            created = self._level("post", self.posts_api, PostModel.model_validate,
+                                  self.posts_api.endpoints.create_post,
+                                  [PostPayloads.create_post(owner_id=o.id) for o in owners])
+            for owner, (post_id, model) in zip(owners, created):
+                owner.posts.append(GraphPost(id=post_id, model=model, owner_id=owner.id))
+
+        with allure.step(f"GRAPH: create {users * posts_per_user * comments_per_post} comments"):
+            targets = [
+                (post, graph.users[(i + j) % len(graph.users)].id)
+                for i, user in enumerate(graph.users)
+                for post in user.posts
+                for j in range(comments_per_post)
+            ]
+            created = self._level("comment", self.comments_api, CommentModel.model_validate,
+                                  self.comments_api.endpoints.create_comment,
+                                  [CommentPayloads.create_comment(owner_id=a, post_id=p.id) for p, a in targets])
+            for (post, author_id), (comment_id, model) in zip(targets, created):
+                post.comments.append(GraphComment(id=comment_id, model=model, post_id=post.id, owner_id=author_id))
+
+        for user in graph.users:
+            graph.users_by_id[user.id] = user
+            for post in user.posts:
+                graph.posts_by_id[post.id] = post
+                for comment in post.comments:
+                    graph.comments_by_id[comment.id] = comment
+        return graph
+
+    def cleanup(self) -> None:
+        """
+        Удаляет всё созданное: дети -> родители, каждый уровень параллельно. Уже удалённое (404) — не ошибка.
+        Ошибка удаления не прерывает уборку остальных сущностей — первая пробрасывается в конце.
+        """
+        urls: dict[str, tuple[ApiClient, Callable[[str], str]]] = {
+            "comment": (self.comments_api, self.comments_api.endpoints.delete_comment),
+            "post": (self.posts_api, self.posts_api.endpoints.post_by_id),
+            "user": (self.users_api, self.users_api.endpoints.delete_user),
+        }
+        with self._lock:
+            created, self._created = self._created, {"comment": [], "post": [], "user": []}
+        errors: list[BaseException] = []
+        for kind in ("comment", "post", "user"):
+            api, url = urls[kind]
+            results = self._send_all(api, "DELETE", [(url(entity_id), None) for entity_id in created[kind]])
+            for resp in results:
+                if isinstance(resp, BaseException):
+                    errors.append(resp)
+                    continue
+                api.attach_response_safe(resp)
+                if resp.status_code not in (200, 204, 404):
+                    errors.append(AssertionError(f"delete {kind}: {resp.status_code} {resp.text}"))
+        if errors:
+            raise errors[0]
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+import pytest
+from utils.json_stream import is_streamed
+from utils.request_timing import RequestTimings
+from utils.test_context import current_test
+from utils.transport import add_response_observer, remove_response_observer
+
+DEFAULT_MAX_FILE_BYTES = 50 * 1024 * 1024
+DEFAULT_QUEUE_SIZE = 100_000
+_BATCH = 1000
+_STOP = object()
+
+
+def error_code(body: Optional[bytes]) -> Optional[str]:
+    """Код ошибки DummyAPI из тела {"error": "..."}; None, если тела нет или оно не JSON."""
+    if not body:
+        return None
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+    return data.get("error") if isinstance(data, dict) else None
+
+
+class EventLog:
+    """
+    Журнал HTTP-запросов в NDJSON: одна строка — один запрос клиентов/RawHttp (наблюдатель транспорта).
+
+        {"ts": "...", "test": "tests/users/...::test_x", "phase": "call", "method": "GET", "route": "/user/{id}",
+         "status": 404, "error": "RESOURCE_NOT_FOUND", "latency_ms": 12.3, "ttfb_ms": 11.9,
+         "req_bytes": 310, "resp_bytes": 402, "reused": true, "worker": "gw0"}
+
+    Горячий путь (record, в потоке запроса) только кладёт кортеж в ограниченную очередь (put_nowait):
+    ни сериализации, ни диска. Если очередь переполнена — событие отбрасывается и считается в dropped,
+    но запрос никогда не ждёт журнал. JSON, разбор кода ошибки и запись делает фоновый поток пачками.
+
+    Файлы: <directory>/events-<worker>-<pid>-NNN.ndjson[.gz]; новый файл — когда в текущий записано
+    больше max_file_bytes (несжатых) байт.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+        compress: bool = False,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ):
+        self.directory = Path(directory)
+        self.max_file_bytes = max_file_bytes
+        self.compress = compress
+        self.worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+        self.written = 0
+        self.dropped = 0
+        self.files: list[Path] = []
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._file: Optional[BinaryIO] = None
+        self._file_bytes = 0
+
+    # ---------- горячий путь ----------
+
+    def record(self, timings: RequestTimings, response: Any = None) -> None:
+        nodeid, phase = current_test()
+        body = None
+        # тело ошибки уже прочитано и маленькое — код ошибки достанет фоновый поток
+        if timings.status_code is not None and timings.status_code >= 400 and not is_streamed(response):
+            body = getattr(response, "content", None)
+        try:
+            self._queue.put_nowait((timings, nodeid, phase, body))
+        except queue.Full:
+            self.dropped += 1
+
+    # ---------- жизненный цикл ----------
+
+    def start(self) -> EventLog:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+        self._thread.start()
+        add_response_observer(self.record)
+        return self
+
+    def close(self, timeout: float = 10) -> None:
+        """Отписывается от транспорта, дописывает очередь и закрывает файл."""
+        remove_response_observer(self.record)
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    # ---------- фоновая запись ----------
+
+    def _event(self, timings: RequestTimings, nodeid: Optional[str], phase: Optional[str], body: Any) -> dict:
+        return {
+            "ts": datetime.fromtimestamp(timings.started_at, timezone.utc).isoformat(timespec="milliseconds"),
+            "test": nodeid,
+            "phase": phase,
+            "method": timings.method,
+            "route": timings.route,
+            "status": timings.status_code,
+            "error": timings.error or error_code(body),  # класс исключения, если ответа нет
+            "latency_ms": round(timings.total * 1000, 3),
+            "ttfb_ms": round(timings.ttfb * 1000, 3),
+            "req_bytes": timings.bytes_sent,
+            "resp_bytes": timings.bytes_received,
+            "reused": timings.reused,
+            "worker": self.worker,
+        }
+
+    def _open_next(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        suffix = ".ndjson.gz" if self.compress else ".ndjson"
+        path = self.directory / f"events-{self.worker}-{os.getpid()}-{len(self.files):03d}{suffix}"
+        self._file = gzip.open(path, "wb", compresslevel=5) if self.compress else open(path, "wb")
+        self._file_bytes = 0
+        self.files.append(path)
+
+    def _write(self, items: list) -> None:
+        for item in items:
+            line = json.dumps(self._event(*item), ensure_ascii=False).encode() + b"\n"
+            if self._file is None or self._file_bytes >= self.max_file_bytes:
+                self._open_next()
+            self._file.write(line)
+            self._file_bytes += len(line)
+            self.written += 1
+        self._file.flush()
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            items = []
+            item = self._queue.get()
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                items.append(item)
+                if len(items) >= _BATCH:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if items:
+                self._write(items)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class EventLogPlugin:
+    """pytest-плагин: журнал запросов на весь прогон (--event-log DIR / env EVENT_LOG_DIR)."""
+
+    def __init__(self, directory: str | Path, compress: bool = False, max_file_bytes: int = DEFAULT_MAX_FILE_BYTES):
+        self.log = EventLog(directory, max_file_bytes=max_file_bytes, compress=compress).start()
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        # trylast — после teardown session-фикстур: их запросы (cleanup) тоже попадают в журнал
+        self.log.close()
+
+    def pytest_unconfigure(self, config):
+        self.log.close()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        log = self.log
+        terminalreporter.write_line(
+            f"event log: {log.written} events -> {log.directory} ({len(log.files)} files, {log.dropped} dropped)"
+        )
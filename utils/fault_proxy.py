@@ -0,0 +1,402 @@
+"""
+Локальный прокси между клиентами / RawHttp и HOST с инъекцией сетевых сбоев.
+
+Настоящий интернет не даёт воспроизвести медленную сеть по заказу: проверить DEFAULT_TIMEOUT,
+реакцию на пачку 429/5xx или оборванное тело можно только "повезёт — не повезёт".
+FaultProxy принимает запросы на 127.0.0.1, пересылает их в HOST и по правилам (FaultRule) для роута:
+- задерживает ответ (Latency: fixed / uniform / normal / lognormal)
+- отдаёт тело ответа с ограничением полосы (bandwidth, байт/сек)
+- рвёт соединение без ответа (reset — TCP RST)
+- отдаёт заголовки с полным Content-Length, но только половину тела (truncate)
+- отвечает 429/5xx вместо HOST (status={429: 0.2, 503: 0.05}), без похода в HOST
+
+Решения принимаются генератором random.Random(seed) в порядке прихода запросов,
+а вероятности 1.0 + times=N дают полностью детерминированный сценарий ("первые 2 ответа — 503").
+
+Из кода / фикстуры fault_proxy:
+    with FaultProxy(upstream=base_url, seed=1) as proxy:
+        proxy.inject(route="/user/{id}", method="GET", latency=Latency.fixed(500))
+        UsersAPI(session, UserEndpoints(proxy.base_url), timeout=0.2)
+"""
+from __future__ import annotations
+
+import http.client
+import json
+import random
+import socket
+import struct
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlsplit
+from utils.routes import route_template
+
+UPSTREAM_TIMEOUT = 30  # сек: прокси не должен ждать HOST дольше любого разумного клиентского таймаута
+BANDWIDTH_TICKS = 20   # на сколько порций в секунду резать тело при ограничении полосы
+
+# Заголовки одного "хопа" — их не пересылаем (RFC 7230, 6.1); длину тела прокси выставляет сам
+_HOP_BY_HOP = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te", "trailer",
+    "transfer-encoding", "upgrade", "host", "content-length",
+}
+_ERRORS = {429: "TOO_MANY_REQUESTS", 502: "BAD_GATEWAY"}
+
+
+@dataclass(frozen=True)
+class Latency:
+    """
+    Распределение задержки ответа, параметры в миллисекундах.
+
+    lognormal(median, sigma) — "длинный хвост", как у настоящей сети: большинство ответов около медианы,
+    редкие — в разы дольше.
+    """
+
+    kind: str
+    a: float
+    b: float = 0.0
+
+    @classmethod
+    def fixed(cls, ms: float) -> "Latency":
+        return cls("fixed", ms)
+
+    @classmethod
+    def uniform(cls, low_ms: float, high_ms: float) -> "Latency":
+        return cls("uniform", low_ms, high_ms)
+
+    @classmethod
+    def normal(cls, mean_ms: float, sd_ms: float) -> "Latency":
+        return cls("normal", mean_ms, sd_ms)
+
+    @classmethod
+    def lognormal(cls, median_ms: float, sigma: float) -> "Latency":
+        return cls("lognormal", median_ms, sigma)
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        """'200' / 'fixed:200' / 'uniform:100-300' / 'normal:200,50' / 'lognormal:150,0.8' (для CLI и env)."""
+        kind, _, params = spec.partition(":") if ":" in spec else ("fixed", "", spec)
+        values = [float(x) for x in params.replace("-", ",").split(",") if x.strip()]
+        if kind not in ("fixed", "uniform", "normal", "lognormal") or len(values) != (1 if kind == "fixed" else 2):
+            raise ValueError(f"bad latency spec: {spec!r}")
+        return cls(kind, *values)
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{self.a:g}" + (f",{self.b:g}" if self.kind != "fixed" else "")
+
+    def sample(self, rng: random.Random) -> float:
+        """Задержка в секундах (не отрицательная)."""
+        if self.kind == "uniform":
+            ms = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            ms = rng.gauss(self.a, self.b)
+        elif self.kind == "lognormal":
+            ms = self.a * rng.lognormvariate(0.0, self.b)
+        else:
+            ms = self.a
+        return max(ms, 0.0) / 1000
+
+
+@dataclass
+class FaultRule:
+    """
+    Сбои для запросов, подходящих под route / method.
+
+    route — шаблон роута, как в метриках (route_template): "/user/{id}", "/post/{id}/comment";
+            допускаются маски fnmatch ("/user*"), "*" — любой роут.
+    status — {код: вероятность}: ответить этим кодом вместо HOST (429 получает Retry-After, если задан).
+    reset / truncate — вероятности оборвать соединение до ответа / посреди тела.
+    times — правило срабатывает на первых N подходящих запросах, потом выключается (None — без ограничения).
+    """
+
+    route: str = "*"
+    method: str = "*"
+    latency: Optional[Latency] = None
+    bandwidth: Optional[int] = None
+    reset: float = 0.0
+    truncate: float = 0.0
+    status: dict[int, float] = field(default_factory=dict)
+    retry_after: Optional[float] = None
+    times: Optional[int] = None
+    hits: int = 0
+
+    def matches(self, method: str, route: str) -> bool:
+        if self.times is not None and self.hits >= self.times:
+            return False
+        return fnmatchcase(method, self.method.upper()) and (route == self.route or fnmatchcase(route, self.route))
+
+
+@dataclass(frozen=True)
+class Decision:
+    """Что прокси сделает с конкретным запросом: решение принимается целиком до пересылки."""
+
+    fault: str = "pass"  # pass / reset / truncate / status
+    delay: float = 0.0
+    status: Optional[int] = None
+    retry_after: Optional[float] = None
+    bandwidth: Optional[int] = None
+
+
+@dataclass
+class ProxyEvent:
+    """
+    Запись журнала о запросе. Попадает в журнал в decide(), до того как клиенту что-то отправлено:
+    к моменту, когда клиент увидел ответ / RST, событие уже в журнале, а clear() следующего теста
+    не получит "запоздавшее" событие предыдущего. status (ответ клиенту) дописывается по ходу обработки.
+    """
+
+    method: str
+    route: str
+    fault: str
+    status: Optional[int]
+    delay: float
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive к клиенту: прокси не добавляет лишних TCP-handshake
+    disable_nagle_algorithm = True
+    proxy: "FaultProxy"
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 - сигнатура BaseHTTPRequestHandler
+        pass
+
+    def setup(self) -> None:
+        super().setup()
+        self._upstream: Optional[http.client.HTTPConnection] = None  # одно соединение к HOST на соединение клиента
+
+    def finish(self) -> None:
+        if self._upstream is not None:
+            self._upstream.close()
+        super().finish()
+
+    # ---------- пересылка ----------
+
+    def _exchange(self, method: str, body: bytes, headers: dict) -> tuple[int, list[tuple[str, str]], bytes]:
+        if self._upstream is None:
+            self._upstream = self.proxy.connect_upstream()
+        try:
+            self._upstream.request(method, self.path, body=body or None, headers=headers)
+            resp = self._upstream.getresponse()
+            data = resp.read()
+        except (http.client.HTTPException, OSError):
+            self._upstream.close()
+            self._upstream = None
+            raise
+        if resp.will_close:
+            self._upstream.close()
+            self._upstream = None
+        # Server / Date прокси ставит сам (send_response) — не дублируем
+        skip = _HOP_BY_HOP | {"server", "date"}
+        return resp.status, [(k, v) for k, v in resp.getheaders() if k.lower() not in skip], data
+
+    def _forward(self, method: str, body: bytes) -> tuple[int, list[tuple[str, str]], bytes]:
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in _HOP_BY_HOP}
+        if body:
+            headers["Content-Length"] = str(len(body))
+        reused = self._upstream is not None
+        try:
+            return self._exchange(method, body, headers)
+        except (http.client.HTTPException, OSError):
+            if not reused:
+                raise
+        # HOST мог закрыть простаивавшее keep-alive соединение — одна попытка на свежем
+        return self._exchange(method, body, headers)
+
+    # ---------- ответ клиенту ----------
+
+    def _send(self, status: int, headers: list[tuple[str, str]], data: bytes, decision: Decision,
+              head: bool = False) -> None:
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if head:
+            return
+        if decision.fault == "truncate":
+            self.wfile.write(data[: len(data) // 2])
+            self.wfile.flush()
+            self.close_connection = True  # клиент ждёт остаток по Content-Length и получает EOF
+            return
+        if not decision.bandwidth:
+            self.wfile.write(data)
+            return
+        chunk = max(decision.bandwidth // BANDWIDTH_TICKS, 1)
+        for start in range(0, len(data), chunk):
+            piece = data[start:start + chunk]
+            self.wfile.write(piece)
+            self.wfile.flush()
+            if self.proxy.sleep(len(piece) / decision.bandwidth):
+                return
+
+    def _reset(self) -> None:
+        # SO_LINGER(on, 0): close() отправляет RST вместо FIN — клиент видит "connection reset by peer"
+        # Закрываем сами: socketserver перед close() делает shutdown(SHUT_WR), а это вежливый FIN
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        self.connection.close()
+        self.close_connection = True
+
+    def _handle(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        route = route_template(self.path)
+        decision, event = self.proxy.decide(method, route)
+        try:
+            if decision.delay and self.proxy.sleep(decision.delay):
+                return
+            if decision.fault == "reset":
+                self._reset()
+            elif decision.fault == "status":
+                status = decision.status
+                payload = json.dumps({"error": _ERRORS.get(status, "SERVER_ERROR")}).encode()
+                headers = [("Content-Type", "application/json; charset=utf-8"), ("X-Fault", "status")]
+                if decision.retry_after is not None:
+                    headers.append(("Retry-After", f"{decision.retry_after:g}"))
+                self._send(status, headers, payload, decision, head=method == "HEAD")
+            else:
+                try:
+                    status, headers, data = self._forward(method, body)
+                except (http.client.HTTPException, OSError):
+                    decision = Decision(fault="upstream_error")
+                    status, headers, data = 502, [("Content-Type", "application/json; charset=utf-8")], \
+                        json.dumps({"error": _ERRORS[502]}).encode()
+                    self.proxy.update(event, fault=decision.fault)
+                # исход дописываем ДО отправки: после ответа клиент вправе сразу читать stats
+                self.proxy.update(event, status=status)
+                self._send(status, headers, data, decision, head=method == "HEAD")
+        except OSError:
+            # клиент ушёл по своему таймауту раньше, чем прокси ответил, — это и есть проверяемый сценарий
+            self.close_connection = True
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_HEAD(self) -> None:
+        self._handle("HEAD")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_PUT(self) -> None:
+        self._handle("PUT")
+
+    def do_PATCH(self) -> None:
+        self._handle("PATCH")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+
+class FaultProxy:
+    """
+    Прокси в фоновом потоке. base_url — адрес прокси с путём upstream (…/data/v1), его отдают клиентам вместо HOST.
+
+    Правила задаются на лету (inject / add_rule / clear) — из теста, пока прокси работает.
+    Правила проверяются от последнего добавленного к первому, применяется одно — первое подходящее:
+    так тест может поверх общего "фона" (lognormal-задержка на всё) добавить точечный сбой.
+    events / stats — что прокси сделал с каждым запросом (для проверок в тестах).
+    """
+
+    def __init__(self, upstream: str, host: str = "127.0.0.1", port: int = 0, seed: Optional[int] = 0):
+        split = urlsplit(upstream.rstrip("/"))
+        if split.scheme not in ("http", "https") or not split.netloc:
+            raise ValueError(f"upstream must be an http(s) URL, got {upstream!r}")
+        self.upstream = split
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.rules: list[FaultRule] = []
+        self.events: list[ProxyEvent] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        handler = type("FaultProxyHandler", (_Handler,), {"proxy": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}{self.upstream.path}"
+
+    # ---------- сценарий сбоев ----------
+
+    def add_rule(self, rule: FaultRule) -> FaultRule:
+        with self._lock:
+            self.rules.append(rule)
+        return rule
+
+    def inject(self, route: str = "*", method: str = "*", **faults) -> FaultRule:
+        """inject(route="/user/{id}", method="GET", status={503: 1.0}, times=2) — поля см. FaultRule."""
+        return self.add_rule(FaultRule(route=route, method=method, **faults))
+
+    def clear(self) -> None:
+        """Убрать все правила, журнал и заново засеять генератор (между тестами)."""
+        with self._lock:
+            self.rules.clear()
+            self.events.clear()
+            self.rng.seed(self.seed)
+
+    @property
+    def stats(self) -> Counter:
+        """Число запросов по исходу: pass / reset / truncate / status / upstream_error."""
+        with self._lock:
+            return Counter(event.fault for event in self.events)
+
+    def decide(self, method: str, route: str) -> tuple[Decision, ProxyEvent]:
+        """Решение по запросу и его событие — событие записывается в журнал сразу, под той же блокировкой."""
+        with self._lock:
+            decision = self._decide(method, route)
+            event = ProxyEvent(method, route, decision.fault,
+                               decision.status if decision.fault == "status" else None, decision.delay)
+            self.events.append(event)
+            return decision, event
+
+    def _decide(self, method: str, route: str) -> Decision:
+        rule = next((r for r in reversed(self.rules) if r.matches(method, route)), None)
+        if rule is None:
+            return Decision()
+        rule.hits += 1
+        delay = rule.latency.sample(self.rng) if rule.latency else 0.0
+        if rule.reset and self.rng.random() < rule.reset:
+            return Decision(fault="reset", delay=delay)
+        for status, rate in rule.status.items():
+            if self.rng.random() < rate:
+                return Decision(fault="status", delay=delay, status=status,
+                                retry_after=rule.retry_after if status == 429 else None)
+        if rule.truncate and self.rng.random() < rule.truncate:
+            return Decision(fault="truncate", delay=delay)
+        return Decision(delay=delay, bandwidth=rule.bandwidth)
+
+    def update(self, event: ProxyEvent, **fields) -> None:
+        """Дописать исход в событие журнала (status ответа, upstream_error)."""
+        with self._lock:
+            for name, value in fields.items():
+                setattr(event, name, value)
+
+    # ---------- инфраструктура ----------
+
+    def connect_upstream(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.upstream.scheme == "https" else http.client.HTTPConnection
+        return cls(self.upstream.netloc, timeout=UPSTREAM_TIMEOUT)
+
+    def sleep(self, seconds: float) -> bool:
+        """Пауза, которую прерывает stop(); True — прокси останавливается, запрос бросаем."""
+        return self._stopped.wait(seconds)
+
+    def start(self) -> "FaultProxy":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fault-proxy", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()  # будит потоки, "висящие" в задержке
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "FaultProxy":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
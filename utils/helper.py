@@ -5,6 +5,8 @@ from typing import Any
 import allure
 import requests
 from allure_commons.types import AttachmentType
+from utils.instrumentation import attach_hook
+from utils.json_stream import is_streamed
 
 
 class Helper:
@@ -37,6 +39,7 @@ class Helper:
         """Прикрепляет текст в Allure."""
         allure.attach(body=text, name=name, attachment_type=AttachmentType.TEXT)
 
+    @attach_hook
     def attach_response_safe(self, response: requests.Response) -> None:
         """
         Прикрепляет request+response в Allure "безопасно".
@@ -91,6 +94,12 @@ class Helper:
             self.attach_text(str(e), name="API Response Meta (attach failed)")
 
         # -------------------- RESPONSE BODY --------------------
+        # Потоковый ответ (session.stream = True) не читаем целиком ради вложения — иначе теряется
+        # смысл потокового разбора. Тело ошибки маленькое и нужно для диагностики — его читаем.
+        if is_streamed(response) and response.status_code < 400:
+            self.attach_text("streamed response: body is parsed incrementally and not attached",
+                             name="API Response Body (streamed)")
+            return
         try:
             self.attach_response(response.json(), name="API Response Body")
         except Exception:
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import json
+import time
+from datetime import timedelta
+from typing import Any, Optional
+import requests
+from requests.structures import CaseInsensitiveDict
+from utils.rate_limiter import RateLimiter, get_rate_limiter
+from utils.request_timing import RequestTimings
+from utils.routes import route_template
+from utils.transport import error_timings, notify_response_observers
+
+try:  # httpx[http2] — опциональная зависимость, нужна только для HTTP_TRANSPORT=http2
+    import httpx
+except ImportError:  # pragma: no cover - зависит от окружения
+    httpx = None
+
+
+def _requests_error(error: "httpx.HTTPError", reading_body: bool = False) -> requests.RequestException:
+    """
+    Ошибка httpx -> эквивалент из requests.exceptions, как их выбрасывает сам requests:
+    вызывающий код (и tests/test_fault_injection.py) ловит requests.exceptions.* при любом транспорте.
+    reading_body — ошибка при чтении тела уже полученного ответа: обрыв -> ChunkedEncodingError,
+    таймаут -> ConnectionError (как у requests в Response.content).
+    """
+    message = str(error) or type(error).__name__
+    if isinstance(error, httpx.DecodingError):
+        return requests.exceptions.ContentDecodingError(message)
+    if reading_body:
+        if isinstance(error, httpx.TimeoutException):
+            return requests.exceptions.ConnectionError(message)
+        if isinstance(error, httpx.TransportError):
+            return requests.exceptions.ChunkedEncodingError(message)
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.exceptions.ConnectTimeout(message)
+    if isinstance(error, httpx.ReadTimeout):
+        return requests.exceptions.ReadTimeout(message)
+    if isinstance(error, httpx.TimeoutException):
+        return requests.exceptions.Timeout(message)
+    if isinstance(error, httpx.ProxyError):
+        return requests.exceptions.ProxyError(message)
+    if isinstance(error, httpx.UnsupportedProtocol):
+        return requests.exceptions.InvalidSchema(message)
+    if isinstance(error, httpx.TooManyRedirects):
+        return requests.exceptions.TooManyRedirects(message)
+    if isinstance(error, httpx.TransportError):  # ConnectError / ReadError / RemoteProtocolError / ...
+        return requests.exceptions.ConnectionError(message)
+    return requests.exceptions.RequestException(message)
+
+
+class Http2Request:
+    """
+    Вид запроса "как у requests.PreparedRequest": method / url / headers / body.
+    Нужен, чтобы Helper.attach_response_safe работал без изменений.
+    """
+
+    def __init__(self, request: "httpx.Request"):
+        self.method = request.method
+        self.url = str(request.url)
+        self.headers = dict(request.headers)
+        self.body = request.content or None
+
+
+class Http2Response:
+    """
+    Обёртка над httpx.Response с интерфейсом requests.Response, которым пользуются клиенты и тесты:
+    status_code / headers / text / content / json() / request / elapsed / url / ok / raise_for_status().
+    """
+
+    def __init__(self, response: "httpx.Response"):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = CaseInsensitiveDict(response.headers)
+        self.request = Http2Request(response.request)
+        self.url = str(response.url)
+        self.reason = response.reason_phrase
+        self.http_version = response.http_version
+        self.elapsed: timedelta = response.elapsed
+        self.timings: Optional[RequestTimings] = None  # заполняет Http2Session.request
+
+    @property
+    def content(self) -> bytes:
+        return self._response.content
+
+    @property
+    def text(self) -> str:
+        return self._response.text
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self, **kwargs) -> Any:
+        return json.loads(self._response.content, **kwargs)
+
+    def raise_for_status(self) -> None:
+        """Как у requests: 4xx/5xx -> requests.HTTPError с response=self."""
+        if 400 <= self.status_code < 600:
+            kind = "Client" if self.status_code < 500 else "Server"
+            raise requests.HTTPError(f"{self.status_code} {kind} Error: {self.reason} for url: {self.url}",
+                                     response=self)
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class Http2Session:
+    """
+    HTTP/2-транспорт с интерфейсом requests.Session (get/post/put/delete/request/headers/close).
+
+    Все параллельные запросы к одному хосту идут отдельными stream'ами ОДНОГО TCP+TLS соединения
+    (мультиплексирование HTTP/2), вместо пула из N соединений у requests/HTTP1.1.
+    Если сервер не умеет h2 (ALPN), httpx прозрачно откатится на HTTP/1.1.
+
+    Как и ApiSession, каждый запрос проходит через общий RateLimiter.
+    Ошибки httpx пробрасываются как их эквиваленты из requests.exceptions (ReadTimeout, ConnectionError,
+    ChunkedEncodingError, ...) — код, который ловит requests.RequestException, работает с обоими транспортами.
+    Включается через HTTP_TRANSPORT=http2 (см. utils/transport.make_session).
+    """
+
+    def __init__(self, limiter: Optional[RateLimiter] = None, max_connections: int = 10):
+        if httpx is None:
+            raise RuntimeError('HTTP/2 transport requires httpx: pip install "httpx[http2]"')
+
+        self.limiter = limiter
+        # Заголовки "по умолчанию" — как session.headers у requests (conftest делает headers.update(...))
+        self.headers: CaseInsensitiveDict = CaseInsensitiveDict()
+        # Сколько TCP-соединений реально открыто (считаем по trace-событиям httpcore) — нужно бенчмарку
+        self.connections_opened = 0
+        self._client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    def _tracer(self, events: dict[str, float]):
+        """
+        trace-колбэк httpcore для одного запроса: запоминает момент каждого события
+        ("connection.connect_tcp.started", "http2.receive_response_headers.complete", ...).
+        """
+        def trace(event_name: str, info: dict) -> None:
+            events.setdefault(event_name, time.perf_counter())
+            if event_name == "connection.connect_tcp.complete":
+                self.connections_opened += 1
+        return trace
+
+    @staticmethod
+    def _timings(resp: "httpx.Response", events: dict[str, float], started_at: float) -> RequestTimings:
+        def phase(prefix: str, first: str = "started", last: str = "complete") -> Optional[float]:
+            # Событие HTTP-уровня может быть http11.* или http2.* — смотря что выбрал ALPN
+            for proto in ("http2", "http11", "connection"):
+                begin, end = events.get(f"{proto}.{prefix}.{first}"), events.get(f"{proto}.{prefix}.{last}")
+                if begin is not None and end is not None:
+                    return end - begin
+            return None
+
+        ttfb = None
+        for proto in ("http2", "http11"):
+            begin = events.get(f"{proto}.send_request_headers.started")
+            end = events.get(f"{proto}.receive_response_headers.complete")
+            if begin is not None and end is not None:
+                ttfb = end - begin
+                break
+
+        request = resp.request
+        request_headers = sum(len(k) + len(v) + 4 for k, v in request.headers.raw)
+        response_headers = sum(len(k) + len(v) + 4 for k, v in resp.headers.raw)
+        reused = "connection.connect_tcp.complete" not in events
+        return RequestTimings(
+            method=request.method,
+            url=str(request.url),
+            route=route_template(str(request.url)),
+            status_code=resp.status_code,
+            started_at=started_at,
+            dns=None,  # httpcore резолвит внутри connect_tcp — DNS входит в connect
+            connect=None if reused else phase("connect_tcp"),
+            tls=None if reused else phase("start_tls"),
+            ttfb=ttfb if ttfb is not None else resp.elapsed.total_seconds(),
+            download=phase("receive_response_body"),
+            bytes_sent=request_headers + len(request.content or b""),
+            bytes_received=response_headers + resp.num_bytes_downloaded,
+            reused=reused,
+        )
+
+    def _send(self, request: "httpx.Request") -> "httpx.Response":
+        """
+        Отправка и чтение тела; ошибки httpx -> requests.exceptions.
+        stream=True + read(): ошибку до заголовков ответа и ошибку чтения тела requests различает
+        (ConnectionError / ChunkedEncodingError) — различаем и мы.
+        """
+        try:
+            resp = self._client.send(request, stream=True)
+        except httpx.HTTPError as e:
+            raise _requests_error(e) from e
+        try:
+            resp.read()
+        except httpx.HTTPError as e:
+            raise _requests_error(e, reading_body=True) from e
+        finally:
+            resp.close()  # соединение — обратно в пул; заодно фиксирует resp.elapsed
+        return resp
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+        json: Any = None,
+        headers: dict | None = None,
+        timeout: float | None = None,
+        data: Any = None,
+    ) -> Http2Response:
+        merged = dict(self.headers)
+        if headers:
+            merged.update(headers)
+
+        limiter = self.limiter or get_rate_limiter()
+        events: dict[str, float] = {}
+        started_at = time.time()
+        request = self._client.build_request(
+            method=method,
+            url=url,
+            params=params,
+            json=json,
+            content=data,
+            headers=merged,
+            timeout=timeout,
+            extensions={"trace": self._tracer(events)},
+        )
+        with limiter.slot() as slot:
+            try:
+                resp = self._send(request)
+            except Exception as e:
+                error = e
+            else:
+                error = None
+                slot.record(resp.status_code)
+        if error is not None:
+            elapsed = time.perf_counter() - slot.started
+            notify_response_observers(error_timings(request.method, str(request.url), started_at, elapsed, error), None)
+            raise error
+        result = Http2Response(resp)
+        result.timings = self._timings(resp, events, started_at)
+        notify_response_observers(result.timings, result)
+        return result
+
+    def get(self, url: str, **kwargs) -> Http2Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> Http2Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> Http2Response:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> Http2Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self) -> None:
+        self._client.close()
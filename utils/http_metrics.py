@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import statistics
+import threading
+from typing import Any, Optional
+from utils.request_timing import RequestTimings
+from utils.transport import add_response_observer, remove_response_observer
+
+_PHASES = ("dns", "connect", "tls", "ttfb", "download")
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class HttpMetrics:
+    """
+    Сборщик RequestTimings всех запросов процесса (подписывается на ответы транспорта).
+
+    Агрегирует по (метод, шаблон роута, cold/warm/error): холодные запросы (новое соединение: DNS + TCP + TLS)
+    и тёплые (по уже открытому соединению) считаются отдельно — иначе p95 тёплых "портят" handshake'и.
+    Запросы, упавшие без ответа (таймаут, обрыв), — группа error.
+    """
+
+    def __init__(self) -> None:
+        self._samples: dict[tuple[str, str, str], list[RequestTimings]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, timings: RequestTimings, response: Any = None) -> None:
+        # Упавшие без ответа (таймаут, обрыв) — отдельной группой: не смешиваем их время с нормальными ответами
+        kind = "error" if timings.error else "warm" if timings.reused else "cold"
+        key = (timings.method, timings.route, kind)
+        with self._lock:
+            self._samples.setdefault(key, []).append(timings)
+
+    def start(self) -> None:
+        add_response_observer(self.record)
+
+    def stop(self) -> None:
+        remove_response_observer(self.record)
+
+    def rows(self) -> list[dict]:
+        """Сводка по каждой группе: count, p50/p95 total, средние фазы (мс), байты."""
+        with self._lock:
+            groups = {key: list(samples) for key, samples in self._samples.items()}
+
+        rows = []
+        for (method, route, kind), samples in sorted(groups.items()):
+            totals = [t.total for t in samples]
+            row = {
+                "method": method,
+                "route": route,
+                "kind": kind,
+                "count": len(samples),
+                "p50_ms": statistics.median(totals) * 1000,
+                "p95_ms": _percentile(totals, 0.95) * 1000,
+                "bytes_sent": sum(t.bytes_sent for t in samples),
+                "bytes_received": sum(t.bytes_received for t in samples),
+            }
+            for phase in _PHASES:
+                values = [getattr(t, phase) for t in samples if getattr(t, phase) is not None]
+                row[f"{phase}_ms"] = statistics.fmean(values) * 1000 if values else None
+            rows.append(row)
+        return rows
+
+    def format_table(self) -> list[str]:
+        def ms(value: Optional[float]) -> str:
+            return f"{value:>8.1f}" if value is not None else f"{'-':>8}"
+
+        lines = [
+            f"{'method':<7}{'route':<28}{'kind':<6}{'n':>5}{'p50':>8}{'p95':>8}"
+            f"{'dns':>8}{'connect':>8}{'tls':>8}{'ttfb':>8}{'download':>9}{'sent,B':>10}{'recv,B':>10}"
+        ]
+        for r in self.rows():
+            lines.append(
+                f"{r['method']:<7}{r['route']:<28}{r['kind']:<6}{r['count']:>5}{r['p50_ms']:>8.1f}{r['p95_ms']:>8.1f}"
+                f"{ms(r['dns_ms'])}{ms(r['connect_ms'])}{ms(r['tls_ms'])}{ms(r['ttfb_ms'])} {ms(r['download_ms'])}"
+                f"{r['bytes_sent']:>10}{r['bytes_received']:>10}"
+            )
+        return lines
+
+
+class HttpMetricsPlugin:
+    """
+    pytest-плагин: в конце прогона печатает пофазную статистику HTTP по роутам (флаг --http-report).
+    Времена фаз — средние в мс, p50/p95 — по полному времени запроса.
+    """
+
+    def __init__(self) -> None:
+        self.metrics = HttpMetrics()
+        self.metrics.start()
+
+    def pytest_unconfigure(self, config):
+        self.metrics.stop()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        tr = terminalreporter
+        tr.write_sep("=", "http timing per route (ms; cold = new connection, warm = reused, error = no response)")
+        rows = self.metrics.format_table()
+        if len(rows) == 1:
+            tr.write_line("no HTTP requests recorded")
+            return
+        for line in rows:
+            tr.write_line(line)
+
+        from utils.visibility import visibility_metrics
+        if visibility_metrics.rows():
+            tr.write_sep("=", "list visibility lag per route (ms; wait_*_visible_* polls)")
+            for line in visibility_metrics.format_table():
+                tr.write_line(line)
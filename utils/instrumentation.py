@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import functools
+import os
+import threading
+from typing import Any, Callable, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+FULL = "full"
+FAILURES = "failures"
+OFF = "off"
+LEVELS = (FULL, FAILURES, OFF)
+
+_level: str | None = None
+
+
+def level() -> str:
+    """
+    Уровень инструментирования клиентов — определяется ОДИН раз (env INSTRUMENTATION, по умолчанию full):
+    - full     — allure-шаги и вложения request/response на каждый запрос (как раньше)
+    - failures — шаги есть, вложения копятся в буфере теста и попадают в отчёт, только если тест упал
+    - off      — шаги и вложения отключены совсем (нагрузка, бенчмарки)
+
+    Декораторы step()/attach_hook() применяются при импорте классов клиентов, поэтому уровень нужно
+    задать ДО их импорта: через env или pytest --instrumentation (pytest_configure, до фикстур).
+    """
+    global _level
+    if _level is None:
+        value = os.getenv("INSTRUMENTATION", FULL).strip().lower() or FULL
+        if value not in LEVELS:
+            raise ValueError(f"Unknown INSTRUMENTATION: {value!r} (expected one of {LEVELS})")
+        _level = value
+    return _level
+
+
+def step(title: str) -> Callable[[F], F]:
+    """
+    Замена @allure.step для методов клиентов. На уровне off возвращает ИСХОДНУЮ функцию —
+    никакой обёртки, контекст-менеджера и форматирования заголовка на вызов.
+    """
+    if level() == OFF:
+        return lambda fn: fn
+    import allure  # лениво: conftest импортирует модуль ради плагина ещё до фикстур
+    return allure.step(title)
+
+
+# ---------- отложенные вложения (уровень failures) ----------
+
+_pending: list[tuple[Callable[..., Any], tuple, dict]] = []
+_pending_lock = threading.Lock()
+
+
+def _noop(*args: Any, **kwargs: Any) -> None:
+    return None
+
+
+def attach_hook(fn: F) -> F:
+    """
+    Декоратор функции-вложения (Helper.attach_response_safe):
+    - full     — вызывается сразу
+    - failures — вызов откладывается (в буфер кладутся только ссылки, форматирования нет)
+    - off      — настоящий no-op
+    """
+    current = level()
+    if current == OFF:
+        return _noop  # type: ignore[return-value]
+    if current == FULL:
+        return fn
+
+    @functools.wraps(fn)
+    def deferred(*args: Any, **kwargs: Any) -> None:
+        with _pending_lock:
+            _pending.append((fn, args, kwargs))
+
+    return deferred  # type: ignore[return-value]
+
+
+def flush_pending() -> None:
+    """Выполняет отложенные вложения (в текущий allure-контекст) и очищает буфер."""
+    with _pending_lock:
+        pending = _pending[:]
+        _pending.clear()
+    for fn, args, kwargs in pending:
+        fn(*args, **kwargs)
+
+
+def discard_pending() -> None:
+    with _pending_lock:
+        _pending.clear()
+
+
+class InstrumentationPlugin:
+    """
+    pytest-плагин уровня failures: если фаза теста упала — отложенные вложения уходят в отчёт
+    (тест в allure в этот момент ещё открыт), после teardown буфер очищается.
+    На уровнях full/off буфер всегда пуст, и хуки ничего не делают.
+    """
+
+    def pytest_runtest_setup(self, item) -> None:
+        discard_pending()
+
+    def pytest_runtest_logreport(self, report) -> None:
+        if report.failed:
+            flush_pending()
+        elif report.when == "teardown":
+            discard_pending()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Optional
+from pydantic import ValidationInfo
+from services.users.user_model import FrozenUserModel
+
+OWNER_INTERNER_KEY = "owner_interner"
+
+
+class OwnerInterner:
+    """
+    Интернирование владельцев (owner) при валидации постов и комментариев.
+
+    В списках DummyAPI каждый элемент несёт полное превью владельца, и на странице из 50 постов
+    один и тот же пользователь разбирается и хранится десятки раз. С интернером одинаковые превью
+    (тот же id и те же поля) превращаются в ОДИН общий FrozenUserModel.
+
+    Включается явно, через контекст валидации:
+        interner = OwnerInterner()
+        posts_api.list_posts(limit=50, interner=interner)                    # на страницу
+        PostModel.model_validate(item, context=interner.context())           # вручную
+
+    Область жизни задаёт вызывающий: новый интернер на страницу или один на весь обход/сессию.
+    Если превью с тем же id отличается (пользователя обновили посреди обхода) — создаётся новый
+    экземпляр, и дальше переиспользуется уже он.
+    Без блокировок: гонка двух потоков даёт максимум лишний экземпляр, а не ошибку.
+    """
+
+    def __init__(self) -> None:
+        self._owners: dict[str, tuple[dict, FrozenUserModel]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def context(self) -> dict:
+        return {OWNER_INTERNER_KEY: self}
+
+    def intern(self, raw: dict) -> FrozenUserModel:
+        owner_id = raw.get("id")
+        cached = self._owners.get(owner_id)
+        if cached is not None and cached[0] == raw:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        owner = FrozenUserModel.model_validate(raw)
+        if owner_id is not None:
+            self._owners[owner_id] = (raw, owner)
+        return owner
+
+    def clear(self) -> None:
+        self._owners.clear()
+
+
+def intern_owner(value: Any, handler: Callable[[Any], Any], info: ValidationInfo) -> Any:
+    """Тело wrap-валидатора поля owner: без интернера в контексте — обычная валидация."""
+    interner: Optional[OwnerInterner] = (info.context or {}).get(OWNER_INTERNER_KEY)
+    if interner is None or not isinstance(value, dict):
+        return handler(value)
+    return interner.intern(value)
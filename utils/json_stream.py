@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import codecs
+import json
+import os
+import re
+from collections import deque
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_BODY_BYTES = 64 * 1024 * 1024
+ITEMS_KEY = "data"
+
+_WS = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9eE.+\-]*")  # символы, которыми может продолжаться число JSON
+_DECODER = json.JSONDecoder()
+
+
+class ResponseTooLarge(Exception):
+    """Тело ответа больше разрешённого max_bytes — чтение прервано, соединение закрыто."""
+
+
+def max_body_bytes() -> int:
+    """Лимит тела потокового ответа: env JSON_STREAM_MAX_BYTES (0 — без лимита), по умолчанию 64 MiB."""
+    return int(os.getenv("JSON_STREAM_MAX_BYTES", str(DEFAULT_MAX_BODY_BYTES)))
+
+
+def is_streamed(response: Any) -> bool:
+    """
+    Тело ответа ещё не прочитано (session.stream = True у requests).
+    У requests.Response до первого чтения _content is False; у Http2Response тело всегда прочитано.
+    """
+    return getattr(response, "_content", None) is False
+
+
+class StreamedList:
+    """
+    Инкрементальный разбор списочного ответа {"data": [...], "total": N, "page": P, "limit": L}
+    прямо из сокета, чанк за чанком (response.iter_content) — без полного тела и полного дерева dict'ов.
+
+        stream = StreamedList(resp)          # resp получен с stream=True
+        for item in stream:                  # элементы "data" по одному, по мере прихода
+            ...
+        stream.total, stream.page, stream.limit
+
+    Каждый элемент массива декодируется json.JSONDecoder.raw_decode с текущей позиции буфера;
+    прочитанная часть буфера отбрасывается, поэтому в памяти — только текущий чанк и недоразобранный хвост.
+
+    Поля конверта доступны всегда: если они идут в теле ПОСЛЕ "data" (как у DummyAPI), а их спросили
+    до конца итерации — оставшиеся элементы дочитываются в очередь и итерация продолжится из неё.
+
+    max_bytes: при превышении (по Content-Length — сразу, иначе по мере чтения) — ResponseTooLarge.
+    """
+
+    def __init__(
+        self,
+        response: Any,
+        max_bytes: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        items_key: str = ITEMS_KEY,
+    ):
+        self.response = response
+        self.max_bytes = max_body_bytes() if max_bytes is None else max_bytes
+        self.items_key = items_key
+        self.envelope: dict[str, Any] = {}
+        self.bytes_read = 0
+        self.items_parsed = 0
+        self.done = False
+
+        length = response.headers.get("Content-Length")
+        if self.max_bytes and length and length.isdigit() and int(length) > self.max_bytes:
+            response.close()
+            raise ResponseTooLarge(f"Content-Length {length} > max {self.max_bytes} bytes: {response.url}")
+
+        self._chunks = response.iter_content(chunk_size)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._pending: deque = deque()
+        self._items = self._parse()
+
+    # ---------- буфер ----------
+
+    def _fill(self) -> bool:
+        """Дочитывает следующий чанк в буфер; False — тело закончилось."""
+        if self._eof:
+            return False
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._eof = True
+            self._buf += self._decoder.decode(b"", final=True)
+            return False
+        self.bytes_read += len(chunk)
+        if self.max_bytes and self.bytes_read > self.max_bytes:
+            self.response.close()
+            raise ResponseTooLarge(f"body exceeded max {self.max_bytes} bytes: {self.response.url}")
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += self._decoder.decode(chunk)
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise json.JSONDecodeError("Unexpected end of JSON body", self._buf, self._pos)
+
+    def _expect(self, *chars: str) -> str:
+        ch = self._peek()
+        if ch not in chars:
+            raise json.JSONDecodeError(f"Expected one of {chars!r}", self._buf, self._pos)
+        self._pos += 1
+        return ch
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue  # значение ещё не пришло целиком
+                raise
+            # Число, после которого до конца буфера — только символы числа, могло быть обрезано границей
+            # чанка ("12|34", "1e|-07", "3.|14": raw_decode вернёт 12 / 1 / 3) — дочитываем и повторяем.
+            # Строки/объекты/массивы заканчиваются закрывающим символом, у них такой проблемы нет
+            if (type(value) in (int, float) and _NUMBER_TAIL.match(self._buf, end).end() == len(self._buf)
+                    and self._fill()):
+                continue
+            self._pos = end
+            return value
+
+    # ---------- разбор ----------
+
+    def _parse(self) -> Iterator[Any]:
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+        else:
+            while True:
+                key = self._value()
+                self._expect(":")
+                if key == self.items_key and self._peek() == "[":
+                    self._pos += 1
+                    if self._peek() == "]":
+                        self._pos += 1
+                    else:
+                        while True:
+                            self.items_parsed += 1
+                            yield self._value()
+                            if self._expect(",", "]") == "]":
+                                break
+                else:
+                    self.envelope[key] = self._value()
+                if self._expect(",", "}") == "}":
+                    break
+        self.done = True
+        self._buf = ""
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            if self._pending:
+                yield self._pending.popleft()
+                continue
+            try:
+                yield next(self._items)
+            except StopIteration:
+                return
+
+    def field(self, name: str, default: Any = None) -> Any:
+        """Поле конверта; если оно ещё не встретилось — дочитываем тело (элементы — в очередь)."""
+        if name not in self.envelope and not self.done:
+            self._pending.extend(self._items)
+        return self.envelope.get(name, default)
+
+    @property
+    def total(self) -> Optional[int]:
+        return self.field("total")
+
+    @property
+    def page(self) -> Optional[int]:
+        return self.field("page")
+
+    @property
+    def limit(self) -> Optional[int]:
+        return self.field("limit")
+
+
+class ListPage(list):
+    """
+    Результат CHECKED list-методов: обычный list элементов + поля конверта (total / page / limit).
+    Сравнение, срезы, len, in — как у list, существующие тесты не меняются.
+    """
+
+    def __init__(self, items=(), envelope: Optional[dict] = None):
+        super().__init__(items)
+        self.envelope = envelope or {}
+
+    @property
+    def total(self) -> Optional[int]:
+        return self.envelope.get("total")
+
+    @property
+    def page(self) -> Optional[int]:
+        return self.envelope.get("page")
+
+    @property
+    def limit(self) -> Optional[int]:
+        return self.envelope.get("limit")
+
+
+def read_list_page(response: Any, parse_item: Callable[[Any], T], max_bytes: Optional[int] = None) -> ListPage:
+    """
+    Общий разбор ответа CHECKED list-метода: проверка 200 + parse_item на каждый элемент "data".
+
+    Потоковый ответ (session.stream = True) разбирается инкрементально: элемент валидируется сразу,
+    как пришёл, и его dict больше не нужен — пик памяти ≈ модели + один чанк, а не тело + дерево + модели.
+    Обычный ответ — как раньше, через resp.json().
+    """
+    if is_streamed(response) and response.status_code == 200:
+        stream = StreamedList(response, max_bytes=max_bytes)
+        items = [parse_item(item) for item in stream]
+        return ListPage(items, envelope=stream.envelope)
+
+    body = response.json()
+    assert response.status_code == 200, body
+    return ListPage(
+        [parse_item(item) for item in body.get(ITEMS_KEY, [])],
+        envelope={k: v for k, v in body.items() if k != ITEMS_KEY},
+    )
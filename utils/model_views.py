@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import InitErrorDetails, PydanticUndefined
+from services.comments.comment_model import CommentModel
+from services.posts.post_model import PostModel
+from services.users.user_model import UserModel
+
+
+class ModelView:
+    """
+    Лёгкая "ленивая" запись поверх сырого dict элемента списка — вместо полной Pydantic-модели.
+
+    - хранит только ссылку на уже декодированный dict (__slots__, без __dict__ на экземпляр)
+    - поле валидируется ТОЛЬКО при первом обращении (тем же типом, что и в модели) и кэшируется в слоте
+    - to_model() — полная валидация в обычную модель, когда нужна вся запись целиком
+
+        posts = posts_api.list_posts_by_user(user_id, limit=50, view=True)
+        assert post_id in [p.id for p in posts]     # валидируется только id
+        post = posts[0].to_model()                  # PostModel
+
+    Подклассы создаются через model_view(Model): на каждое поле модели — свой слот.
+    Незаполненный слот при чтении даёт AttributeError, и Python вызывает __getattr__ — там и
+    происходит валидация поля. Повторные чтения идут напрямую из слота, без накладных расходов.
+    """
+
+    __slots__ = ("_data",)
+    model: type[BaseModel]
+    _adapters: dict[str, tuple[TypeAdapter, Any]]
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def __getattr__(self, name: str) -> Any:
+        adapter = self._adapters.get(name)
+        if adapter is None:
+            raise AttributeError(f"{type(self).__name__!s} has no field {name!r}")
+        type_adapter, default = adapter
+        if name in self._data:
+            value = type_adapter.validate_python(self._data[name])
+        elif default is not PydanticUndefined:
+            value = default
+        else:
+            raise ValidationError.from_exception_data(
+                self.model.__name__,
+                [InitErrorDetails(type="missing", loc=(name,), input=self._data)],
+            )
+        setattr(self, name, value)
+        return value
+
+    @property
+    def raw(self) -> dict:
+        return self._data
+
+    def to_model(self, context: Optional[dict] = None) -> BaseModel:
+        return self.model.model_validate(self._data, context=context)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={self._data.get('id')!r})"
+
+
+def model_view(model: type[BaseModel]) -> type[ModelView]:
+    """Класс-view для модели: слот на каждое поле + TypeAdapter поля (создаётся один раз на класс)."""
+    fields = model.model_fields
+    adapters = {
+        name: (TypeAdapter(info.annotation), info.get_default(call_default_factory=True))
+        for name, info in fields.items()
+    }
+    return type(
+        f"{model.__name__.removesuffix('Model')}View",
+        (ModelView,),
+        {"__slots__": tuple(fields), "model": model, "_adapters": adapters},
+    )
+
+
+UserView = model_view(UserModel)
+PostView = model_view(PostModel)
+CommentView = model_view(CommentModel)
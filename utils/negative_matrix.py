@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional
+from services.comments.comment_endpoints import CommentEndpoints
+from services.comments.comment_payloads import CommentPayloads
+from services.posts.post_endpoints import PostEndpoints
+from services.posts.post_payloads import PostPayloads
+from services.users.user_endpoints import UserEndpoints
+from services.users.user_payloads import UserPayloads
+
+# requests/транспорт нужны только при выполнении матрицы — сбор тестов (параметризация) их не импортирует
+if TYPE_CHECKING:
+    import requests
+    from utils.raw_http import RawHttp, RawRequest
+
+# Обязательные поля тела create-запросов (убираем по одному -> 400 BODY_NOT_VALID)
+REQUIRED_CREATE_FIELDS = {
+    "user": ("firstName", "lastName", "email"),
+    "post": ("owner",),
+    "comment": ("message", "owner", "post"),
+}
+
+MALFORMED_ID = "123"
+NON_EXISTENT_ID = "000000000000000000000000"
+INVALID_APP_ID = "invalid-app-id"
+
+
+@dataclass(frozen=True)
+class EndpointSpec:
+    """Один эндпоинт ресурса: путь с {id} (если принимает id) и HTTP-метод."""
+
+    resource: str
+    name: str
+    method: str
+    path: str            # без base_url, например "/user/{id}/post"
+
+    @property
+    def takes_id(self) -> bool:
+        return "{id}" in self.path
+
+    @property
+    def is_item(self) -> bool:
+        """Эндпоинт конкретной сущности (/user/{id}), а не списка по родителю (/user/{id}/post)."""
+        return self.path.endswith("{id}")
+
+
+@dataclass(frozen=True)
+class NegativeCase:
+    """
+    Одна клетка матрицы: эндпоинт × поломка -> ожидаемая ошибка DummyAPI.
+
+    auth: "missing" (без app-id) / "invalid" (неверный app-id) / "valid"
+    drop_field: для create — какое обязательное поле убрать из валидного payload'а
+    """
+
+    resource: str
+    endpoint: str
+    method: str
+    path: str            # уже с подставленным id, без base_url
+    auth: str
+    expected_status: int
+    expected_error: str
+    drop_field: Optional[str] = None
+
+    @property
+    def id(self) -> str:
+        suffix = f"-no-{self.drop_field}" if self.drop_field else ""
+        return f"{self.resource}-{self.endpoint}-{self.auth}-{self.expected_error}{suffix}"
+
+    @property
+    def title(self) -> str:
+        detail = f" without {self.drop_field}" if self.drop_field else ""
+        auth = {"missing": " without app-id", "invalid": " with invalid app-id"}.get(self.auth, "")
+        return f"{self.method} {self.path}{detail}{auth} -> {self.expected_status} {self.expected_error}"
+
+
+def endpoint_specs() -> dict[str, list[EndpointSpec]]:
+    """
+    Эндпоинты матрицы по ресурсам: (метод, путь из класса эндпоинтов) объявлены явно.
+    Один URL-хелпер может обслуживать несколько методов (post_by_id -> GET / PUT / DELETE) — каждый метод
+    отдельной строкой. Классы создаём с пустым base_url, поэтому пути относительные ("/post/create").
+    """
+    users, posts, comments = UserEndpoints(""), PostEndpoints(""), CommentEndpoints("")
+    return {
+        "user": [
+            EndpointSpec("user", "create_user", "POST", users.create_user),
+            EndpointSpec("user", "get_users_list", "GET", users.get_users_list()),
+            EndpointSpec("user", "get_user_by_id", "GET", users.get_user_by_id("{id}")),
+            EndpointSpec("user", "update_user", "PUT", users.update_user("{id}")),
+            EndpointSpec("user", "delete_user", "DELETE", users.delete_user("{id}")),
+        ],
+        "post": [
+            EndpointSpec("post", "create_post", "POST", posts.create_post),
+            EndpointSpec("post", "list_posts", "GET", posts.list_posts),
+            EndpointSpec("post", "get_post", "GET", posts.post_by_id("{id}")),
+            EndpointSpec("post", "update_post", "PUT", posts.post_by_id("{id}")),
+            EndpointSpec("post", "delete_post", "DELETE", posts.post_by_id("{id}")),
+            EndpointSpec("post", "posts_by_user", "GET", posts.posts_by_user("{id}")),
+        ],
+        "comment": [
+            EndpointSpec("comment", "create_comment", "POST", comments.create_comment),
+            EndpointSpec("comment", "list_comments", "GET", comments.list_comments),
+            EndpointSpec("comment", "delete_comment", "DELETE", comments.delete_comment("{id}")),
+            EndpointSpec("comment", "comments_by_post", "GET", comments.comments_by_post("{id}")),
+            EndpointSpec("comment", "comments_by_user", "GET", comments.comments_by_user("{id}")),
+        ],
+    }
+
+
+def build_cases() -> list[NegativeCase]:
+    """Разворачивает матрицу для всех ресурсов. Порядок стабильный (нужен для id параметризации)."""
+    cases: list[NegativeCase] = []
+    for resource, specs in endpoint_specs().items():
+        for spec in specs:
+            def case(path_id: str, auth: str, status: int, error: str, drop_field: Optional[str] = None):
+                cases.append(NegativeCase(
+                    resource=resource,
+                    endpoint=spec.name,
+                    method=spec.method,
+                    path=spec.path.replace("{id}", path_id),
+                    auth=auth,
+                    expected_status=status,
+                    expected_error=error,
+                    drop_field=drop_field,
+                ))
+
+            # app-id проверяется раньше всего остального — id берём корректный по формату
+            case(NON_EXISTENT_ID, "missing", 403, "APP_ID_MISSING")
+            case(NON_EXISTENT_ID, "invalid", 403, "APP_ID_NOT_EXIST")
+            if spec.takes_id:
+                case(MALFORMED_ID, "valid", 400, "PARAMS_NOT_VALID")
+            if spec.is_item:
+                case(NON_EXISTENT_ID, "valid", 404, "RESOURCE_NOT_FOUND")
+            if spec.method == "POST":
+                for field in REQUIRED_CREATE_FIELDS.get(resource, ()):
+                    case(NON_EXISTENT_ID, "valid", 400, "BODY_NOT_VALID", drop_field=field)
+
+        cases.append(NegativeCase(
+            resource=resource,
+            endpoint="wrong_path",
+            method="GET",
+            path=f"/{resource}zzz",
+            auth="valid",
+            expected_status=404,
+            expected_error="PATH_NOT_FOUND",
+        ))
+    return cases
+
+
+class NegativeMatrix:
+    """
+    Исполнитель матрицы на тестовую сессию.
+
+    prefetch(cases): собирает запросы всех клеток, убирает одинаковые (метод + URL + заголовки + тело)
+    и отправляет уникальные параллельно через RawHttp.batch. Дальше каждый тест только достаёт свой ответ
+    и прикрепляет его в Allure — в своём потоке, поэтому вложение попадает в правильный тест.
+
+    owner_id / post_id — реальные сущности: без них create-запросы постов/комментариев с убранным полем
+    могли бы упасть не на "нет поля", а на "нет такого владельца".
+    """
+
+    def __init__(self, raw: RawHttp, base_url: str, api_token: str, owner_id: str, post_id: str):
+        self.raw = raw
+        self.base_url = base_url.rstrip("/")
+        self.api_token = api_token
+        self._payload_factories: dict[tuple[str, str], Callable[[], dict]] = {
+            ("user", "POST"): UserPayloads.create_user,
+            ("user", "PUT"): UserPayloads.update_user,
+            ("post", "PUT"): lambda: PostPayloads.update_post(text="Negative matrix post", likes=1),
+            ("post", "POST"): lambda: PostPayloads.create_post(owner_id=owner_id),
+            ("comment", "POST"): lambda: CommentPayloads.create_comment(owner_id=owner_id, post_id=post_id),
+        }
+        self._payloads: dict[tuple[str, str], dict] = {}
+        self._responses: dict[tuple, requests.Response] = {}
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+
+    def _payload(self, case: NegativeCase) -> Optional[dict]:
+        factory_key = (case.resource, case.method)
+        if factory_key not in self._payload_factories:
+            return None
+        # Один валидный payload на (ресурс, метод): одинаковые клетки дают одинаковый запрос -> дедупликация
+        if factory_key not in self._payloads:
+            self._payloads[factory_key] = self._payload_factories[factory_key]()
+        payload = dict(self._payloads[factory_key])
+        if case.drop_field:
+            payload.pop(case.drop_field, None)
+        return payload
+
+    def request_for(self, case: NegativeCase) -> RawRequest:
+        from utils.raw_http import RawRequest
+
+        headers = {"missing": None, "invalid": {"app-id": INVALID_APP_ID}, "valid": {"app-id": self.api_token}}
+        return RawRequest(
+            method=case.method,
+            url=f"{self.base_url}{case.path}",
+            headers=headers[case.auth],
+            json_body=self._payload(case),
+        )
+
+    @staticmethod
+    def _key(request: RawRequest) -> tuple:
+        headers = tuple(sorted((request.headers or {}).items()))
+        body = json.dumps(request.json_body, sort_keys=True) if request.json_body is not None else None
+        return request.method, request.url, headers, body
+
+    def prefetch(self, cases: list[NegativeCase]) -> None:
+        """Отправляет (параллельно, без повторов) все ещё не отправленные запросы клеток."""
+        with self._lock:
+            unique: dict[tuple, RawRequest] = {}
+            for case in cases:
+                request = self.request_for(case)
+                key = self._key(request)
+                if key not in self._responses:
+                    unique.setdefault(key, request)
+            if not unique:
+                return
+            responses = self.raw.batch(list(unique.values()), attach=False)
+            self._responses.update(zip(unique.keys(), responses))
+            self.requests_sent += len(unique)
+
+    def response(self, case: NegativeCase) -> requests.Response:
+        """Ответ для клетки (если её не было в prefetch — отправит сейчас) + аттач в текущий тест."""
+        key = self._key(self.request_for(case))
+        if key not in self._responses:
+            self.prefetch([case])
+        resp = self._responses[key]
+        if self.raw.attach:
+            self.raw.attach(resp)
+        return resp
+
+
+NEGATIVE_CASES = build_cases()
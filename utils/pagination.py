@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
+from utils.concurrency import DEFAULT_MAX_WORKERS
+from utils.json_stream import read_list_page
+
+if TYPE_CHECKING:
+    import requests
+
+MAX_PAGE_LIMIT = 50  # максимум limit у DummyAPI для списков
+
+
+@dataclass
+class Page:
+    number: int
+    items: list[dict]
+    total: Optional[int]
+
+
+def page_fetcher(session: requests.Session, url: str, limit: int = MAX_PAGE_LIMIT, timeout: float = 15) -> Callable[[int], Page]:
+    """
+    fetch(page) -> Page для списочного эндпоинта ({"data": [...], "total": N, ...}).
+    Идёт напрямую через session (без allure-шагов клиентов): при полном обходе это тысячи запросов.
+    """
+
+    def fetch(number: int) -> Page:
+        response = session.get(url, params={"limit": limit, "page": number}, timeout=timeout)
+        response.raise_for_status()
+        page = read_list_page(response, lambda item: item)  # у сессии со stream = True — потоковый разбор
+        return Page(number=number, items=list(page), total=page.total)
+
+    return fetch
+
+
+def iter_pages(
+    fetch: Callable[[int], Page],
+    limit: int = MAX_PAGE_LIMIT,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Iterator[Page]:
+    """
+    Обходит все страницы списка, держа до max_workers запросов страниц в полёте.
+
+    - страница 0 запрашивается первой: из неё берём total и знаем точное число страниц
+    - если total нет — запрашиваем страницы "наперёд" окном, пока не встретим неполную
+    - страницы отдаются СТРОГО ПО ПОРЯДКУ, а в памяти не больше окна — поэтому обход
+      всего списка идёт с постоянной памятью, даже если в нём сотни тысяч элементов
+
+    Темп запросов по-прежнему держит RateLimiter сессии; max_workers — только глубина окна.
+    """
+    first = fetch(0)
+    yield first
+    if len(first.items) < limit and first.total is None:
+        return
+
+    last: Optional[int] = None
+    if first.total is not None:
+        last = math.ceil(first.total / limit) - 1
+        if last < 1:
+            return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        window: deque[Future] = deque()
+        next_number = 1
+        exhausted = False
+
+        def fill() -> None:
+            nonlocal next_number
+            while not exhausted and len(window) < max_workers and (last is None or next_number <= last):
+                window.append(pool.submit(fetch, next_number))
+                next_number += 1
+
+        fill()
+        while window:
+            page = window.popleft().result()
+            # total мог уменьшиться во время обхода — пустая/неполная страница означает конец списка
+            if len(page.items) < limit:
+                exhausted = True
+            yield page
+            if exhausted:
+                for future in window:
+                    future.cancel()
+                # уже запущенные страницы за концом списка — пустые, их результат не нужен
+                window.clear()
+                break
+            fill()
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import statistics
+import subprocess
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+from utils.http_metrics import HttpMetrics
+
+SUITES = ("all", "smoke", "regression", "negative")
+
+DEFAULT_BASELINE_RUNS = 10   # сколько прошлых прогонов того же suite берём в базу
+MIN_BASELINE_RUNS = 3        # меньше — сравнивать не с чем, регрессии не ищем
+Z_THRESHOLD = 3.5            # порог модифицированного z-score (Iglewicz & Hoaglin)
+MIN_RATIO = 1.2              # и не меньше +20% к медиане...
+MIN_DELTA_MS = {"test": 50.0, "route_p50": 5.0, "route_p95": 10.0}  # ...и не меньше N мс — иначе это шум
+MIN_ROUTE_COUNT = 5          # перцентили по 1-2 запросам не сравниваем
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    git_commit TEXT NOT NULL,
+    suite TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    kind TEXT NOT NULL,          -- test | route_p50 | route_p95
+    key TEXT NOT NULL,           -- nodeid | "GET /user/{id} (warm)"
+    value_ms REAL NOT NULL,
+    PRIMARY KEY (run_id, kind, key)
+);
+CREATE INDEX IF NOT EXISTS runs_suite ON runs(suite, id);
+"""
+
+
+def git_commit() -> str:
+    """Коммит прогона: GIT_COMMIT / GITHUB_SHA (CI), иначе git rev-parse HEAD, иначе "unknown"."""
+    for name in ("GIT_COMMIT", "GITHUB_SHA"):
+        if os.getenv(name):
+            return os.environ[name]
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short=12", "HEAD"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    return out.stdout.strip() or "unknown"
+
+
+@dataclass
+class Regression:
+    kind: str
+    key: str
+    value_ms: float
+    baseline_ms: float       # медиана базы
+    z: float                 # модифицированный z-score: 0.6745 * (x - median) / MAD
+    runs: int                # сколько прогонов в базе
+
+    @property
+    def ratio(self) -> float:
+        return self.value_ms / self.baseline_ms if self.baseline_ms else float("inf")
+
+    def format(self) -> str:
+        return (f"{self.kind:<10} {self.key}: {self.value_ms:.1f} ms vs median {self.baseline_ms:.1f} ms "
+                f"({self.ratio - 1:+.0%}, z={self.z:.1f}, {self.runs} runs)")
+
+
+def find_regression(kind: str, key: str, value_ms: float, history: list[float]) -> Optional[Regression]:
+    """
+    Робастное сравнение с базой: медиана и MAD (median absolute deviation) не "ломаются" от пары
+    выбросов в истории, в отличие от среднего и стандартного отклонения.
+
+    Регрессия — только если выполнены ВСЕ условия: z >= Z_THRESHOLD, рост >= MIN_RATIO и >= MIN_DELTA_MS.
+    Если MAD = 0 (история одинаковая до мс), разброс считается не меньше 5% медианы.
+    """
+    if len(history) < MIN_BASELINE_RUNS:
+        return None
+    median = statistics.median(history)
+    mad = statistics.median(abs(v - median) for v in history)
+    mad = max(mad, median * 0.05, 1e-6)
+    z = 0.6745 * (value_ms - median) / mad
+    if z < Z_THRESHOLD or value_ms < median * MIN_RATIO or value_ms - median < MIN_DELTA_MS.get(kind, 0.0):
+        return None
+    return Regression(kind, key, value_ms, median, z, len(history))
+
+
+class PerfStore:
+    """
+    Локальная история производительности прогонов в SQLite (по умолчанию .perf-history.sqlite).
+
+    Один прогон = строка runs (коммит, suite) + samples: длительность каждого прошедшего теста
+    и p50/p95 каждого HTTP-роута. База для сравнения — последние baseline_runs прогонов того же suite.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def add_run(self, commit: str, suite: str, samples: Iterable[tuple[str, str, float]]) -> int:
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (started_at, git_commit, suite) VALUES (?, ?, ?)",
+                (datetime.now(timezone.utc).isoformat(timespec="seconds"), commit, suite),
+            )
+            run_id = cur.lastrowid
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO samples (run_id, kind, key, value_ms) VALUES (?, ?, ?, ?)",
+                ((run_id, kind, key, value) for kind, key, value in samples),
+            )
+        return run_id
+
+    def history(self, suite: str, before_run: int, runs: int = DEFAULT_BASELINE_RUNS) -> dict[tuple[str, str], list[float]]:
+        """{(kind, key): [значения]} за последние runs прогонов suite до прогона before_run."""
+        rows = self.conn.execute(
+            """
+            SELECT s.kind, s.key, s.value_ms FROM samples s
+            WHERE s.run_id IN (SELECT id FROM runs WHERE suite = ? AND id < ? ORDER BY id DESC LIMIT ?)
+            """,
+            (suite, before_run, runs),
+        )
+        result: dict[tuple[str, str], list[float]] = {}
+        for kind, key, value in rows:
+            result.setdefault((kind, key), []).append(value)
+        return result
+
+    def compare(self, run_id: int, suite: str, runs: int = DEFAULT_BASELINE_RUNS) -> list[Regression]:
+        history = self.history(suite, run_id, runs)
+        current = self.conn.execute("SELECT kind, key, value_ms FROM samples WHERE run_id = ?", (run_id,))
+        found = [
+            regression
+            for kind, key, value in current
+            if (regression := find_regression(kind, key, value, history.get((kind, key), []))) is not None
+        ]
+        return sorted(found, key=lambda r: r.ratio, reverse=True)
+
+
+class PerfHistoryPlugin:
+    """
+    pytest-плагин (--perf-history / env PERF_HISTORY_DB): собирает длительности тестов (setup + call,
+    только прошедшие) и пофазные тайминги HTTP, а в конце прогона сохраняет их и ищет регрессии.
+
+    Сохранение и сравнение делает session-фикстура perf_history на teardown (finish()) — так отчёт
+    успевает попасть в Allure вложением; итог печатается в terminal summary.
+    fail_ratio: если хоть одна регрессия медленнее базы в fail_ratio раз и больше — прогон падает.
+    """
+
+    def __init__(self, path: str | Path, suite: str, fail_ratio: Optional[float] = None,
+                 baseline_runs: int = DEFAULT_BASELINE_RUNS):
+        self.path = Path(path)
+        self.suite = suite
+        self.fail_ratio = fail_ratio
+        self.baseline_runs = baseline_runs
+        self.commit = git_commit()
+        self.metrics = HttpMetrics()
+        self.metrics.start()
+        self._durations: dict[str, float] = {}
+        self._failed: set[str] = set()
+        self.run_id: Optional[int] = None
+        self.baseline_size = 0
+        self.regressions: list[Regression] = []
+
+    def pytest_runtest_logreport(self, report) -> None:
+        if report.when == "teardown":
+            return  # teardown последнего теста включает teardown session-фикстур — не сравнимо
+        if report.failed or report.skipped:
+            self._failed.add(report.nodeid)
+        self._durations[report.nodeid] = self._durations.get(report.nodeid, 0.0) + report.duration
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        result = [("test", nodeid, seconds * 1000) for nodeid, seconds in self._durations.items()
+                  if nodeid not in self._failed]
+        for row in self.metrics.rows():
+            # error — время до таймаута/обрыва, а не скорость роута: в базу не пишем (как и упавшие тесты)
+            if row["count"] < MIN_ROUTE_COUNT or row["kind"] == "error":
+                continue
+            key = f"{row['method']} {row['route']} ({row['kind']})"
+            result.append(("route_p50", key, row["p50_ms"]))
+            result.append(("route_p95", key, row["p95_ms"]))
+        return result
+
+    def finish(self) -> list[Regression]:
+        """Сохраняет прогон и сравнивает его с базой (один раз)."""
+        if self.run_id is not None:
+            return self.regressions
+        self.metrics.stop()
+        store = PerfStore(self.path)
+        try:
+            self.run_id = store.add_run(self.commit, self.suite, self.samples())
+            self.baseline_size = len(store.conn.execute(
+                "SELECT id FROM runs WHERE suite = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                (self.suite, self.run_id, self.baseline_runs),
+            ).fetchall())
+            self.regressions = store.compare(self.run_id, self.suite, self.baseline_runs)
+        finally:
+            store.close()
+        return self.regressions
+
+    def report_lines(self) -> list[str]:
+        head = (f"suite={self.suite} commit={self.commit} run={self.run_id} "
+                f"baseline={self.baseline_size} runs ({self.path})")
+        if self.baseline_size < MIN_BASELINE_RUNS:
+            return [head, f"not enough history to compare (need {MIN_BASELINE_RUNS} runs)"]
+        if not self.regressions:
+            return [head, "no significant slowdowns"]
+        return [head, f"{len(self.regressions)} significant slowdowns:"] + [r.format() for r in self.regressions]
+
+    def failing(self) -> list[Regression]:
+        if self.fail_ratio is None:
+            return []
+        return [r for r in self.regressions if r.ratio >= self.fail_ratio]
+
+    def pytest_sessionfinish(self, session):
+        self.finish()  # если фикстура не отработала (например, прогон прерван на сборе)
+        if self.failing() and session.exitstatus == 0:
+            session.exitstatus = 1  # pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        tr = terminalreporter
+        tr.write_sep("=", "performance history")
+        for line in self.report_lines():
+            tr.write_line(line)
+        if self.failing():
+            tr.write_line(f"FAILED: {len(self.failing())} slowdowns >= x{self.fail_ratio:g} (--perf-fail-ratio)", red=True)
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+
+class TokenBucket:
+    """
+    Классический token bucket.
+
+    - rate: сколько токенов (запросов) в секунду пополняется
+    - burst: ёмкость "ведра" — сколько запросов можно отправить пачкой после простоя
+
+    rate <= 0 означает "без ограничения" (try_acquire всегда сразу успешен).
+    clock — источник времени в секундах (в unit-тестах подменяется управляемыми часами).
+    Класс НЕ потокобезопасен сам по себе — синхронизацию делает RateLimiter.
+    """
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = float(rate)
+        self.burst = max(float(burst), 1.0)
+        self.clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    def try_acquire(self) -> float:
+        """
+        Пытается забрать один токен.
+        Возвращает 0.0, если токен взят, иначе — сколько секунд подождать до следующего токена.
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        now = self.clock()
+        self._refill(now)
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / self.rate
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD-лимит на количество одновременных запросов (in-flight).
+
+    - успех (2xx/3xx/4xx, кроме 429) и нормальная латентность → лимит растёт аддитивно (+increase / limit за ответ,
+      т.е. примерно +increase за "окно" из limit ответов)
+    - 429 / 5xx / сетевая ошибка / заметный рост латентности → лимит умножается на backoff
+      (не чаще одного раза за cooldown секунд, чтобы пачка 429 не обрушила лимит до минимума)
+
+    Рост латентности считаем через две EWMA: быструю и медленную (базовую).
+    Если быстрая > базовой * latency_tolerance — сервер "захлёбывается", снижаем лимит.
+
+    clock — источник времени для cooldown (в unit-тестах подменяется управляемыми часами).
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        backoff: float = 0.5,
+        increase: float = 1.0,
+        latency_tolerance: float = 2.0,
+        cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_limit = max(int(min_limit), 1)
+        self.max_limit = max(int(max_limit), self.min_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.backoff = backoff
+        self.increase = increase
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.clock = clock
+
+        self.in_flight = 0
+        self._fast_latency: Optional[float] = None
+        self._base_latency: Optional[float] = None
+        self._last_backoff: Optional[float] = None
+
+    def can_start(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    def _latency_degraded(self, latency: float) -> bool:
+        # Первые замеры просто инициализируют EWMA
+        if self._fast_latency is None or self._base_latency is None:
+            self._fast_latency = self._base_latency = latency
+            return False
+
+        self._fast_latency = 0.5 * self._fast_latency + 0.5 * latency
+        self._base_latency = 0.95 * self._base_latency + 0.05 * latency
+        return self._fast_latency > self._base_latency * self.latency_tolerance
+
+    def on_result(self, status_code: Optional[int], latency: float) -> None:
+        """status_code=None — запрос упал исключением (таймаут, reset и т.п.)."""
+        overloaded = status_code is None or status_code == 429 or status_code >= 500
+        degraded = self._latency_degraded(latency)
+
+        if overloaded or degraded:
+            now = self.clock()
+            if self._last_backoff is None or now - self._last_backoff >= self.cooldown:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_backoff = now
+        else:
+            self.limit = min(float(self.max_limit), self.limit + self.increase / max(self.limit, 1.0))
+
+
+class Slot:
+    """Выданное разрешение на один запрос. Через record() сообщаем статус ответа лимитеру."""
+
+    def __init__(self) -> None:
+        self.status_code: Optional[int] = None
+        self.started = time.perf_counter()
+
+    def record(self, status_code: int) -> None:
+        self.status_code = status_code
+
+
+class RateLimiter:
+    """
+    Общий для всех клиентов ограничитель: token bucket (RPS) + AIMD-лимит конкурентности.
+
+    Через него идёт каждый запрос UsersAPI / PostsAPI / CommentsAPI / RawHttp (см. utils/transport.py),
+    поэтому квота app-id делится между всеми клиентами процесса.
+
+    Работает и из потоков, и из asyncio-задач:
+    - with limiter.slot() as slot: ...        — потоки (блокирующее ожидание)
+    - async with limiter.aslot() as slot: ... — asyncio (ожидание через asyncio.sleep, цикл событий не блокируется)
+    """
+
+    def __init__(self, bucket: TokenBucket, concurrency: AdaptiveConcurrency):
+        self.bucket = bucket
+        self.concurrency = concurrency
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        """
+        Настройки берём из окружения (.env / CI):
+        - RATE_LIMIT_RPS (по умолчанию 0 — без ограничения по RPS: обычный прогон не троттлится,
+          квоту app-id задают явно, например в CI)
+        - RATE_LIMIT_BURST (по умолчанию = RPS)
+        - CONCURRENCY_INITIAL / CONCURRENCY_MIN / CONCURRENCY_MAX (4 / 1 / 32)
+        """
+        rps = float(os.getenv("RATE_LIMIT_RPS", "0"))
+        burst = float(os.getenv("RATE_LIMIT_BURST", str(rps or 1)))
+        concurrency = AdaptiveConcurrency(
+            initial=int(os.getenv("CONCURRENCY_INITIAL", "4")),
+            min_limit=int(os.getenv("CONCURRENCY_MIN", "1")),
+            max_limit=int(os.getenv("CONCURRENCY_MAX", "32")),
+        )
+        return cls(TokenBucket(rate=rps, burst=burst), concurrency)
+
+    # -------------------- низкоуровневые операции (под локом) --------------------
+
+    def _try_start(self) -> float:
+        """0.0 — слот выдан; иначе — рекомендуемое время ожидания (сек)."""
+        if not self.concurrency.can_start():
+            return 0.05
+        wait = self.bucket.try_acquire()
+        if wait:
+            return wait
+        self.concurrency.in_flight += 1
+        return 0.0
+
+    def _finish(self, slot: Slot) -> None:
+        latency = time.perf_counter() - slot.started
+        with self._cond:
+            self.concurrency.in_flight -= 1
+            self.concurrency.on_result(slot.status_code, latency)
+            self._cond.notify_all()
+
+    # -------------------- потоки --------------------
+
+    def acquire(self) -> Slot:
+        with self._cond:
+            while True:
+                wait = self._try_start()
+                if not wait:
+                    return Slot()
+                self._cond.wait(timeout=wait)
+
+    @contextmanager
+    def slot(self) -> Iterator[Slot]:
+        slot = self.acquire()
+        try:
+            yield slot
+        finally:
+            self._finish(slot)
+
+    # -------------------- asyncio --------------------
+
+    async def aacquire(self) -> Slot:
+        while True:
+            with self._cond:
+                wait = self._try_start()
+            if not wait:
+                return Slot()
+            await asyncio.sleep(min(wait, 0.05))
+
+    @asynccontextmanager
+    async def aslot(self) -> AsyncIterator[Slot]:
+        slot = await self.aacquire()
+        try:
+            yield slot
+        finally:
+            self._finish(slot)
+
+
+# Один лимитер на процесс: все сессии (клиенты + RawHttp) делят его между собой
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Возвращает общий лимитер процесса (создаётся лениво из переменных окружения)."""
+    global _shared_limiter
+    if _shared_limiter is None:
+        with _shared_lock:
+            if _shared_limiter is None:
+                _shared_limiter = RateLimiter.from_env()
+    return _shared_limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """Подменяет общий лимитер (например, в утилитах со своим RPS). None — пересоздать из окружения."""
+    global _shared_limiter
+    with _shared_lock:
+        _shared_limiter = limiter
@@ -1,13 +1,31 @@
 from __future__ import annotations  # позволяет писать аннотации типов без кавычек (удобно и совместимо)
 
-from typing import Callable, Optional
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
 import requests
+from utils.concurrency import run_concurrently
+from utils.transport import make_session
 
 # Тип "функция-коллбек", которая принимает requests.Response и ничего не возвращает.
 # Мы будем передавать сюда, например, attach_response_safe для Allure.
 AttachFn = Callable[[requests.Response], None]
 
 
+@dataclass(frozen=True)
+class RawRequest:
+    """
+    Описание одного "сырого" запроса для RawHttp.batch().
+
+    headers — заголовки ЭТОГО запроса (например {"app-id": api_token} или {"app-id": "invalid-app-id"});
+    без headers запрос уйдёт без app-id.
+    """
+
+    method: str
+    url: str
+    headers: Optional[dict] = None
+    json_body: Optional[dict] = None
+
+
 class RawHttp:
     """
     "Сырой" HTTP-клиент для негативных сценариев.
@@ -21,13 +39,17 @@ class RawHttp:
     Важно:
     - Этот клиент НИЧЕГО не ассертит и не валидирует. Он просто делает запрос и возвращает Response.
     - app-id по умолчанию НЕ добавляется — это специально для негативных проверок.
+    - Заголовки задаются на каждый запрос, поэтому один экземпляр можно делить между тестами
+      (session-фикстура raw_http поверх общего пула соединений).
     """
 
-    def __init__(self, timeout: int, attach: Optional[AttachFn] = None):
+    def __init__(self, timeout: int, attach: Optional[AttachFn] = None, session=None):
         """
         timeout: таймаут для всех запросов (секунды)
         attach: функция, которая "прикрепит" ответ в Allure (например, api_users.attach_response_safe)
                 Можно не передавать — тогда аттачей не будет.
+        session: готовая сессия без дефолтного app-id (например, connection_manager.session() —
+                 поверх общего тёплого пула). Если не передали — создаём свою.
         """
         self.timeout = timeout
         self.attach = attach
@@ -36,13 +58,16 @@ class RawHttp:
         # Плюсы Session:
         # - переиспользует соединения (быстрее, чем каждый раз requests.get/post)
         # - можно хранить общие настройки
-        self.session = requests.Session()
+        # make_session() — ApiSession (requests) или Http2Session (HTTP_TRANSPORT=http2);
+        # в обоих случаях запросы идут через общий RateLimiter
+        # (квота app-id общая с UsersAPI/PostsAPI/CommentsAPI).
+        self.session = session if session is not None else make_session()
 
     def close(self) -> None:
         """Закрываем session (освобождаем ресурсы/соединения). Вызываем в конце фикстуры."""
         self.session.close()
 
-    def _request(
+    def _send(
         self,
         method: str,
         url: str,
@@ -50,7 +75,7 @@ class RawHttp:
         json_body: dict | None = None,
     ) -> requests.Response:
         """
-        Универсальный метод для любых HTTP-методов.
+        Универсальный метод для любых HTTP-методов (без аттача — его делает вызывающий).
 
         method: "GET"/"POST"/"PUT"/...
         url: полный URL (например f"{base_url}/user?limit=5")
@@ -72,7 +97,7 @@ class RawHttp:
             h.update(headers)
 
         # Делаем запрос через session.request — это универсальная точка входа.
-        resp = self.session.request(
+        return self.session.request(
             method=method,
             url=url,
             headers=h,
@@ -80,6 +105,16 @@ class RawHttp:
             timeout=self.timeout,    # если сервер долго не отвечает — упадём по таймауту
         )
 
+    def _request(
+        self,
+        method: str,
+        url: str,
+        headers: dict | None = None,
+        json_body: dict | None = None,
+    ) -> requests.Response:
+        """Отправляет запрос (см. _send) и прикрепляет ответ в Allure."""
+        resp = self._send(method, url, headers=headers, json_body=json_body)
+
         # Если передали attach-функцию — прикрепим ответ в Allure,
         # чтобы при падении теста было видно, что вернул API.
         if self.attach:
@@ -87,6 +122,54 @@ class RawHttp:
 
         return resp
 
+    def batch(
+        self,
+        raw_requests: list[RawRequest],
+        max_workers: int | None = None,
+        attach: bool = True,
+        return_exceptions: bool = False,
+    ) -> list[requests.Response | BaseException]:
+        """
+        Отправляет независимые запросы ПАРАЛЛЕЛЬНО и возвращает ответы в том же порядке.
+
+        Время batch ≈ время самого медленного запроса, а не сумма всех.
+        Аттачи в Allure делаются уже в вызывающем потоке (потоке теста) и по порядку запросов:
+        из рабочих потоков allure привязал бы вложения не к тому тесту.
+        Если какой-то запрос упал (таймаут/обрыв) — остальные ответы всё равно прикрепляются,
+        затем пробрасывается первая ошибка.
+
+        attach=False — без аттачей: ответы заранее собраны для НЕСКОЛЬКИХ тестов (prefetch),
+        каждый тест прикрепит свой ответ сам (raw.attach(resp)).
+        return_exceptions=True — ошибки возвращаются на месте ответа, а не пробрасываются.
+        """
+        results = run_concurrently(
+            [lambda r=r: self._send(r.method, r.url, headers=r.headers, json_body=r.json_body) for r in raw_requests],
+            max_workers=max_workers,
+            return_exceptions=True,
+        )
+
+        responses = [r for r in results if not isinstance(r, BaseException)]
+        if attach and self.attach:
+            for resp in responses:
+                self.attach(resp)
+
+        if return_exceptions:
+            return results
+        for r in results:
+            if isinstance(r, BaseException):
+                raise r
+        return responses
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict | None = None,
+        json_body: Any = None,
+    ) -> requests.Response:
+        """Любой HTTP-метод (PUT/DELETE и т.п.); json_body может быть и не dict — фаззеру нужны "кривые" тела."""
+        return self._request(method, url, headers=headers, json_body=json_body)
+
     def get(self, url: str, headers: dict | None = None) -> requests.Response:
         """Удобный метод для GET."""
         return self._request("GET", url, headers=headers)
@@ -99,3 +182,26 @@ class RawHttp:
     ) -> requests.Response:
         """Удобный метод для POST."""
         return self._request("POST", url, headers=headers, json_body=json_body)
+
+
+class RawPrefetch:
+    """
+    Заранее отправленные (одним batch, параллельно) запросы по ключу — для module-фикстур негативных тестов.
+
+    Запросы модуля уходят разом, а проверяет каждый свой тест: у кейса свой id и история в Allure,
+    упавший assert одного кейса не прячет остальные. Ответ прикрепляется к тесту, который его спросил;
+    сетевая ошибка запроса пробрасывается тоже только в его тесте.
+    """
+
+    def __init__(self, raw: RawHttp, raw_requests: dict[Hashable, RawRequest], max_workers: int | None = None):
+        self.raw = raw
+        results = raw.batch(list(raw_requests.values()), max_workers=max_workers, attach=False, return_exceptions=True)
+        self._results = dict(zip(raw_requests.keys(), results))
+
+    def response(self, key: Hashable) -> requests.Response:
+        result = self._results[key]
+        if isinstance(result, BaseException):
+            raise result
+        if self.raw.attach:
+            self.raw.attach(result)
+        return result
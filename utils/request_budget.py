@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import Any, Optional
+import pytest
+from utils.test_context import current_test
+
+PHASES = ("setup", "call", "teardown")
+SHARED = "shared"  # setup фикстур scope != function: их запросы один раз на много тестов, в бюджет не идут
+MARKER = "max_requests"
+
+
+class RequestBudgetPlugin:
+    """
+    Учёт HTTP-запросов по тестам: nodeid -> фаза (setup / call / teardown) -> "METHOD /route" -> число.
+
+    Видно, сколько трафика на самом деле стоит тест вместе с цепочкой фикстур
+    (created_comment = создать user + post + comment и удалить все три).
+
+    @pytest.mark.max_requests(n) — тест падает (на teardown, когда известен полный счёт), если
+    setup + call + teardown сделали больше n запросов. Запросы setup общих фикстур (session/module/class)
+    записываются в фазу "shared" и в бюджет теста не входят: иначе бюджет зависел бы от порядка тестов.
+
+    Подписка на транспорт — в pytest_runtestloop (после сбора): --collect-only не импортирует requests.
+    """
+
+    def __init__(self, report_top: Optional[int] = None):
+        self.report_top = report_top
+        self.counts: dict[str, dict[str, Counter]] = {}
+        self.over_budget: dict[str, tuple[int, int]] = {}
+        self._shared_depth = 0
+        self._lock = threading.Lock()
+
+    # ---------- подсчёт ----------
+
+    def record(self, timings: Any, response: Any = None) -> None:
+        nodeid, phase = current_test()
+        if nodeid is None:
+            return
+        if self._shared_depth:
+            phase = SHARED
+        with self._lock:
+            by_phase = self.counts.setdefault(nodeid, {})
+            by_phase.setdefault(phase or "call", Counter())[f"{timings.method} {timings.route}"] += 1
+
+    def total(self, nodeid: str, phases: tuple[str, ...] = PHASES) -> int:
+        by_phase = self.counts.get(nodeid, {})
+        return sum(sum(by_phase.get(phase, Counter()).values()) for phase in phases)
+
+    def routes(self, nodeid: str) -> Counter:
+        result: Counter = Counter()
+        for phase in PHASES:
+            result.update(self.counts.get(nodeid, {}).get(phase, Counter()))
+        return result
+
+    # ---------- хуки pytest ----------
+
+    def pytest_runtestloop(self, session):
+        if session.config.option.collectonly:
+            return
+        from utils.transport import add_response_observer  # requests — только когда тесты реально пойдут
+        add_response_observer(self.record)
+
+    def pytest_unconfigure(self, config):
+        from utils.transport import remove_response_observer
+        remove_response_observer(self.record)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        shared = fixturedef.scope != "function"
+        if shared:
+            self._shared_depth += 1
+        try:
+            yield
+        finally:
+            if shared:
+                self._shared_depth -= 1
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        marker = item.get_closest_marker(MARKER)
+        if marker is None or call.when != "teardown" or not report.passed:
+            return
+        budget = int(marker.args[0] if marker.args else marker.kwargs["n"])
+        used = self.total(item.nodeid)
+        if used <= budget:
+            return
+        self.over_budget[item.nodeid] = (used, budget)
+        routes = ", ".join(f"{route} x{n}" for route, n in self.routes(item.nodeid).most_common())
+        by_phase = ", ".join(f"{phase}={self.total(item.nodeid, (phase,))}" for phase in PHASES)
+        report.outcome = "failed"
+        report.longrepr = f"request budget exceeded: {used} > max_requests({budget}) [{by_phase}]\n{routes}"
+
+    def pytest_terminal_summary(self, terminalreporter):
+        tr = terminalreporter
+        if self.over_budget:
+            tr.write_sep("=", "request budget exceeded")
+            for nodeid, (used, budget) in self.over_budget.items():
+                tr.write_line(f"{used:>5} > {budget:<5} {nodeid}")
+        if not self.report_top:
+            return
+        tr.write_sep("=", f"most expensive tests by HTTP requests (top {self.report_top})")
+        with self._lock:
+            nodeids = list(self.counts)
+        ranked = sorted(nodeids, key=self.total, reverse=True)[: self.report_top]
+        if not ranked:
+            tr.write_line("no HTTP requests recorded")
+            return
+        tr.write_line(f"{'total':>5} {'setup':>5} {'call':>5} {'tdown':>5} {'shared':>6}  test / top routes")
+        for nodeid in ranked:
+            by_phase = [self.total(nodeid, (phase,)) for phase in (*PHASES, SHARED)]
+            tr.write_line(f"{self.total(nodeid):>5} " + " ".join(f"{n:>5}" for n in by_phase[:3])
+                          + f" {by_phase[3]:>6}  {nodeid}")
+            top = ", ".join(f"{route} x{n}" for route, n in self.routes(nodeid).most_common(4))
+            tr.write_line(f"{'':>31}{top}")
+        total = sum(self.total(nodeid) for nodeid in nodeids)
+        tr.write_line(f"{len(nodeids)} tests, {total} requests (shared fixtures excluded)")
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class RequestTimings:
+    """
+    Разбивка одного HTTP-запроса по фазам (секунды) + объём трафика.
+
+    - dns / connect / tls — только для "холодного" запроса (новое соединение), иначе None
+      (у HTTP/2 DNS входит в connect: httpcore не отдаёт их раздельно)
+    - ttfb — от начала отправки запроса до получения заголовков ответа (без установки соединения)
+    - download — чтение тела ответа (None, если тело читает вызывающий: stream=True)
+    - error — класс исключения, если запрос упал без ответа (таймаут, обрыв): status_code тогда None,
+      всё время до ошибки — в ttfb
+
+    Доступно в тестах как resp.timings (ApiSession и Http2Session).
+    """
+
+    method: str
+    url: str
+    route: str
+    status_code: Optional[int]
+    started_at: float          # time.time() начала запроса
+    dns: Optional[float]
+    connect: Optional[float]
+    tls: Optional[float]
+    ttfb: float
+    download: Optional[float]
+    bytes_sent: int
+    bytes_received: int
+    reused: bool               # True — запрос ушёл по уже открытому (тёплому) соединению
+    error: Optional[str] = None
+
+    @property
+    def total(self) -> float:
+        return sum(v for v in (self.dns, self.connect, self.tls, self.ttfb, self.download) if v)
+
+    def as_dict(self) -> dict:
+        data = dict(self.__dict__)
+        data["total"] = self.total
+        return data
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+# Ресурсы DummyAPI: всё, что в пути стоит ДО них (например /data/v1), в шаблон не попадает
+_RESOURCES = {"user", "post", "comment", "tag"}
+
+# Сегменты пути, похожие на id: 24-hex (ObjectId), числа, uuid
+_ID_SEGMENT = re.compile(r"^(?:[0-9a-fA-F]{24}|\d+|[0-9a-fA-F]{8}-[0-9a-fA-F-]{27})$")
+
+
+@lru_cache(maxsize=4096)
+def route_template(url: str) -> str:
+    """
+    Превращает URL запроса в шаблон роута для агрегации метрик:
+        https://dummyapi.io/data/v1/user/60d0fe4f5311236168a109ca/post?limit=10 -> /user/{id}/post
+    Query-параметры отбрасываются; сегменты-id заменяются на {id}.
+    """
+    segments = [s for s in urlsplit(url).path.split("/") if s]
+    for i, segment in enumerate(segments):
+        if segment in _RESOURCES:
+            segments = segments[i:]
+            break
+    return "/" + "/".join("{id}" if _ID_SEGMENT.match(s) else s for s in segments)
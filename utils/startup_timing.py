@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import Optional
+import pytest
+
+
+def _process_started_perf() -> Optional[float]:
+    """
+    Момент старта процесса в шкале time.perf_counter() (Linux, через /proc).
+    Нужен, чтобы показать, сколько съели интерпретатор + pytest + плагины ДО нашего conftest.
+    На других ОС возвращает None — в отчёте эта строка просто пропадёт.
+    """
+    try:
+        with open("/proc/self/stat", encoding="ascii") as f:
+            # поле 22 (starttime) — после ")" имени процесса, индексы сдвигаются
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime", encoding="ascii") as f:
+            uptime = float(f.read().split()[0])
+        started_since_boot = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        return time.perf_counter() - (uptime - started_since_boot)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupTimingPlugin:
+    """
+    pytest-плагин: отчёт о стоимости старта прогона (включается флагом --startup-report).
+
+    Разбивка:
+    - bootstrap: интерпретатор + pytest + плагины (от старта процесса до импорта conftest)
+    - conftest import: импорт tests/conftest.py
+    - collection: сбор тестов (в т.ч. импорт тестовых модулей) + самые дорогие модули
+    - session fixtures: setup каждой session-фикстуры
+    - time to first test: от старта процесса до вызова первого теста (после его setup)
+    """
+
+    def __init__(self, conftest_import_started: float, conftest_import_finished: float):
+        self.process_started = _process_started_perf()
+        self.conftest_import_started = conftest_import_started
+        self.conftest_import_finished = conftest_import_finished
+
+        self.collection: Optional[float] = None
+        self.modules: dict[str, float] = {}
+        self.session_fixtures: dict[str, float] = {}
+        self.first_test_started: Optional[float] = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_collection(self, session):
+        started = time.perf_counter()
+        yield
+        self.collection = time.perf_counter() - started
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_make_collect_report(self, collector):
+        started = time.perf_counter()
+        yield
+        # Module.collect() — это и есть импорт тестового файла + сбор его тестов
+        if isinstance(collector, pytest.Module):
+            self.modules[collector.nodeid] = time.perf_counter() - started
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        started = time.perf_counter()
+        yield
+        # Зависимости фикстуры поднимаются ДО этого хука, поэтому время здесь "собственное"
+        if fixturedef.scope == "session":
+            self.session_fixtures[fixturedef.argname] = time.perf_counter() - started
+
+    def pytest_runtest_call(self, item):
+        if self.first_test_started is None:
+            self.first_test_started = time.perf_counter()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        tr = terminalreporter
+        tr.write_sep("=", "startup timing")
+
+        def line(name: str, seconds: Optional[float]) -> None:
+            if seconds is not None:
+                tr.write_line(f"{name:<40}{seconds * 1000:>10.1f} ms")
+
+        if self.process_started is not None:
+            line("bootstrap (python + pytest + plugins)", self.conftest_import_started - self.process_started)
+        line("conftest import", self.conftest_import_finished - self.conftest_import_started)
+        line("collection (total)", self.collection)
+        for nodeid, seconds in sorted(self.modules.items(), key=lambda kv: kv[1], reverse=True)[:5]:
+            line(f"  {nodeid}", seconds)
+        line("session fixtures (total)", sum(self.session_fixtures.values()) if self.session_fixtures else None)
+        for name, seconds in sorted(self.session_fixtures.items(), key=lambda kv: kv[1], reverse=True):
+            line(f"  {name}", seconds)
+        if self.process_started is not None and self.first_test_started is not None:
+            line("time to first test", self.first_test_started - self.process_started)
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Optional
+from services.comments.comment_endpoints import CommentEndpoints
+from services.posts.post_endpoints import PostEndpoints
+from services.users.user_endpoints import UserEndpoints
+from utils.concurrency import DEFAULT_MAX_WORKERS, run_concurrently
+from utils.pagination import iter_pages, page_fetcher
+
+if TYPE_CHECKING:
+    import requests
+
+# Маркеры payload-фабрик (services/*/…_payloads.py): ровно такие значения генерирует фреймворк
+USER_EMAIL_MARKER = re.compile(r"^autotest_[0-9a-f]{32}@example\.com$")
+POST_TEXT_MARKER = re.compile(r"^Auto post [0-9a-f]{8}$")
+COMMENT_MESSAGE_MARKER = re.compile(r"^Auto comment [0-9a-f]{8}$")
+
+KINDS = ("comment", "post", "user")  # порядок удаления: дети -> родители
+
+
+@dataclass
+class Orphan:
+    kind: str
+    id: str
+    label: str
+    created_at: Optional[datetime] = None
+
+
+@dataclass
+class SweepReport:
+    """Что нашли и удалили + пропускная способность сканирования и удаления."""
+
+    orphans: dict[str, list[Orphan]] = field(default_factory=lambda: {kind: [] for kind in KINDS})
+    scanned: dict[str, int] = field(default_factory=lambda: {kind: 0 for kind in KINDS})
+    pages: int = 0
+    detail_requests: int = 0
+    skipped_young: int = 0
+    scan_seconds: float = 0.0
+    deleted: dict[str, int] = field(default_factory=lambda: {kind: 0 for kind in KINDS})
+    delete_errors: list[str] = field(default_factory=list)
+    delete_seconds: float = 0.0
+    dry_run: bool = True
+
+    @property
+    def found(self) -> int:
+        return sum(len(v) for v in self.orphans.values())
+
+    def format(self) -> str:
+        scanned = sum(self.scanned.values())
+        requests_made = self.pages + self.detail_requests
+        lines = [
+            f"scan: {scanned} items ({', '.join(f'{k}s={v}' for k, v in self.scanned.items())}) "
+            f"in {self.scan_seconds:.1f}s — {requests_made} requests, "
+            f"{scanned / self.scan_seconds if self.scan_seconds else 0:.0f} items/s, "
+            f"{requests_made / self.scan_seconds if self.scan_seconds else 0:.1f} req/s",
+            f"orphans: {self.found} ({', '.join(f'{k}s={len(v)}' for k, v in self.orphans.items())})"
+            + (f", {self.skipped_young} skipped as too recent" if self.skipped_young else ""),
+        ]
+        if self.dry_run:
+            lines.append("dry run: nothing deleted")
+        else:
+            deleted = sum(self.deleted.values())
+            lines.append(
+                f"deleted: {deleted} ({', '.join(f'{k}s={v}' for k, v in self.deleted.items())}) "
+                f"in {self.delete_seconds:.1f}s — {deleted / self.delete_seconds if self.delete_seconds else 0:.1f}/s, "
+                f"errors={len(self.delete_errors)}"
+            )
+        return "\n".join(lines)
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class OrphanSweeper:
+    """
+    Находит и удаляет тестовые данные, которые остались от упавших прогонов.
+
+    - /user, /post, /comment сканируются одновременно, внутри списка — окном страниц (utils/pagination)
+    - свои сущности узнаём по маркерам payload-фабрик: email autotest_<uuid>@example.com,
+      "Auto post <hex>", "Auto comment <hex>"
+    - в превью пользователя в списке email нет — его берём из GET /user/{id} (тоже параллельно)
+    - min_age: не трогаем то, что создано недавно (это могут быть данные идущего рядом прогона)
+    - удаление: комментарии -> посты -> пользователи, не больше max_workers запросов одновременно;
+      сначала полный скан, потом удаление — иначе удаление сдвигало бы страницы под сканом
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        base_url: str,
+        min_age: timedelta = timedelta(0),
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: float = 15,
+    ):
+        self.session = session
+        self.users = UserEndpoints(base_url)
+        self.posts = PostEndpoints(base_url)
+        self.comments = CommentEndpoints(base_url)
+        self.min_age = min_age
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._lock = threading.Lock()
+
+    def _scan_list(self, kind: str, url: str, report: SweepReport) -> list[dict]:
+        items: list[dict] = []
+        for page in iter_pages(page_fetcher(self.session, url, timeout=self.timeout), max_workers=self.max_workers):
+            items += page.items
+            with self._lock:
+                report.pages += 1
+                report.scanned[kind] += len(page.items)
+        return items
+
+    def _user_details(self, previews: list[dict], report: SweepReport) -> list[dict]:
+        """Полные записи пользователей (с email и registerDate) для тех превью, где email нет."""
+        missing = [p for p in previews if "email" not in p]
+
+        def fetch(user_id: str) -> dict:
+            response = self.session.get(self.users.get_user_by_id(user_id), timeout=self.timeout)
+            return response.json() if response.status_code == 200 else {}
+
+        details = run_concurrently([lambda i=p["id"]: fetch(i) for p in missing], max_workers=self.max_workers)
+        report.detail_requests += len(missing)
+        return [p for p in previews if "email" in p] + [d for d in details if d]
+
+    def _collect(self, kind: str, items: list[dict], field_name: str, marker: re.Pattern, date_field: str,
+                 report: SweepReport) -> None:
+        threshold = datetime.now(timezone.utc) - self.min_age
+        for item in items:
+            label = item.get(field_name)
+            if not isinstance(label, str) or not marker.match(label):
+                continue
+            created_at = _parse_date(item.get(date_field))
+            if self.min_age and created_at is not None and created_at > threshold:
+                report.skipped_young += 1
+                continue
+            report.orphans[kind].append(Orphan(kind=kind, id=item["id"], label=label, created_at=created_at))
+
+    def scan(self, report: Optional[SweepReport] = None) -> SweepReport:
+        report = report or SweepReport()
+        started = time.perf_counter()
+        users, posts, comments = run_concurrently([
+            lambda: self._user_details(self._scan_list("user", self.users.get_users_list(), report), report),
+            lambda: self._scan_list("post", self.posts.list_posts, report),
+            lambda: self._scan_list("comment", self.comments.list_comments, report),
+        ], max_workers=3)
+        self._collect("user", users, "email", USER_EMAIL_MARKER, "registerDate", report)
+        self._collect("post", posts, "text", POST_TEXT_MARKER, "publishDate", report)
+        self._collect("comment", comments, "message", COMMENT_MESSAGE_MARKER, "publishDate", report)
+        report.scan_seconds = time.perf_counter() - started
+        return report
+
+    def delete(self, report: SweepReport) -> SweepReport:
+        urls = {
+            "comment": self.comments.delete_comment,
+            "post": self.posts.post_by_id,
+            "user": self.users.delete_user,
+        }
+        report.dry_run = False
+        started = time.perf_counter()
+        for kind in KINDS:
+
+            def delete_one(orphan: Orphan) -> None:
+                response = self.session.delete(urls[orphan.kind](orphan.id), timeout=self.timeout)
+                if response.status_code not in (200, 204, 404):  # 404 — уже удалили (например, соседний sweep)
+                    raise RuntimeError(f"DELETE {orphan.kind} {orphan.id}: {response.status_code} {response.text[:200]}")
+                with self._lock:
+                    report.deleted[orphan.kind] += 1
+
+            results = run_concurrently(
+                [lambda o=o: delete_one(o) for o in report.orphans[kind]],
+                max_workers=self.max_workers,
+                return_exceptions=True,
+            )
+            report.delete_errors += [str(r) for r in results if isinstance(r, BaseException)]
+        report.delete_seconds = time.perf_counter() - started
+        return report
+
+    def sweep(self, dry_run: bool = False) -> SweepReport:
+        report = self.scan()
+        return report if dry_run else self.delete(report)
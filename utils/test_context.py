@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import Optional
+import pytest
+
+# Текущий тест и фаза (setup / call / teardown) — общие для процесса, а не для потока:
+# запросы из run_concurrently идут из рабочих потоков, но относятся к тому же тесту.
+# pytest выполняет тесты процесса по одному (под xdist — у каждого воркера свой процесс).
+_nodeid: Optional[str] = None
+_phase: Optional[str] = None
+
+
+def current_test() -> tuple[Optional[str], Optional[str]]:
+    """(nodeid, phase) теста, который сейчас выполняется; (None, None) — вне теста (сбор, session teardown, tools)."""
+    return _nodeid, _phase
+
+
+def set_current_test(nodeid: Optional[str], phase: Optional[str] = None) -> None:
+    global _nodeid, _phase
+    _nodeid, _phase = nodeid, phase
+
+
+class TestContextPlugin:
+    """pytest-плагин: запоминает nodeid и фазу текущего теста для журналов (utils/event_log.py)."""
+
+    __test__ = False  # имя начинается с Test — не даём pytest принять класс за тесты
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item) -> None:
+        set_current_test(item.nodeid, "setup")
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_call(self, item) -> None:
+        set_current_test(item.nodeid, "call")
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_teardown(self, item) -> None:
+        set_current_test(item.nodeid, "teardown")
+
+    def pytest_runtest_logfinish(self, nodeid, location) -> None:
+        set_current_test(None)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+import allure_commons
+import pytest
+from utils.request_timing import RequestTimings
+from utils.transport import add_response_observer, remove_response_observer
+
+TRACE_FILE = "trace.json"
+_PART_GLOB = "trace-*.part.json"
+
+
+def _now_us() -> int:
+    # общие "стенные" часы для всех процессов — иначе спаны xdist-воркеров не совместить на одной шкале
+    return time.time_ns() // 1000
+
+
+class TraceRecorder:
+    """
+    Спаны прогона в формате Chrome trace-event (chrome://tracing, https://ui.perfetto.dev):
+    каждый спан — complete event {"ph": "X", "ts": мкс, "dur": мкс, "pid": процесс, "tid": поток}.
+
+    Категории (cat):
+    - test    — фазы теста setup / call / teardown
+    - fixture — setup фикстуры (видно, какая фикстура держит тест и что идёт последовательно)
+    - step    — блоки allure.step (шаги клиентов и тестов)
+    - http    — HTTP-запросы транспорта (от начала запроса до заголовков/тела ответа)
+
+    pid — процесс (у xdist-воркеров свои), tid — поток: запросы run_concurrently видны
+    отдельными дорожками, и сразу понятно, где работа шла параллельно, а где по одному.
+    """
+
+    def __init__(self) -> None:
+        self.pid = os.getpid()
+        self.worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+        self.events: list[dict] = []
+        self._lock = threading.Lock()
+        self._threads: dict[int, str] = {}
+        self._open_steps: dict[str, tuple[int, int, str]] = {}
+
+    def span(self, name: str, cat: str, start_us: int, end_us: int, tid: Optional[int] = None, **args: Any) -> None:
+        if tid is None:
+            tid = threading.get_ident()
+        event = {"name": name, "cat": cat, "ph": "X", "ts": start_us, "dur": max(end_us - start_us, 0),
+                 "pid": self.pid, "tid": tid}
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+
+    # ---------- allure.step (хуки allure_commons) ----------
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        self._open_steps[uuid] = (_now_us(), threading.get_ident(), title)
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        started = self._open_steps.pop(uuid, None)
+        if started is None:
+            return
+        start_us, tid, title = started
+        args = {"error": exc_type.__name__} if exc_type else {}
+        self.span(title, "step", start_us, _now_us(), tid=tid, **args)
+
+    # ---------- HTTP (наблюдатель транспорта) ----------
+
+    def record_http(self, timings: RequestTimings, response: Any = None) -> None:
+        start_us = int(timings.started_at * 1_000_000)
+        self.span(f"{timings.method} {timings.route}", "http", start_us, start_us + int(timings.total * 1_000_000),
+                  status=timings.status_code, reused=timings.reused, error=timings.error)
+
+    # ---------- файлы ----------
+
+    def metadata(self) -> list[dict]:
+        """Имена процесса и потоков для просмотрщика (ph "M")."""
+        meta = [{"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": f"pytest {self.worker}"}}]
+        for tid, name in self._threads.items():
+            meta.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}})
+        return meta
+
+    def write_part(self, directory: Path) -> Path:
+        """Часть трейса этого процесса: trace-<worker>.part.json (склеивает merge_parts)."""
+        path = directory / f"trace-{self.worker}.part.json"
+        with self._lock:
+            events = self.metadata() + self.events
+        path.write_text(json.dumps({"traceEvents": events}), encoding="utf-8")
+        return path
+
+
+def merge_parts(directory: Path) -> tuple[Path, int]:
+    """Склеивает части всех процессов в один trace.json (части удаляются). Возвращает (путь, число событий)."""
+    events: list[dict] = []
+    for part in sorted(directory.glob(_PART_GLOB)):
+        events.extend(json.loads(part.read_text(encoding="utf-8"))["traceEvents"])
+        part.unlink()
+    path = directory / TRACE_FILE
+    path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
+    return path, len(events)
+
+
+class TraceTimelinePlugin:
+    """
+    pytest-плагин: трейс всего прогона (--trace-timeline DIR / env TRACE_TIMELINE_DIR) -> DIR/trace.json.
+
+    Каждый процесс (основной или xdist-воркер) пишет свою часть в конце сессии; основной процесс
+    (контроллер xdist) завершается последним и склеивает части в один файл.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self.is_worker = "PYTEST_XDIST_WORKER" in os.environ
+        self.recorder = TraceRecorder()
+        self.result: Optional[tuple[Path, int]] = None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if not self.is_worker:
+            for stale in self.directory.glob(_PART_GLOB):  # остатки прерванного прогона
+                stale.unlink()
+        allure_commons.plugin_manager.register(self.recorder)
+        add_response_observer(self.recorder.record_http)
+
+    def _phase(self, item, phase: str):
+        start = _now_us()
+        yield
+        self.recorder.span(item.nodeid, "test", start, _now_us(), phase=phase)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        yield from self._phase(item, "setup")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        yield from self._phase(item, "call")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        yield from self._phase(item, "teardown")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        start = _now_us()
+        yield
+        self.recorder.span(f"fixture {fixturedef.argname}", "fixture", start, _now_us(), scope=fixturedef.scope)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        remove_response_observer(self.recorder.record_http)
+        allure_commons.plugin_manager.unregister(self.recorder)
+        self.recorder.write_part(self.directory)
+        if not self.is_worker:
+            self.result = merge_parts(self.directory)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.result:
+            path, count = self.result
+            terminalreporter.write_line(f"trace timeline: {count} events -> {path} (open in https://ui.perfetto.dev)")
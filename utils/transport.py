@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import ipaddress
+import logging
+import os
+import socket
+import time
+from typing import Any, Callable, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NameResolutionError, NewConnectionError
+from utils.rate_limiter import RateLimiter, get_rate_limiter
+from utils.request_timing import RequestTimings
+from utils.routes import route_template
+
+_log = logging.getLogger(__name__)
+
+# ---------- Наблюдатели ответов (метрики, журналы) ----------
+
+ResponseObserver = Callable[[RequestTimings, Any], None]
+_observers: list[ResponseObserver] = []
+
+
+def add_response_observer(observer: ResponseObserver) -> None:
+    """
+    Подписка на каждый HTTP-запрос транспорта: observer(timings, response). Вызывается в потоке запроса.
+    Запрос, упавший исключением (таймаут, обрыв), тоже приходит: response=None, timings.error — класс исключения.
+    """
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_response_observer(observer: ResponseObserver) -> None:
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def notify_response_observers(timings: RequestTimings, response: Any) -> None:
+    """Ошибка наблюдателя (баг плагина метрик/журнала) логируется и не роняет сам HTTP-запрос."""
+    for observer in list(_observers):
+        try:
+            observer(timings, response)
+        except Exception:
+            _log.exception("response observer %r failed on %s %s", observer, timings.method, timings.url)
+
+
+def error_timings(method: str, url: str, started_at: float, elapsed: float, error: BaseException) -> RequestTimings:
+    """Timings запроса, упавшего исключением: статуса и фаз нет, всё время до ошибки — в ttfb."""
+    return RequestTimings(
+        method=method,
+        url=url,
+        route=route_template(url),
+        status_code=None,
+        started_at=started_at,
+        dns=None,
+        connect=None,
+        tls=None,
+        ttfb=elapsed,
+        download=None,
+        bytes_sent=0,
+        bytes_received=0,
+        reused=False,
+        error=type(error).__name__,
+    )
+
+
+# ---------- Соединения urllib3 с замером фаз ----------
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+        return True
+    except ValueError:
+        return False
+
+
+def _resolve(host: str, port: int) -> list[str]:
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return list(dict.fromkeys(info[4][0] for info in infos))  # уникальные, порядок сохраняем
+
+
+class TimedConnectionMixin:
+    """
+    Примесь к urllib3-соединениям: замер фаз DNS / connect / TLS / TTFB и подсчёт отправленных байт.
+
+    DNS резолвим сами (через dns_cache, если он задан, иначе getaddrinfo) и подменяем _dns_host на IP
+    только на время _new_conn(): SNI и проверка сертификата по-прежнему используют исходное имя хоста.
+
+    Фазы установки соединения "отдаются" ровно одному — первому — запросу по этому соединению
+    (take_setup_timings): так отличаем холодный запрос от запроса по тёплому соединению.
+    """
+
+    dns_cache = None   # utils.connection_pool.DnsCache: resolve(host, port) / invalidate(host, port)
+    stats = None       # utils.connection_pool.PoolStats: считаем connections_opened
+
+    _setup: Optional[dict] = None
+    _connect_window: Optional[tuple[float, float]] = None
+    _request_started = 0.0
+    request_bytes_sent = 0
+    ttfb = 0.0
+
+    def _new_conn(self) -> socket.socket:
+        host = self._dns_host
+        started = time.perf_counter()
+        if _is_ip(host):
+            addresses, dns = [host], None
+        else:
+            try:
+                addresses = self.dns_cache.resolve(host, self.port) if self.dns_cache else _resolve(host, self.port)
+            except socket.gaierror as e:
+                raise NameResolutionError(self.host, self, e) from e
+            dns = time.perf_counter() - started
+
+        resolved = time.perf_counter()
+        try:
+            # Как create_connection у urllib3: при отказе пробуем следующий адрес (таймаут — сразу ошибка)
+            for i, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except NewConnectionError:
+                    if i == len(addresses) - 1:
+                        raise
+        except Exception:
+            if self.dns_cache is not None:
+                self.dns_cache.invalidate(host, self.port)  # адрес мог смениться — в следующий раз резолвим заново
+            raise
+        finally:
+            self._dns_host = host
+
+        self._setup = {"dns": dns, "connect": time.perf_counter() - resolved, "tls": None}
+        if self.stats is not None:
+            self.stats.connections_opened += 1
+        return sock
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        super().connect()
+        finished = time.perf_counter()
+        self._connect_window = (started, finished)
+        if self._setup is not None and isinstance(self, HTTPSConnection):
+            # Всё, что в connect() сверх DNS + TCP, — это TLS handshake
+            spent = (self._setup["dns"] or 0.0) + self._setup["connect"]
+            self._setup["tls"] = max(finished - started - spent, 0.0)
+
+    def request(self, method, url, body=None, headers=None, **kwargs) -> None:
+        self.request_bytes_sent = 0
+        self._request_started = time.perf_counter()
+        super().request(method, url, body=body, headers=headers, **kwargs)
+
+    def send(self, data) -> None:
+        if isinstance(data, (bytes, bytearray, str)):
+            self.request_bytes_sent += len(data)
+        elif isinstance(data, memoryview):
+            self.request_bytes_sent += data.nbytes
+        super().send(data)
+
+    def getresponse(self):
+        resp = super().getresponse()
+        now = time.perf_counter()
+        ttfb = now - self._request_started
+        # Для http:// соединение открывается лениво ВНУТРИ request() — это время не TTFB
+        if self._connect_window is not None:
+            window_start, window_end = self._connect_window
+            ttfb -= max(0.0, min(window_end, now) - max(window_start, self._request_started))
+        self.ttfb = max(ttfb, 0.0)
+        return resp
+
+    def take_setup_timings(self) -> Optional[dict]:
+        """Фазы установки соединения, если по нему ещё не было учтённых запросов; иначе None."""
+        setup, self._setup = self._setup, None
+        return setup
+
+
+def timed_pool_classes(**attrs) -> dict[str, type]:
+    """urllib3 pool_classes_by_scheme с TimedConnectionMixin; attrs — атрибуты классов соединений (dns_cache, stats)."""
+    http_conn = type("TimedHTTPConnection", (TimedConnectionMixin, HTTPConnection), attrs)
+    https_conn = type("TimedHTTPSConnection", (TimedConnectionMixin, HTTPSConnection), attrs)
+    return {
+        "http": type("TimedHTTPConnectionPool", (HTTPConnectionPool,), {"ConnectionCls": http_conn}),
+        "https": type("TimedHTTPSConnectionPool", (HTTPSConnectionPool,), {"ConnectionCls": https_conn}),
+    }
+
+
+def _response_header_bytes(resp: requests.Response) -> int:
+    """Размер статус-строки и заголовков ответа (оценка: повторяющиеся заголовки urllib3 склеивает)."""
+    headers = getattr(resp.raw, "headers", None) or resp.headers
+    status_line = len(f"HTTP/1.1 {resp.status_code} {resp.reason or ''}\r\n")
+    return status_line + sum(len(k) + len(v) + 4 for k, v in headers.items()) + 2
+
+
+class ApiAdapter(HTTPAdapter):
+    """
+    HTTPAdapter, через который проходит каждый HTTP-"хоп" (включая редиректы).
+
+    Перед отправкой берёт слот у RateLimiter, после ответа сообщает лимитеру статус,
+    чтобы AIMD мог снизить/нарастить конкурентность.
+    Ограничиваем именно на уровне адаптера, а не Session.send: Session.send вызывает себя
+    рекурсивно при редиректах, и вложенный захват слота мог бы заблокировать поток.
+
+    Каждый ответ получает resp.timings (RequestTimings) и уходит наблюдателям (add_response_observer);
+    запрос, упавший исключением, уходит им с response=None и пробрасывается дальше.
+    """
+
+    def __init__(self, limiter: Optional[RateLimiter] = None, **kwargs):
+        self.limiter = limiter
+        # Нужны уже в init_poolmanager(), который вызывается из HTTPAdapter.__init__
+        self._pool_classes = timed_pool_classes(**self._connection_attrs())
+        super().__init__(**kwargs)
+
+    def _connection_attrs(self) -> dict:
+        """Атрибуты классов соединений (переопределяет PooledApiAdapter: DNS-кэш и счётчики)."""
+        return {}
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self._pool_classes
+
+    def send(self, request, **kwargs) -> requests.Response:
+        limiter = self.limiter or get_rate_limiter()
+        started_at = time.time()
+        with limiter.slot() as slot:
+            try:
+                resp = super().send(request, **kwargs)
+                resp.timings = self._timings(request, resp, started_at, stream=kwargs.get("stream", False))
+            except Exception as e:
+                error = e
+            else:
+                error = None
+                slot.record(resp.status_code)
+        if error is not None:
+            elapsed = time.perf_counter() - slot.started
+            notify_response_observers(error_timings(request.method, request.url, started_at, elapsed, error), None)
+            raise error
+        notify_response_observers(resp.timings, resp)
+        return resp
+
+    @staticmethod
+    def _timings(request, resp: requests.Response, started_at: float, stream: bool) -> RequestTimings:
+        # Соединение читаем ДО тела: после чтения оно вернётся в пул и может уйти другому потоку
+        conn = getattr(resp.raw, "connection", None)
+        timed = isinstance(conn, TimedConnectionMixin)
+        setup = conn.take_setup_timings() if timed else None
+        ttfb = conn.ttfb if timed else resp.elapsed.total_seconds()
+        bytes_sent = conn.request_bytes_sent if timed else 0
+
+        download = None
+        if not stream:
+            started = time.perf_counter()
+            _ = resp.content  # Session.send всё равно прочитает тело сразу после адаптера
+            download = time.perf_counter() - started
+
+        tell = getattr(resp.raw, "tell", None)
+        return RequestTimings(
+            method=request.method,
+            url=request.url,
+            route=route_template(request.url),
+            status_code=resp.status_code,
+            started_at=started_at,
+            dns=setup["dns"] if setup else None,
+            connect=setup["connect"] if setup else None,
+            tls=setup["tls"] if setup else None,
+            ttfb=ttfb,
+            download=download,
+            bytes_sent=bytes_sent,
+            bytes_received=_response_header_bytes(resp) + (tell() if tell else 0),
+            reused=timed and setup is None,
+        )
+
+
+class ApiSession(requests.Session):
+    """
+    requests.Session для всех клиентов фреймворка (UsersAPI / PostsAPI / CommentsAPI / RawHttp).
+
+    Интерфейс полностью как у requests.Session — отличие только в смонтированном ApiAdapter,
+    т.е. все запросы проходят через общий RateLimiter процесса.
+
+    adapter: можно передать общий (чужой) адаптер — например, тёплый пул ConnectionManager'а.
+    Тогда close() сессии НЕ закрывает адаптер: пул переживает сессию.
+    """
+
+    def __init__(self, limiter: Optional[RateLimiter] = None, adapter: Optional[HTTPAdapter] = None):
+        super().__init__()
+        self._owns_adapter = adapter is None
+        if adapter is None:
+            adapter = ApiAdapter(limiter=limiter)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def close(self) -> None:
+        if self._owns_adapter:
+            super().close()
+
+
+def transport_name(transport: Optional[str] = None) -> str:
+    """Нормализованное имя транспорта: "http1" или "http2" (по умолчанию — из env HTTP_TRANSPORT)."""
+    transport = (transport or os.getenv("HTTP_TRANSPORT", "http1")).strip().lower()
+    if transport == "http2":
+        return "http2"
+    if transport in ("http1", "http/1.1", "requests", ""):
+        return "http1"
+    raise ValueError(f"Unknown HTTP_TRANSPORT: {transport!r} (expected 'http1' or 'http2')")
+
+
+def make_session(
+    transport: Optional[str] = None,
+    limiter: Optional[RateLimiter] = None,
+    adapter: Optional[HTTPAdapter] = None,
+):
+    """
+    Фабрика сессий для клиентов и RawHttp.
+
+    transport (или env HTTP_TRANSPORT):
+    - "http1" (по умолчанию) — ApiSession (requests, HTTP/1.1, пул соединений)
+    - "http2" — Http2Session (httpx, одно мультиплексированное соединение на хост)
+
+    adapter: общий адаптер (пул) для ApiSession — см. utils/connection_pool.ConnectionManager.
+    """
+    if transport_name(transport) == "http2":
+        from utils.http2_transport import Http2Session  # httpx импортируем только если он реально нужен
+        return Http2Session(limiter=limiter)
+    return ApiSession(limiter=limiter, adapter=adapter)
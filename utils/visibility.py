@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import os
+import random
+import statistics
+import threading
+import time
+from typing import Any, Callable, Optional
+from utils.json_stream import read_list_page
+
+DEFAULT_INITIAL_DELAY = 0.05   # первая пауза между опросами, сек
+DEFAULT_MAX_DELAY = 1.0        # потолок паузы
+DEFAULT_FACTOR = 2.0
+
+
+def default_timeout() -> float:
+    """Сколько ждать появления сущности в списке: env VISIBILITY_TIMEOUT, по умолчанию 10 сек."""
+    return float(os.getenv("VISIBILITY_TIMEOUT", "10"))
+
+
+def listed_ids(response: Any) -> set[str]:
+    """id элементов списочного ответа — без моделей и view: самая дешёвая проверка "есть ли в списке"."""
+    return set(read_list_page(response, lambda item: item.get("id")))
+
+
+class VisibilityMetrics:
+    """
+    Наблюдаемая задержка появления (replication lag) по роутам списков: сколько прошло от начала
+    ожидания до опроса, который уже увидел сущность (0 — видна с первого раза), и сколько было опросов.
+    Печатается в --http-report отдельной таблицей.
+    """
+
+    def __init__(self) -> None:
+        self._samples: dict[str, list[tuple[float, int, bool]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, lag: float, attempts: int, visible: bool) -> None:
+        with self._lock:
+            self._samples.setdefault(route, []).append((lag, attempts, visible))
+
+    def rows(self) -> list[dict]:
+        with self._lock:
+            groups = {route: list(samples) for route, samples in self._samples.items()}
+        rows = []
+        for route, samples in sorted(groups.items()):
+            lags = sorted(lag for lag, _, visible in samples if visible) or [0.0]
+            rows.append({
+                "route": route,
+                "waits": len(samples),
+                "immediate": sum(1 for _, attempts, visible in samples if visible and attempts == 1),
+                "timeouts": sum(1 for _, _, visible in samples if not visible),
+                "p50_ms": statistics.median(lags) * 1000,
+                "max_ms": lags[-1] * 1000,
+                "max_attempts": max(attempts for _, attempts, _ in samples),
+            })
+        return rows
+
+    def format_table(self) -> list[str]:
+        lines = [f"{'route':<28}{'waits':>6}{'immediate':>10}{'timeouts':>9}{'p50 lag':>9}{'max lag':>9}{'polls':>6}"]
+        for r in self.rows():
+            lines.append(f"{r['route']:<28}{r['waits']:>6}{r['immediate']:>10}{r['timeouts']:>9}"
+                         f"{r['p50_ms']:>9.1f}{r['max_ms']:>9.1f}{r['max_attempts']:>6}")
+        return lines
+
+
+visibility_metrics = VisibilityMetrics()
+
+
+def wait_until_visible(
+    check: Callable[[], bool],
+    route: str,
+    what: str,
+    timeout: Optional[float] = None,
+    initial_delay: float = DEFAULT_INITIAL_DELAY,
+    max_delay: float = DEFAULT_MAX_DELAY,
+    factor: float = DEFAULT_FACTOR,
+) -> float:
+    """
+    Опрашивает check() до первого True и возвращает наблюдаемую задержку (сек).
+
+    Пауза между опросами растёт экспоненциально (initial_delay * factor^n, не больше max_delay)
+    с "полным" джиттером — random.uniform(0, пауза): параллельные тесты не опрашивают бэкенд в такт.
+    Первый опрос — сразу: на обычном (не реплицированном) бэкенде это ровно один запрос, как и раньше.
+    Не дождались за timeout — AssertionError (как у остальных CHECKED-проверок), задержка пишется в метрику.
+    """
+    timeout = default_timeout() if timeout is None else timeout
+    started = time.monotonic()
+    deadline = started + timeout
+    delay = initial_delay
+    attempts = 0
+    while True:
+        attempts += 1
+        polled_at = time.monotonic()
+        if check():
+            lag = polled_at - started  # время до опроса, который уже увидел сущность (0 — видна сразу)
+            visibility_metrics.record(route, lag, attempts, visible=True)
+            return lag
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            visibility_metrics.record(route, time.monotonic() - started, attempts, visible=False)
+            raise AssertionError(f"{what} is not visible in {route} after {timeout:g}s ({attempts} polls)")
+        time.sleep(min(random.uniform(0, delay), remaining))
+        delay = min(delay * factor, max_delay)